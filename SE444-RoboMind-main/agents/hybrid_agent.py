@@ -7,12 +7,14 @@ Phase 4 of the project (Week 7-8) - Final Integration
 """
 
 from environment import GridWorld
-from agents.search_agent import SearchAgent
 from agents.logic_agent import LogicAgent
 from agents.probabilistic_agent import ProbabilisticAgent
 from ai_core.knowledge_base import KnowledgeBase
 from ai_core.bayes_reasoning import bayes_update
-from ai_core.bayes_reasoning import update_belief_map
+from ai_core.bayes_reasoning import update_belief_cells
+from ai_core.bayes_reasoning import OccupancyGrid, INITIAL_BELIEF, SENSOR_ACCURACY
+from ai_core.search_algorithms import RiskAwarePlanner
+from utils.tracing import tracer, DEBUG, INFO, WARNING
 
 
 class HybridAgent:
@@ -20,31 +22,66 @@ class HybridAgent:
     A rational agent that integrates search, logic, and probabilistic reasoning.
     """
     
-    def __init__(self, environment: GridWorld):
-        """Initialize the hybrid agent."""
-        self.env = environment
+    def __init__(self, environment: GridWorld, kb=None, replan_threshold: float = 0.5,
+                 initial_belief: float = INITIAL_BELIEF, sensor_accuracy: float = SENSOR_ACCURACY,
+                 planner: str = 'astar'):
+        """
+        Initialize the hybrid agent.
         
-        # Search component
-        self.search_agent = SearchAgent(environment)
+        Args:
+            environment: The GridWorld environment
+            kb: Knowledge base backend (KnowledgeBase or GridKnowledgeBase);
+                a new KnowledgeBase is created when omitted
+            replan_threshold: Change of an obstacle probability on the
+                              remaining plan that forces a new search
+            initial_belief: Prior obstacle probability of unobserved cells
+            sensor_accuracy: Probability that a sensor reading is correct
+            planner: 'astar' plans on the map alone, 'risk' plans with
+                     RiskAwarePlanner so cells believed to be obstacles
+                     cost more
+        """
+        if planner not in ('astar', 'risk'):
+            raise ValueError(f"Unknown planner: {planner}")
+        self.env = environment
         
         # Logic component
-        self.kb = KnowledgeBase()
-        self.logic_agent = LogicAgent(environment)
+        self.kb = kb if kb is not None else KnowledgeBase()
+        # the sub-agent shares our KB and keeps it consistent when the map
+        # changes during a run
+        self.logic_agent = LogicAgent(environment, self.kb)
         
         # Probabilistic component - initialize belief map
-        self.beliefs = {}
-        for row in range(self.env.height):
-            for col in range(self.env.width):
-                self.beliefs[(row, col)] = 0.35  # Initial belief for each cell
+        self.beliefs = OccupancyGrid(self.env.height, self.env.width, initial_belief)  # Initial belief for each cell
+        self.sensor_accuracy = sensor_accuracy
+        
+        # One belief store, updated in place and shared by reference with
+        # the probabilistic sub-agent and the renderer
+        self.env.beliefs = self.beliefs
+        self.prob_agent = ProbabilisticAgent(environment, beliefs=self.beliefs,
+                                             sensor_accuracy=sensor_accuracy)
         
-        self.prob_agent = ProbabilisticAgent(environment)
-        # Synchronize beliefs
-        self.prob_agent.beliefs = self.beliefs
+        # Search component - plans on the shared beliefs; with 'astar' the
+        # risk weight is 0, so the costs are plain move costs
+        self.planner = planner
+        heuristic = 'octile' if self.env.connectivity == 8 else 'manhattan'
+        risk_weight = 10.0 if planner == 'risk' else 0.0
+        self.path_planner = RiskAwarePlanner(self.env, self.beliefs, risk_weight=risk_weight,
+                                             replan_threshold=replan_threshold,
+                                             heuristic=heuristic)
         
         # Track visited positions to avoid oscillation 
         self.visited_positions = set()
         self.last_position = None
         
+        # Plan following: keep the plan of path_planner and only search
+        # again when it is invalidated (see needs_replan)
+        self.plan_version = None     # env.version the plan was made for
+        self.ticks = 0
+        
+    def close(self):
+        """Stop following map changes (lets the environment drop the agent)."""
+        self.logic_agent.close()
+        
     def perceive(self):
         # we need to gather some facts using the agent_pos from self.env
         # facts that we need to add to the KB is
@@ -56,10 +93,13 @@ class HybridAgent:
         # first we need to know the agent current position
         r,c = self.env.agent_pos
 
-        sensor_reading = (self.env.grid[r][c] == 1) # 1. Sensor reading
+        # 1. Sensor readings for the current cell and the cells around it
+        observations = []
+        for nr, nc in [(r, c), (r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)]:
+            if 0 <= nr < self.env.height and 0 <= nc < self.env.width:
+                observations.append(((nr, nc), self.env.grid[nr][nc] == 1, self.sensor_accuracy))
 
-    
-        self.beliefs = update_belief_map(self.beliefs, sensor_reading) # 2. Update belief map using Bayes
+        update_belief_cells(self.beliefs, observations) # 2. Update only the observed cells using Bayes
         
 
         
@@ -114,19 +154,76 @@ class HybridAgent:
 
                 self.kb.add_rule([f"Obstacle({nr},{nc})"], f"NotSafe({nr},{nc})")
     
-    def plan(self):
+    def plan(self, start=None):
         """
         Use search algorithms to plan a path to the goal.
-        Hybrid agent should call A* when it needs a global plan.
+        Hybrid agent calls A* (risk-aware A* with planner='risk') when it
+        needs a global plan.
+        
+        Args:
+            start: Position to plan from (defaults to the agent position)
         """
-        try:
-            path, cost, expanded = self.search_agent.search("astar")
-            # Store path for debugging or future use
-            self.search_plan = path  
-            return path
-        except Exception as e:
-            print(f"[HybridAgent] Search failed: {e}")
+        start = start if start is not None else self.env.agent_pos
+        self.plan_version = self.env.version
+        path = self.path_planner.plan(start)
+        if not path and tracer.level <= WARNING:
+            tracer.event(WARNING, 'hybrid.search_failed', start=start)
+        return path
+    
+    @property
+    def plans_computed(self) -> int:
+        """Searches run by the path planner so far."""
+        return self.path_planner.plans
+    
+    def needs_replan(self, pos) -> bool:
+        """
+        A plan stays valid until the map changes, the agent leaves it, or
+        the beliefs along the rest of it drift past replan_threshold
+        (RiskAwarePlanner.needs_replan). A failed search is not retried
+        until the map changes.
+        """
+        if self.plan_version != self.env.version:
+            return True
+        path, index = self.path_planner.path, self.path_planner.index
+        if not path:
+            return False  # goal unreachable on this version of the map
+        if index >= len(path) or path[index] != pos:
+            return True
+        return self.path_planner.needs_replan()
+    
+    def next_plan_step(self, pos, safe_moves):
+        """
+        Advance along the current plan, replanning only when needed.
+        
+        Returns:
+            The next cell of the plan, or None if the plan cannot be followed
+        """
+        if self.needs_replan(pos):
+            self.plan(pos)
+        planner = self.path_planner
+        if not planner.path or planner.index + 1 >= len(planner.path):
             return None
+        next_pos = planner.path[planner.index + 1]
+        if next_pos not in safe_moves:
+            # logic rejected the step, the plan is out of date
+            if tracer.level <= INFO:
+                tracer.event(INFO, 'hybrid.replan', reason='unsafe_step', step=next_pos)
+            self.plan(pos)
+            if not planner.path or len(planner.path) < 2:
+                return None
+            next_pos = planner.path[1]
+            if next_pos not in safe_moves:
+                return None
+        planner.index += 1
+        return next_pos
+    
+    def planning_stats(self) -> dict:
+        """Plans computed versus ticks, to check that replanning stays rare."""
+        return {
+            'ticks': self.ticks,
+            'plans_computed': self.plans_computed,
+            'plans_per_tick': self.plans_computed / self.ticks if self.ticks else 0.0,
+        }
     
     def reason(self):
         """
@@ -139,12 +236,11 @@ class HybridAgent:
         self.kb.infer()
         facts_after = len(self.kb.facts)
         derived_facts  = facts_after - facts_before
-        print(f"{derived_facts} facts have been derived after the reasoning")
-        #printing new facts
-        if derived_facts > 0:
-            print("New Facts: ")
-            for fact in self.kb.facts:
-                print(" -", fact) 
+        if tracer.level <= INFO:
+            tracer.event(INFO, 'logic.reason', derived=derived_facts, facts=facts_after)
+        # the whole fact base, only when tracing at DEBUG
+        if derived_facts > 0 and tracer.level <= DEBUG:
+            tracer.event(DEBUG, 'logic.facts', facts=sorted(self.kb.facts))
 
     
     def update_beliefs(self):
@@ -155,7 +251,7 @@ class HybridAgent:
 
         # getting sensor belief values for an obstacle
         sensor_reading = (self.env.grid[r][c] == 1)
-        self.beliefs = update_belief_map(self.beliefs,sensor_reading)
+        update_belief_cells(self.beliefs, [((r, c), sensor_reading, self.sensor_accuracy)])
     
     def act(self):
         """
@@ -167,20 +263,23 @@ class HybridAgent:
             3. If need to infer hidden info → use logic
         """
         r, c = self.env.agent_pos
+        self.ticks += 1
         
         # Track visited positions
         self.visited_positions.add((r, c))
         
         # Check if we've reached the goal
         if (r, c) == self.env.goal:
-            print(" Goal reached!") #For debugging
+            if tracer.level <= INFO:
+                tracer.event(INFO, 'hybrid.goal', position=(r, c))
             return (r, c)
         
         # Get valid neighbors
         neighbors = self.env.get_neighbors((r, c))
         
         if not neighbors:
-            print("Agent stuck")
+            if tracer.level <= WARNING:
+                tracer.event(WARNING, 'hybrid.stuck', position=(r, c))
             return (r, c)
         
         # Use logic to filter safe moves
@@ -190,45 +289,28 @@ class HybridAgent:
             if self.kb.ask(f"CanMove({nr},{nc})"):
                 logic_safe_moves.append((nr, nc))
         
-        print(f"[Logic] Found {len(logic_safe_moves)} safe moves: {logic_safe_moves}") 
+        if tracer.level <= DEBUG:
+            tracer.event(DEBUG, 'hybrid.safe_moves', position=(r, c), moves=logic_safe_moves)
         
-        # Use search to find optimal path if we have safe moves
+        # Follow the A* plan if we have safe moves
         if logic_safe_moves:
-            # Update search agent's starting position to current position
-            self.search_agent.current_pos = (r, c)
-            original_start = self.env.start
-            self.env.start = (r, c)  # Temporarily update environment start
-            
-            # Try to use A* to find the best path to goal
-            try:
-                path, cost, expanded = self.search_agent.search("astar")
-                
-                if path and len(path) > 1:
-                    next_pos = path[1]  # path[0] is current position
-                    
-                    # Verify the next position from search is in our logic-safe moves
-                    if next_pos in logic_safe_moves:
-                        print(f"[Search] Following A* path to {next_pos}")
-                        self.env.start = original_start  # Restore original start
-                        self.last_position = (r, c)
-                        return next_pos
-                    else:
-                        print(f"[Search] A* suggests {next_pos} but logic says unsafe")
-                self.env.start = original_start  # Restore original start
-            except Exception as e:
-                print(f"[Search] Failed: {e}")
-                self.env.start = original_start  # Restore original start
+            next_pos = self.next_plan_step((r, c), logic_safe_moves)
+            if next_pos is not None:
+                if tracer.level <= INFO:
+                    tracer.event(INFO, 'hybrid.decision', source='search', move=next_pos)
+                self.last_position = (r, c)
+                return next_pos
         
         # Use probability to choose safest uncertain move
         # If logic didn't give us safe moves or search failed, use probabilistic reasoning
         if not logic_safe_moves:
-            print("[Probability] No logically safe moves, using belief map")
             
             # Use probabilistic agent's decision-making
             prob_choice = self.prob_agent.act()
             
             if prob_choice in neighbors:
-                print(f"[Probability] Choosing {prob_choice} based on beliefs")
+                if tracer.level <= INFO:
+                    tracer.event(INFO, 'hybrid.decision', source='probability', move=prob_choice)
                 self.last_position = (r, c)
                 return prob_choice
         
@@ -252,12 +334,12 @@ class HybridAgent:
                     self.env.manhattan_distance(cell, self.env.goal)  # Then prefer closer to goal
                 )
             )
-            print(f"[Hybrid] Choosing {best_move} (logic safe + exploration)")
+            if tracer.level <= INFO:
+                tracer.event(INFO, 'hybrid.decision', source='logic', move=best_move)
             self.last_position = (r, c)
             return best_move
         
         # STEP 5: Fallback - choose any neighbor with lowest belief
-        print("[Fallback] Choosing neighbor with lowest obstacle belief")
         candidates = []
         for pos in logic_safe_moves:
             if pos != self.last_position:
@@ -272,6 +354,8 @@ class HybridAgent:
                 self.env.manhattan_distance(cell, self.env.goal)
             )
         )
+        if tracer.level <= INFO:
+            tracer.event(INFO, 'hybrid.decision', source='fallback', move=fallback_move)
         self.last_position = (r, c)
         return fallback_move
 
@@ -6,8 +6,9 @@ TODO: Implement logic-based reasoning agent
 Phase 2 of the project (Week 3-4)
 """
 
-from environment import GridWorld
-from ai_core.knowledge_base import KnowledgeBase
+from environment import GridWorld, OBSTACLE
+from ai_core.knowledge_base import KnowledgeBase, mark_obstacle
+from utils.tracing import tracer, DEBUG, INFO
 
 
 class LogicAgent:
@@ -15,10 +16,35 @@ class LogicAgent:
     An agent that uses propositional logic to reason about the world.
     """
     
-    def __init__(self, environment: GridWorld):
-        """Initialize the logic agent."""
+    def __init__(self, environment: GridWorld, kb=None, listen: bool = True):
+        """
+        Initialize the logic agent.
+        
+        Args:
+            environment: The GridWorld environment
+            kb: Knowledge base backend (KnowledgeBase or GridKnowledgeBase);
+                a new KnowledgeBase is created when omitted
+            listen: Follow map changes (False when an owner agent that
+                    shares the KB already does)
+        """
         self.env = environment
-        self.kb = KnowledgeBase()
+        self.kb = kb if kb is not None else KnowledgeBase()
+        
+        # Keep the KB consistent when the map changes during a run
+        self.listening = listen
+        if listen:
+            self.env.add_listener(self.on_cell_changed)
+    
+    def close(self):
+        """Stop following map changes (lets the environment drop the agent)."""
+        if self.listening:
+            self.env.remove_listener(self.on_cell_changed)
+            self.listening = False
+        
+    def on_cell_changed(self, row: int, col: int, cell_type: int):
+        """Retract facts about a cell that just became an obstacle."""
+        if cell_type == OBSTACLE:
+            mark_obstacle(self.kb, row, col)
         
     def perceive(self):
         """Perceive the environment and update knowledge base."""
@@ -96,12 +122,11 @@ class LogicAgent:
         self.kb.infer()
         facts_after = len(self.kb.facts)
         derived_facts  = facts_after - facts_before
-        print(f"{derived_facts} facts have been derived after the reasoning")
-        #printing new facts
-        if derived_facts > 0:
-            print("New Facts: ")
-            for fact in self.kb.facts:
-                print(" -", fact) 
+        if tracer.level <= INFO:
+            tracer.event(INFO, 'logic.reason', derived=derived_facts, facts=facts_after)
+        # the whole fact base, only when tracing at DEBUG
+        if derived_facts > 0 and tracer.level <= DEBUG:
+            tracer.event(DEBUG, 'logic.facts', facts=sorted(self.kb.facts))
 
     
     def act(self):
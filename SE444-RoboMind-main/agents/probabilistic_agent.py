@@ -1,6 +1,13 @@
+from collections import deque
+
+import numpy as np
+
 from environment import GridWorld
 from ai_core.bayes_reasoning import bayes_update
-from ai_core.bayes_reasoning import update_belief_map # Imported from bayes_reasoning.py file
+from ai_core.bayes_reasoning import update_belief_cells
+from ai_core.bayes_reasoning import OccupancyGrid, INITIAL_BELIEF, SENSOR_ACCURACY
+from ai_core.exploration import ExplorationMap
+from ai_core.search_algorithms import risk_astar
 
 
 class ProbabilisticAgent:
@@ -8,21 +15,92 @@ class ProbabilisticAgent:
     An agent that uses Bayesian reasoning to handle uncertainty.
     """
     
-    def __init__(self, environment: GridWorld):
-        """Initialize the probabilistic agent."""
+    def __init__(self, environment: GridWorld, beliefs=None, mode='greedy',
+                 initial_belief: float = INITIAL_BELIEF, sensor_accuracy: float = SENSOR_ACCURACY):
+        """
+        Initialize the probabilistic agent.
+        
+        Args:
+            environment: The GridWorld environment
+            beliefs: Belief store to share with other agents (updated in
+                     place); a new OccupancyGrid is created when omitted
+            mode: 'greedy' moves to the neighbor with the lowest belief,
+                  'explore' travels to the frontier viewpoint with the best
+                  expected information gain
+            initial_belief: Prior obstacle probability of unobserved cells
+                            (used when a new belief store is created)
+            sensor_accuracy: Probability that a sensor reading is correct
+        """
         self.env = environment
-        self.beliefs = {}  # Belief map: position -> probability
-        for row in range(self.env.height):
-            for column in range(self.env.width):
-                self.beliefs[(row, column)] = 0.35 # Assumed initial belief
+        # Belief map: position -> probability, kept as a log-odds occupancy grid
+        if beliefs is None:
+            beliefs = OccupancyGrid(self.env.height, self.env.width, initial_belief) # Assumed initial belief
+        self.beliefs = beliefs
+        if self.env.beliefs is None:
+            self.env.beliefs = self.beliefs  # let the renderer draw our beliefs
+        self.sensor_accuracy = sensor_accuracy
         self.last_pos = None
         
+        # Exploration state (mode='explore')
+        self.mode = mode
+        self.explorer = (ExplorationMap(self.beliefs, sensor_accuracy=self.sensor_accuracy)
+                         if mode == 'explore' else None)
+        self.target = None     # viewpoint we are travelling to
+        self.route = deque()   # remaining cells to the target
+        self.unreachable = []  # targets no route reached (never enterable)
+        
     def update_beliefs(self, sensor_reading, position):
         """Update beliefs using Bayes' rule."""
-        self.beliefs = update_belief_map(self.beliefs,sensor_reading)
+        # The reading is about the cell we stand on, so only that cell changes
+        update_belief_cells(self.beliefs, [(position, sensor_reading, self.sensor_accuracy)])
+        if self.explorer is not None:
+            self.explorer.sync([position])
+    
+    def explore_step(self):
+        """
+        Next move towards the most informative frontier viewpoint, or None
+        when there is nothing left to explore.
+        
+        Frontiers and the route come from the beliefs: the route may cross
+        unmapped cells but not cells mapped as obstacles. Moves are still
+        limited to env.get_neighbors(), like every other agent's.
+        """
+        position = self.env.agent_pos
+        if self.target == position:
+            self.target = None
+        if (self.target is None or not self.route
+                or self.route[0] not in self.env.get_neighbors(position)):
+            self.explorer.sync()
+            free = self.explorer.believed_free()
+            for cell in self.unreachable:
+                free[cell] = False
+            # cells ruled out as free get an infinite penalty (chance mode)
+            blocked = np.where(free, 0.0, 1.0)
+            heuristic = 'octile' if self.env.connectivity == 8 else 'manhattan'
+            while True:
+                self.target = self.explorer.best_target(position, free)
+                if self.target is None:
+                    return None
+                path, cost, expanded = risk_astar(self.env, position, self.target, blocked,
+                                                  mode='chance', max_risk=0.5,
+                                                  heuristic=heuristic)
+                if path:
+                    break
+                # e.g. an obstacle the agent never stood on, so it is unmapped
+                self.unreachable.append(self.target)
+                free[self.target] = False
+                blocked[self.target] = 1.0
+            self.route = deque(path[1:])
+        return self.route.popleft()
     
     def act(self):
         """Decide action based on probabilistic beliefs."""
+        if self.mode == 'explore':
+            step = self.explore_step()
+            if step is not None:
+                self.last_pos = self.env.agent_pos
+                return step
+        
         position = self.env.agent_pos # Get current position
         neighbors = self.env.get_neighbors(position) # Get valid neighbors
         if not neighbors:
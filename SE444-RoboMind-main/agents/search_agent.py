@@ -12,7 +12,13 @@ Phase 1 of the project (Week 1-2)
 
 from environment import GridWorld
 from typing import Tuple, List, Optional
-from ai_core.search_algorithms import bfs, ucs, astar
+from ai_core.search_algorithms import (bfs, ucs, astar, bidirectional_bfs, bidirectional_astar,
+                                     ida_star, nearest_goal, risk_astar)
+from utils.tracing import tracer, INFO
+
+# Default give-up point of 'ida_star': small memory budgets re-expand a lot,
+# and an unreachable goal would otherwise keep the agent searching for ages
+IDA_EXPANSIONS_PER_CELL = 100
 
 
 class SearchAgent:
@@ -30,35 +36,74 @@ class SearchAgent:
         self.env = environment
         self.path = []
         self.current_pos = environment.start
+        self.search_stats = {}   # extra figures of the last search (IDA* memory use)
     
-    def search(self, algorithm='bfs', heuristic='manhattan') -> Tuple[Optional[List], float, int]:
+    def search(self, algorithm='bfs', heuristic='manhattan',
+               start: Optional[Tuple[int, int]] = None,
+               max_nodes: Optional[int] = None, max_bytes: Optional[int] = None,
+               max_expansions: Optional[int] = None) -> Tuple[Optional[List], float, int]:
         """
         Find a path from start to goal using the specified algorithm.
         
         Args:
-            algorithm: 'bfs', 'ucs', or 'astar'
-            heuristic: 'manhattan' or 'euclidean' (for A* only)
+            algorithm: 'bfs', 'ucs', 'astar', 'bidirectional_bfs',
+                       'bidirectional_astar', 'ida_star', 'nearest_goal' or
+                       'risk_astar'
+            heuristic: 'manhattan', 'euclidean', 'octile' or 'alt' (for the
+                       A* variants; 'alt' uses the map's landmark table)
+            start: Position to search from (defaults to env.start)
+            max_nodes: Memory budget of 'ida_star' in table entries
+                       (defaults to one per cell)
+            max_bytes: Memory budget of 'ida_star' in bytes instead
+            max_expansions: Expansions after which 'ida_star' gives up
+                            (defaults to IDA_EXPANSIONS_PER_CELL per cell)
+        
+        'risk_astar' plans on the belief map shared through env.beliefs.
+        'ida_star' stores its memory use in self.search_stats.
+        'nearest_goal' heads for the closest of env.get_goals().
         
         Returns:
             path: List of (row, col) tuples forming the path
             cost: Total path cost
             expanded: Number of nodes expanded during search
         """
-        print(f"\n🔍 Running {algorithm.upper()} search...")
-        print(f"   Start: {self.env.start}")
-        print(f"   Goal: {self.env.goal}")
+        start = start if start is not None else self.env.start
+        self.search_stats = {}
+        if tracer.level <= INFO:
+            tracer.event(INFO, 'search.start', algorithm=algorithm, start=start, goal=self.env.goal)
         
         # Call the appropriate search algorithm
         if algorithm == 'bfs':
-            path, cost, expanded = bfs(self.env, self.env.start, self.env.goal)
+            path, cost, expanded = bfs(self.env, start, self.env.goal)
         elif algorithm == 'ucs':
-            path, cost, expanded = ucs(self.env, self.env.start, self.env.goal)
+            path, cost, expanded = ucs(self.env, start, self.env.goal)
         elif algorithm == 'astar':
-            path, cost, expanded = astar(self.env, self.env.start, self.env.goal, heuristic)
+            path, cost, expanded = astar(self.env, start, self.env.goal, heuristic)
+        elif algorithm == 'bidirectional_bfs':
+            path, cost, expanded = bidirectional_bfs(self.env, start, self.env.goal)
+        elif algorithm == 'bidirectional_astar':
+            path, cost, expanded = bidirectional_astar(self.env, start, self.env.goal, heuristic)
+        elif algorithm == 'ida_star':
+            if max_expansions is None:
+                max_expansions = IDA_EXPANSIONS_PER_CELL * self.env.width * self.env.height
+            path, cost, expanded = ida_star(self.env, start, self.env.goal, heuristic,
+                                            max_nodes, self.search_stats, max_bytes,
+                                            max_expansions)
+        elif algorithm == 'nearest_goal':
+            path, cost, expanded = nearest_goal(self.env, start)
+        elif algorithm == 'risk_astar':
+            if self.env.beliefs is None:
+                raise ValueError("risk_astar needs a belief map in env.beliefs")
+            path, cost, expanded = risk_astar(self.env, start, self.env.goal,
+                                              self.env.beliefs, heuristic=heuristic)
         else:
             raise ValueError(f"Unknown algorithm: {algorithm}")
         
         self.path = path
+        if tracer.level <= INFO:
+            tracer.event(INFO, 'search.done', algorithm=algorithm, found=path is not None,
+                         length=len(path) if path else 0, cost=cost, expanded=expanded,
+                         **self.search_stats)
         
         return path, cost, expanded
     
@@ -1,5 +1,13 @@
+import math
+from collections.abc import Mapping
 from typing import Dict, Tuple
 
+import numpy as np
+
+# Defaults of the agents' sensor model; both are sweepable (utils/sweep.py)
+INITIAL_BELIEF = 0.35     # prior P(obstacle) of a cell never observed
+SENSOR_ACCURACY = 0.9     # P(reading is correct)
+
 
 def bayes_update(prior: float, likelihood: float, evidence: float) -> float:
 
@@ -18,9 +26,315 @@ def compute_evidence(prior: float, likelihood_h: float, likelihood_not_h: float)
     return evidence 
 
 
+class CellMap(Mapping):
+    """
+    Dict-style view shared by the array-backed belief maps.
+    
+    Keys are (row, col) tuples in row-major order; subclasses provide
+    __getitem__ and __setitem__ on top of their own arrays.
+    """
+    
+    height: int
+    width: int
+    
+    def _index(self, cell) -> Tuple[int, int]:
+        try:
+            row, col = cell
+        except (TypeError, ValueError):
+            raise KeyError(cell)
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise KeyError(cell)
+        return row, col
+    
+    def __iter__(self):
+        for row in range(self.height):
+            for col in range(self.width):
+                yield (row, col)
+    
+    def __len__(self) -> int:
+        return self.height * self.width
+
+
+class BeliefGrid(CellMap):
+    """
+    Belief map backed by a float array with the same shape as env.grid.
+    
+    values[row, col] holds P(obstacle at (row, col)). The grid also behaves
+    like the old Dict[(row, col) -> float] belief map (beliefs[cell],
+    beliefs.get(cell, 0.5), iteration over cells) so existing agent code
+    keeps working, but updates happen in place with vectorized NumPy.
+    """
+    
+    def __init__(self, height: int, width: int, initial_belief: float = INITIAL_BELIEF):
+        """
+        Create a belief grid.
+        
+        Args:
+            height: Number of rows (env.height)
+            width: Number of columns (env.width)
+            initial_belief: Prior P(obstacle) for every cell
+        """
+        self.height = height
+        self.width = width
+        # float32 halves the memory traffic of a whole-map update
+        self.values = np.full((height, width), initial_belief, dtype=np.float32)
+        self._evidence = np.empty_like(self.values)  # scratch buffer for updates
+        self.version = 0  # bumped on every change so readers can detect updates
+    
+    def apply_reading(self, sensor_reading: bool, sensor_accuracy: float = SENSOR_ACCURACY):
+        """
+        Apply one sensor reading to every cell, in place.
+        
+        Same result as calling compute_evidence() and bayes_update() for
+        each cell, with evidence 0 giving posterior 0.
+        """
+        if sensor_reading:
+            likelihood, not_likelihood = sensor_accuracy, 1 - sensor_accuracy
+        else:
+            likelihood, not_likelihood = 1 - sensor_accuracy, sensor_accuracy
+        
+        values, evidence = self.values, self._evidence
+        # evidence = likelihood * p + not_likelihood * (1 - p)
+        np.multiply(values, likelihood - not_likelihood, out=evidence)
+        evidence += not_likelihood
+        # posterior = likelihood * p / evidence
+        values *= likelihood
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(values, evidence, out=values)
+        if likelihood == 0 or not_likelihood == 0:
+            np.nan_to_num(values, copy=False, nan=0.0)  # 0/0 -> 0 like bayes_update
+        self.version += 1
+    
+    def observe(self, observations):
+        """
+        Apply a sparse batch of observations, touching only those cells.
+        
+        Args:
+            observations: Iterable of ((row, col), sensor_reading, sensor_accuracy)
+        """
+        observations = list(observations)
+        if len(observations) <= 16:
+            # Per-tick batches are tiny; plain Python beats array set-up here
+            values = self.values
+            for (row, col), sensor_reading, sensor_accuracy in observations:
+                prior = float(values[row, col])
+                likelihood, not_likelihood = sensor_model(sensor_reading, sensor_accuracy)
+                evidence = compute_evidence(prior, likelihood, not_likelihood)
+                values[row, col] = bayes_update(prior, likelihood, evidence)
+            self.version += 1
+            return
+        count = len(observations)
+        rows = np.fromiter((obs[0][0] for obs in observations), dtype=np.intp, count=count)
+        cols = np.fromiter((obs[0][1] for obs in observations), dtype=np.intp, count=count)
+        readings = np.fromiter((bool(obs[1]) for obs in observations), dtype=bool, count=count)
+        accuracies = np.fromiter((obs[2] for obs in observations), dtype=np.float64, count=count)
+        self.observe_arrays(rows, cols, readings, accuracies)
+    
+    def observe_arrays(self, rows: np.ndarray, cols: np.ndarray,
+                       readings: np.ndarray, accuracies: np.ndarray):
+        """
+        Vectorized form of observe() for callers that already hold arrays.
+        
+        Cost is O(number of observations) and independent of the map size.
+        Repeated cells in one batch are applied one after another.
+        """
+        flat = rows * self.width + cols
+        if np.unique(flat).size != flat.size:
+            # Fancy-index assignment would drop repeated cells, go one by one
+            for i in range(flat.size):
+                self.observe_arrays(rows[i:i + 1], cols[i:i + 1],
+                                    readings[i:i + 1], accuracies[i:i + 1])
+            return
+        
+        likelihood = np.where(readings, accuracies, 1 - accuracies)
+        not_likelihood = 1 - likelihood
+        prior = self.values[rows, cols].astype(np.float64)
+        evidence = likelihood * prior + not_likelihood * (1 - prior)
+        posterior = np.divide(likelihood * prior, evidence,
+                              out=np.zeros_like(prior), where=evidence != 0)
+        self.values[rows, cols] = posterior
+        self.version += 1
+    
+    def probabilities(self) -> np.ndarray:
+        """Return the P(obstacle) array (no copy)."""
+        return self.values
+    
+    def copy(self) -> "BeliefGrid":
+        """Return an independent copy of the grid."""
+        clone = BeliefGrid(self.height, self.width)
+        np.copyto(clone.values, self.values)
+        return clone
+    
+    def __getitem__(self, cell) -> float:
+        return float(self.values[self._index(cell)])
+    
+    def __setitem__(self, cell, value: float):
+        self.values[self._index(cell)] = value
+        self.version += 1
+
+
+def reading_log_odds(sensor_reading: bool, sensor_accuracy: float = SENSOR_ACCURACY) -> float:
+    """
+    Log-odds increment of one sensor reading.
+    
+    log(P(reading | obstacle) / P(reading | free)); a perfect sensor gives
+    +/- infinity, which the occupancy grid clamps.
+    """
+    likelihood, not_likelihood = sensor_model(sensor_reading, sensor_accuracy)
+    if not_likelihood == 0:
+        return math.inf
+    if likelihood == 0:
+        return -math.inf
+    return math.log(likelihood / not_likelihood)
+
+
+class OccupancyGrid(CellMap):
+    """
+    Occupancy-grid belief map stored in log-odds form.
+    
+    log_odds[row, col] = log(p / (1 - p)) for p = P(obstacle). A Bayes update
+    with a sensor reading becomes a single addition of the reading's
+    log-odds constant, clamped to [-clamp, clamp], so millions of fused
+    readings neither underflow to 0/1 nor need a division per update.
+    
+    Reading the grid like a dict (beliefs[cell], beliefs.get(cell, 0.5))
+    returns probabilities from a cached probability view.
+    """
+    
+    def __init__(self, height: int, width: int, initial_belief: float = INITIAL_BELIEF,
+                 clamp: float = 10.0):
+        """
+        Create an occupancy grid.
+        
+        Args:
+            height: Number of rows (env.height)
+            width: Number of columns (env.width)
+            initial_belief: Prior P(obstacle) for every cell (0 and 1 are
+                            clamped like every update)
+            clamp: Log-odds bound; 10 keeps p within [4.5e-5, 0.99995]
+        """
+        self.height = height
+        self.width = width
+        self.clamp = clamp
+        if 0 < initial_belief < 1:
+            initial = max(-clamp, min(clamp, math.log(initial_belief / (1 - initial_belief))))
+        else:
+            initial = clamp if initial_belief >= 1 else -clamp
+        self.log_odds = np.full((height, width), initial, dtype=np.float32)
+        
+        # Probability view, refreshed lazily after whole-map updates
+        self._probabilities = np.full((height, width), 1 / (1 + math.exp(-initial)),
+                                      dtype=np.float32)
+        self._stale = False
+        self._increments = {}  # (reading, accuracy) -> log-odds constant
+        self.version = 0  # bumped on every change so readers can detect updates
+    
+    def increment(self, sensor_reading: bool, sensor_accuracy: float = SENSOR_ACCURACY) -> float:
+        """Precomputed log-odds constant for a (reading, accuracy) pair."""
+        key = (bool(sensor_reading), sensor_accuracy)
+        value = self._increments.get(key)
+        if value is None:
+            value = reading_log_odds(*key)
+            self._increments[key] = value
+        return value
+    
+    def apply_reading(self, sensor_reading: bool, sensor_accuracy: float = SENSOR_ACCURACY):
+        """Apply one sensor reading to every cell, in place."""
+        increment = self.increment(sensor_reading, sensor_accuracy)
+        self.log_odds += np.float32(max(-self.clamp, min(self.clamp, increment)))
+        np.clip(self.log_odds, -self.clamp, self.clamp, out=self.log_odds)
+        self._stale = True
+        self.version += 1
+    
+    def observe(self, observations):
+        """
+        Apply a sparse batch of observations, touching only those cells.
+        
+        Args:
+            observations: Iterable of ((row, col), sensor_reading, sensor_accuracy)
+        """
+        observations = list(observations)
+        if len(observations) <= 16:
+            log_odds, probabilities, clamp = self.log_odds, self._probabilities, self.clamp
+            for (row, col), sensor_reading, sensor_accuracy in observations:
+                value = float(log_odds[row, col]) + self.increment(sensor_reading, sensor_accuracy)
+                value = max(-clamp, min(clamp, value))
+                log_odds[row, col] = value
+                probabilities[row, col] = 1.0 / (1.0 + math.exp(-value))
+            self.version += 1
+            return
+        count = len(observations)
+        rows = np.fromiter((obs[0][0] for obs in observations), dtype=np.intp, count=count)
+        cols = np.fromiter((obs[0][1] for obs in observations), dtype=np.intp, count=count)
+        readings = np.fromiter((bool(obs[1]) for obs in observations), dtype=bool, count=count)
+        accuracies = np.fromiter((obs[2] for obs in observations), dtype=np.float64, count=count)
+        self.observe_arrays(rows, cols, readings, accuracies)
+    
+    def observe_arrays(self, rows: np.ndarray, cols: np.ndarray,
+                       readings: np.ndarray, accuracies: np.ndarray):
+        """
+        Vectorized form of observe() for callers that already hold arrays.
+        
+        Repeated cells in one batch are summed before clamping.
+        """
+        likelihood = np.where(readings, accuracies, 1 - accuracies)
+        with np.errstate(divide='ignore'):
+            increments = np.log(likelihood) - np.log1p(-likelihood)
+        np.clip(increments, -self.clamp, self.clamp, out=increments)
+        np.add.at(self.log_odds, (rows, cols), increments.astype(np.float32))
+        touched = np.clip(self.log_odds[rows, cols], -self.clamp, self.clamp)
+        self.log_odds[rows, cols] = touched
+        if not self._stale:
+            self._probabilities[rows, cols] = 1.0 / (1.0 + np.exp(-touched))
+        self.version += 1
+    
+    def probabilities(self) -> np.ndarray:
+        """
+        Return the P(obstacle) array.
+        
+        The array is owned by the grid and refreshed in place, so callers
+        must not modify it.
+        """
+        if self._stale:
+            view = self._probabilities
+            np.negative(self.log_odds, out=view)
+            np.exp(view, out=view)
+            view += 1
+            np.reciprocal(view, out=view)
+            self._stale = False
+        return self._probabilities
+    
+    def copy(self) -> "OccupancyGrid":
+        """Return an independent copy of the grid."""
+        clone = OccupancyGrid(self.height, self.width, clamp=self.clamp)
+        np.copyto(clone.log_odds, self.log_odds)
+        clone._stale = True
+        return clone
+    
+    def __getitem__(self, cell) -> float:
+        row, col = self._index(cell)
+        return float(self.probabilities()[row, col])
+    
+    def __setitem__(self, cell, value: float):
+        row, col = self._index(cell)
+        if value <= 0:
+            log_odds = -self.clamp
+        elif value >= 1:
+            log_odds = self.clamp
+        else:
+            log_odds = max(-self.clamp, min(self.clamp, math.log(value / (1 - value))))
+        self.log_odds[row, col] = log_odds
+        self.probabilities()[row, col] = 1.0 / (1.0 + math.exp(-log_odds))
+        self.version += 1
+
+
 def update_belief_map(belief_map: Dict[Tuple[int, int], float],
                       sensor_reading: bool,
-                      sensor_accuracy: float = 0.9) -> Dict[Tuple[int, int], float]:
+                      sensor_accuracy: float = SENSOR_ACCURACY) -> Dict[Tuple[int, int], float]:
+    # Array-backed belief maps are updated in place with one vectorized pass
+    if isinstance(belief_map, (BeliefGrid, OccupancyGrid)):
+        belief_map.apply_reading(sensor_reading, sensor_accuracy)
+        return belief_map
     updated_belief_map = belief_map.copy() #Get a copy of current belief map
     for cell in belief_map: # Traverse map
         prior = belief_map[cell] # Get prior belief
@@ -41,7 +355,29 @@ def update_belief_map(belief_map: Dict[Tuple[int, int], float],
     
    
 
-def sensor_model(actual_state: bool, sensor_accuracy: float = 0.9) -> Tuple[float, float]:
+def update_belief_cells(belief_map, observations):
+    """
+    Update only the observed cells of a belief map, in place.
+    
+    Args:
+        belief_map: BeliefGrid or Dict[(row, col) -> float]
+        observations: Iterable of ((row, col), sensor_reading, sensor_accuracy)
+    
+    Returns:
+        The same belief map, updated in O(number of observations)
+    """
+    if isinstance(belief_map, (BeliefGrid, OccupancyGrid)):
+        belief_map.observe(observations)
+        return belief_map
+    for cell, sensor_reading, sensor_accuracy in observations:
+        prior = belief_map[cell]
+        likelihood, not_likelihood = sensor_model(sensor_reading, sensor_accuracy)
+        evidence = compute_evidence(prior, likelihood, not_likelihood)
+        belief_map[cell] = bayes_update(prior, likelihood, evidence)
+    return belief_map
+
+
+def sensor_model(actual_state: bool, sensor_accuracy: float = SENSOR_ACCURACY) -> Tuple[float, float]:
     
     if actual_state == True:  # obstacle exists
         return sensor_accuracy, 1 - sensor_accuracy
@@ -108,5 +444,27 @@ if __name__ == "__main__":
     except NotImplementedError:
         print("\n⚠️  Bayes' rule not implemented yet!")
     
+    print("\n" + "=" * 60)
+    print("  Example: Vectorized belief grid")
+    print("=" * 60)
+    
+    import time
+    grid = BeliefGrid(1000, 1000, 0.35)
+    grid.apply_reading(False)  # warm up
+    start = time.perf_counter()
+    grid.apply_reading(True)
+    elapsed = time.perf_counter() - start
+    print(f"\n1000x1000 belief update: {elapsed * 1000:.2f} ms")
+    print(f"P(Obstacle) at (0,0): {grid[(0, 0)]:.3f}")
+    
+    occupancy = OccupancyGrid(1000, 1000, 0.35)
+    start = time.perf_counter()
+    occupancy.apply_reading(True)
+    elapsed = time.perf_counter() - start
+    print(f"1000x1000 log-odds update: {elapsed * 1000:.2f} ms")
+    for _ in range(1_000_000 // 1000):
+        occupancy.observe([((0, 0), True, 0.9)] * 1000)
+    print(f"P(Obstacle) at (0,0) after 1M readings: {occupancy[(0, 0)]:.5f}")
+    
     print("\n💡 Tip: Start with the basic bayes_update() function,")
     print("   then build up to belief maps!")
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+Exploration - Information-Gain Viewpoint Selection
+SE444 - Artificial Intelligence Course Project
+
+Scores where the robot should go next by how much a sensor reading there
+is expected to reduce the entropy of the belief map.
+
+    entropy()                   - binary entropy of every cell, vectorized
+    expected_information_gain() - expected entropy drop of one noisy reading
+    ExplorationMap              - keeps both rasters in sync with a belief
+                                  store, detects frontiers and picks targets
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def entropy(probabilities: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Binary entropy H(p) in bits for every cell.
+
+    H(p) = -p log2 p - (1 - p) log2 (1 - p), with H(0) = H(1) = 0.
+    """
+    p = np.clip(probabilities, 1e-12, 1 - 1e-12)
+    result = -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+def expected_information_gain(probabilities: np.ndarray, sensor_accuracy: float = 0.9) -> np.ndarray:
+    """
+    Expected entropy reduction of observing each cell once.
+
+    IG(p) = H(p) - [P(z=1) H(p | z=1) + P(z=0) H(p | z=0)] with the same
+    sensor model as bayes_reasoning (reading correct with sensor_accuracy).
+    """
+    p = np.asarray(probabilities, dtype=np.float64)
+    a = sensor_accuracy
+    detect = a * p + (1 - a) * (1 - p)           # P(z = obstacle)
+    miss = 1 - detect                            # P(z = free)
+    posterior_detect = np.divide(a * p, detect, out=np.zeros_like(p), where=detect > 0)
+    posterior_miss = np.divide((1 - a) * p, miss, out=np.zeros_like(p), where=miss > 0)
+    return entropy(p) - (detect * entropy(posterior_detect) + miss * entropy(posterior_miss))
+
+
+def box_sum(values: np.ndarray, radius: int) -> np.ndarray:
+    """Sum of values over the (2*radius+1)^2 square around every cell."""
+    if radius <= 0:
+        return values.copy()
+    height, width = values.shape
+    integral = np.zeros((height + 1, width + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(values, axis=0), axis=1, out=integral[1:, 1:])
+    rows = np.arange(height)
+    cols = np.arange(width)
+    top = np.clip(rows - radius, 0, height)[:, None]
+    bottom = np.clip(rows + radius + 1, 0, height)[:, None]
+    left = np.clip(cols - radius, 0, width)[None, :]
+    right = np.clip(cols + radius + 1, 0, width)[None, :]
+    return integral[bottom, right] - integral[top, right] - integral[bottom, left] + integral[top, left]
+
+
+class ExplorationMap:
+    """
+    Entropy and information-gain rasters that follow a belief store.
+
+    sync() only recomputes the cells whose belief changed since the last
+    call. Callers that know which cells they just observed pass them in,
+    which keeps a tick's update proportional to those cells; otherwise
+    one comparison pass over the map finds them.
+    """
+
+    def __init__(self, beliefs, sensor_accuracy: float = 0.9, sensor_radius: int = 0,
+                 known_entropy: float = 0.5):
+        """
+        Args:
+            beliefs: BeliefGrid/OccupancyGrid to follow
+            sensor_accuracy: Accuracy of one reading
+            sensor_radius: Cells seen around a viewpoint (0 = the cell itself)
+            known_entropy: Cells at or below this entropy (bits) count as mapped
+        """
+        self.beliefs = beliefs
+        self.sensor_accuracy = sensor_accuracy
+        self.sensor_radius = sensor_radius
+        self.known_entropy = known_entropy
+
+        probabilities = beliefs.probabilities()
+        self._last = probabilities.copy()
+        self.entropy = entropy(probabilities).astype(np.float32)
+        self.gain = expected_information_gain(probabilities, sensor_accuracy).astype(np.float32)
+        self._version = getattr(beliefs, 'version', None)
+
+    def sync(self, cells=None) -> int:
+        """
+        Bring the rasters up to date with the belief store.
+
+        Args:
+            cells: (row, col) cells of the one update made since the last
+                   sync, e.g. those just passed to update_belief_cells();
+                   when omitted, or when the store changed more than once
+                   since, every cell is compared with its last value
+
+        Returns:
+            Number of cells that were recomputed
+        """
+        version = getattr(self.beliefs, 'version', None)
+        if version is not None and version == self._version:
+            return 0
+        incremental = (cells is not None and version is not None
+                       and self._version is not None and version == self._version + 1)
+        self._version = version
+        probabilities = self.beliefs.probabilities()
+        if incremental:
+            rows, cols = np.array(list(cells), dtype=np.intp).reshape(-1, 2).T
+            changed = np.unique(np.ravel_multi_index((rows, cols), probabilities.shape))
+        else:
+            changed = np.flatnonzero(probabilities != self._last)
+        if changed.size:
+            p = probabilities.ravel()[changed]
+            self.entropy.ravel()[changed] = entropy(p)
+            self.gain.ravel()[changed] = expected_information_gain(p, self.sensor_accuracy)
+            self._last.ravel()[changed] = p
+        return int(changed.size)
+
+    def total_entropy(self) -> float:
+        """Remaining uncertainty of the whole map in bits."""
+        return float(self.entropy.sum(dtype=np.float64))
+
+    def believed_free(self) -> np.ndarray:
+        """
+        Cells the belief map does not rule out: mapped as free, or not
+        mapped yet whatever their prior.
+        """
+        known = self.entropy <= self.known_entropy
+        return ~(known & (self._last >= 0.5))
+
+    def frontier(self, free: np.ndarray) -> np.ndarray:
+        """
+        Frontier cells: free, not yet mapped, and next to a mapped cell
+        that is believed free.
+
+        Args:
+            free: Boolean raster of traversable cells
+        """
+        known = self.entropy <= self.known_entropy
+        known_free = known & (self._last < 0.5)
+        touches = np.zeros_like(known)
+        touches[1:, :] |= known_free[:-1, :]
+        touches[:-1, :] |= known_free[1:, :]
+        touches[:, 1:] |= known_free[:, :-1]
+        touches[:, :-1] |= known_free[:, 1:]
+        return free & ~known & touches
+
+    def viewpoint_scores(self) -> np.ndarray:
+        """Expected information gain of taking a reading from each cell."""
+        if self.sensor_radius <= 0:
+            return self.gain
+        return box_sum(self.gain, self.sensor_radius)
+
+    def best_target(self, pos: Tuple[int, int], free: np.ndarray,
+                    distance_weight: float = 1.0) -> Optional[Tuple[int, int]]:
+        """
+        Frontier cell with the best gain per unit of travel from pos.
+
+        Returns:
+            (row, col) of the chosen viewpoint, or None when nothing is left
+            to explore
+        """
+        self.sync()
+        candidates = np.flatnonzero(self.frontier(free))
+        if candidates.size == 0:
+            return None
+        width = free.shape[1]
+        rows, cols = np.divmod(candidates, width)
+        distance = np.abs(rows - pos[0]) + np.abs(cols - pos[1])
+        score = self.viewpoint_scores().ravel()[candidates] / (1.0 + distance_weight * distance)
+        best = int(np.argmax(score))
+        return int(rows[best]), int(cols[best])
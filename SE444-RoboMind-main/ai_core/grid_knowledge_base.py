@@ -0,0 +1,406 @@
+"""
+Grid Knowledge Base - Raster Logic Backend
+SE444 - Artificial Intelligence Course Project
+
+A drop-in replacement for KnowledgeBase that stores grid-shaped predicates
+such as Free(r,c), Safe(r,c), Obstacle(r,c), CanMove(r,c) and NotSafe(r,c)
+as NumPy boolean arrays with the same shape as env.grid.
+
+Rules whose premises and conclusion all talk about the same cell
+(e.g. Free(r,c) AND Safe(r,c) → CanMove(r,c)) are grouped by predicate
+pattern and evaluated as elementwise array operations for the whole map
+at once, so forward chaining costs a few array passes instead of millions
+of string set lookups. Any other fact or rule is handled symbolically.
+"""
+
+import re
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+
+
+# Matches "Name(row,col)" propositions
+_CELL_FACT = re.compile(r"^(\w+)\((-?\d+),\s*(-?\d+)\)$")
+
+
+class LayerRule:
+    """
+    A cell-local rule pattern, e.g. ("Free", "Safe") → "CanMove".
+
+    The mask marks the cells where the rule has been added; a mask of None
+    means the rule applies to every cell of the map.
+    """
+
+    def __init__(self, premises: Tuple[str, ...], conclusion: str, mask: Optional[np.ndarray]):
+        self.premises = premises
+        self.conclusion = conclusion
+        self.mask = mask
+
+
+class GridFactView:
+    """
+    Read-only set-like view over the facts of a GridKnowledgeBase.
+
+    Supports len(), iteration and the `in` operator so code written for
+    KnowledgeBase.facts keeps working.
+    """
+
+    def __init__(self, kb: "GridKnowledgeBase"):
+        self.kb = kb
+
+    def __len__(self) -> int:
+        count = sum(int(np.count_nonzero(layer)) for layer in self.kb.layers.values())
+        return count + len(self.kb.symbols)
+
+    def __contains__(self, fact: str) -> bool:
+        return self.kb.holds(fact)
+
+    def __iter__(self):
+        for name, layer in self.kb.layers.items():
+            for r, c in np.argwhere(layer):
+                yield f"{name}({r},{c})"
+        yield from self.kb.symbols
+
+
+class GridKnowledgeBase:
+    """
+    Knowledge base with raster predicates and whole-map forward chaining.
+
+    Offers the same interface as KnowledgeBase: tell(), add_rule(), ask(),
+    infer(), retract() and a `facts` collection.
+    """
+
+    def __init__(self, height: int, width: int):
+        """
+        Initialize an empty grid knowledge base.
+
+        Args:
+            height: Number of rows (env.height)
+            width: Number of columns (env.width)
+        """
+        self.height = height
+        self.width = width
+
+        self.layers = {}        # predicate -> bool array of facts that hold
+        self.told_layers = {}   # predicate -> bool array of facts added with tell()
+        self.layer_rules = {}   # (premises, conclusion) -> LayerRule
+
+        # Facts and rules that are not cell-local
+        self.symbols = set()
+        self.told_symbols = set()
+        self.rules = []               # (premises, conclusion) pairs
+        self.rule_index = {}          # (premises, conclusion) -> rule index
+        self.rule_derived = set()     # facts concluded by symbolic rules
+        self.justifications = {}      # conclusion -> indices of rules that derived it
+        self.dependents = {}          # premise -> indices of rules that use it
+        self.concluding = {}          # conclusion -> indices of rules that conclude it
+
+        self.facts = GridFactView(self)
+        self._scratch = np.zeros((height, width), dtype=bool)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Fact representation
+    # ------------------------------------------------------------------
+
+    def parse(self, fact: str) -> Optional[Tuple[str, int, int]]:
+        """Return (predicate, row, col) for an in-bounds cell fact, else None."""
+        match = _CELL_FACT.match(fact)
+        if match is None:
+            return None
+        name, row, col = match.group(1), int(match.group(2)), int(match.group(3))
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return None
+        return name, row, col
+
+    def layer(self, name: str) -> np.ndarray:
+        """Get (or create) the boolean raster for a predicate."""
+        if name not in self.layers:
+            self.layers[name] = np.zeros((self.height, self.width), dtype=bool)
+            self.told_layers[name] = np.zeros((self.height, self.width), dtype=bool)
+        return self.layers[name]
+
+    def holds(self, fact: str) -> bool:
+        """Check whether a fact is currently in the KB (no inference)."""
+        cell = self.parse(fact)
+        if cell is None:
+            return fact in self.symbols
+        name, row, col = cell
+        layer = self.layers.get(name)
+        return layer is not None and bool(layer[row, col])
+
+    def _set(self, fact: str) -> bool:
+        """Add a fact to the KB; returns True if it was new."""
+        cell = self.parse(fact)
+        if cell is None:
+            if fact in self.symbols:
+                return False
+            self.symbols.add(fact)
+            return True
+        name, row, col = cell
+        layer = self.layer(name)
+        if layer[row, col]:
+            return False
+        layer[row, col] = True
+        return True
+
+    # ------------------------------------------------------------------
+    # KnowledgeBase interface
+    # ------------------------------------------------------------------
+
+    def tell(self, fact: str):
+        """
+        Add a fact to the knowledge base.
+
+        Args:
+            fact: A proposition like "Safe(2,3)" or "Explored(5,6)"
+        """
+        cell = self.parse(fact)
+        if cell is None:
+            self.told_symbols.add(fact)
+        else:
+            name, row, col = cell
+            self.layer(name)
+            self.told_layers[name][row, col] = True
+        if self._set(fact):
+            self._dirty = True
+
+    def add_rule(self, premises: List[str], conclusion: str):
+        """
+        Add an inference rule.
+
+        Rules about a single cell are folded into a raster rule pattern;
+        everything else is kept as a symbolic rule.
+
+        Args:
+            premises: List of propositions that must all be true
+            conclusion: Proposition that follows from premises
+        """
+        parsed = [self.parse(p) for p in premises]
+        head = self.parse(conclusion)
+        cells = {(c[1], c[2]) for c in parsed + [head] if c is not None}
+
+        if head is not None and all(parsed) and len(cells) == 1:
+            row, col = head[1], head[2]
+            key = (tuple(p[0] for p in parsed), head[0])
+            rule = self.layer_rules.get(key)
+            if rule is None:
+                mask = np.zeros((self.height, self.width), dtype=bool)
+                rule = LayerRule(key[0], key[1], mask)
+                self.layer_rules[key] = rule
+            elif rule.mask is None or rule.mask[row, col]:
+                return
+            rule.mask[row, col] = True
+        else:
+            key = (tuple(premises), conclusion)
+            if key in self.rule_index:
+                return
+            index = len(self.rules)
+            self.rule_index[key] = index
+            self.rules.append((premises, conclusion))
+            for premise in premises:
+                self.dependents.setdefault(premise, set()).add(index)
+            self.concluding.setdefault(conclusion, set()).add(index)
+        self._dirty = True
+
+    def add_layer_rule(self, premises: List[str], conclusion: str):
+        """
+        Add a rule pattern that holds for every cell of the map.
+
+        Example:
+            >>> kb.add_layer_rule(["Free", "Safe"], "CanMove")
+            This means: for all cells X, Free(X) AND Safe(X) → CanMove(X)
+        """
+        key = (tuple(premises), conclusion)
+        self.layer_rules[key] = LayerRule(key[0], conclusion, None)
+        self._dirty = True
+
+    def ask(self, query: str) -> bool:
+        """
+        Check if a query can be inferred from the knowledge base.
+
+        Inference only runs when something changed since the last infer().
+        """
+        if self.holds(query):
+            return True
+        if self._dirty:
+            self.infer()
+        return self.holds(query)
+
+    def infer(self):
+        """
+        Forward chain to a fixpoint.
+
+        Each raster rule updates the whole map with one elementwise AND of
+        its premise layers; symbolic rules are evaluated with holds().
+        """
+        scratch = self._scratch
+        changed = True
+        while changed:
+            changed = False
+
+            for rule in self.layer_rules.values():
+                if any(p not in self.layers for p in rule.premises):
+                    continue
+                np.copyto(scratch, self.layers[rule.premises[0]])
+                for premise in rule.premises[1:]:
+                    np.logical_and(scratch, self.layers[premise], out=scratch)
+                if rule.mask is not None:
+                    np.logical_and(scratch, rule.mask, out=scratch)
+                target = self.layer(rule.conclusion)
+                # only the cells that are new (scratch AND NOT target)
+                np.greater(scratch, target, out=scratch)
+                if scratch.any():
+                    np.logical_or(target, scratch, out=target)
+                    changed = True
+
+            for index, (premises, conclusion) in enumerate(self.rules):
+                if all(self.holds(p) for p in premises):
+                    self.justifications.setdefault(conclusion, set()).add(index)
+                    self.rule_derived.add(conclusion)
+                    if self._set(conclusion):
+                        changed = True
+
+        self._dirty = False
+
+    def retract(self, fact: str) -> Set[str]:
+        """
+        Remove a fact and every derived fact that depended on it.
+
+        Delete and re-derive, like KnowledgeBase.retract(), but local:
+            1. Withdraw the fact and everything justified through it: the
+               derived facts of every touched cell (raster rules are
+               cell-local) and the conclusions of symbolic rules using it
+            2. Re-run the raster rules on the touched cells only and restore
+               the symbolic conclusions that still have a justification
+
+        Facts added with tell() are never withdrawn as a side effect.
+
+        Args:
+            fact: The proposition to retract, e.g. "Free(2,3)"
+
+        Returns:
+            The set of facts that are no longer in the KB
+        """
+        cell = self.parse(fact)
+        if cell is None:
+            self.told_symbols.discard(fact)
+        elif cell[0] in self.told_layers:
+            self.told_layers[cell[0]][cell[1], cell[2]] = False
+        if not self.holds(fact):
+            return set()
+
+        # Pass 1: over-delete everything reachable from the retracted fact
+        removed = set()
+        cells = set()
+        pending = [fact]
+        while pending:
+            current = pending.pop()
+            if current in removed or not self.holds(current) or self._is_told(current):
+                continue
+            removed.add(current)
+            cell = self.parse(current)
+            if cell is None:
+                self.symbols.discard(current)
+            else:
+                name, row, col = cell
+                self.layers[name][row, col] = False
+                if (row, col) not in cells:
+                    cells.add((row, col))
+                    pending.extend(self._derived_at(row, col))
+            for index in self.dependents.get(current, ()):
+                conclusion = self.rules[index][1]
+                self.justifications.get(conclusion, set()).discard(index)
+                pending.append(conclusion)
+
+        # Pass 2: re-derive withdrawn facts that still have valid support
+        restored = True
+        while restored:
+            restored = False
+            for row, col in cells:
+                self._derive_cell(row, col)
+            for candidate in list(removed):
+                if self.holds(candidate):
+                    removed.discard(candidate)  # back through a raster rule
+                    continue
+                for index in self.concluding.get(candidate, ()):
+                    if all(self.holds(p) for p in self.rules[index][0]):
+                        self._set(candidate)
+                        self.justifications.setdefault(candidate, set()).add(index)
+                        removed.discard(candidate)
+                        cell = self.parse(candidate)
+                        if cell is not None:
+                            cells.add((cell[1], cell[2]))
+                        restored = True
+                        break
+
+        for gone in removed:
+            self.justifications.pop(gone, None)
+            self.rule_derived.discard(gone)
+        return removed
+
+    def _is_told(self, fact: str) -> bool:
+        """Check whether a fact was added with tell()."""
+        cell = self.parse(fact)
+        if cell is None:
+            return fact in self.told_symbols
+        name, row, col = cell
+        return name in self.told_layers and bool(self.told_layers[name][row, col])
+
+    def _derived_at(self, row: int, col: int) -> List[str]:
+        """Facts holding at one cell that were not added with tell()."""
+        return [f"{name}({row},{col})" for name, layer in self.layers.items()
+                if layer[row, col] and not self.told_layers[name][row, col]]
+
+    def _derive_cell(self, row: int, col: int):
+        """Apply the cell-local rules to one cell until nothing changes."""
+        changed = True
+        while changed:
+            changed = False
+            for rule in self.layer_rules.values():
+                if rule.mask is not None and not rule.mask[row, col]:
+                    continue
+                if all(p in self.layers and self.layers[p][row, col] for p in rule.premises):
+                    target = self.layer(rule.conclusion)
+                    if not target[row, col]:
+                        target[row, col] = True
+                        changed = True
+
+    def __str__(self) -> str:
+        """String representation of KB."""
+        rules = len(self.layer_rules) + len(self.rules)
+        return f"GridKB with {len(self.facts)} facts and {rules} rules"
+
+
+# ============================================================================
+# Testing Code
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    print("=" * 60)
+    print("  Testing Grid Knowledge Base")
+    print("=" * 60 + "\n")
+
+    kb = GridKnowledgeBase(10, 10)
+    kb.tell("Free(2,3)")
+    kb.tell("Safe(2,3)")
+    kb.add_rule(["Free(2,3)", "Safe(2,3)"], "CanMove(2,3)")
+    print(f"Is CanMove(2,3) known? {kb.ask('CanMove(2,3)')}")
+    print(f"Withdrawn after retracting Free(2,3): {sorted(kb.retract('Free(2,3)'))}")
+    print(f"Is CanMove(2,3) still known? {kb.ask('CanMove(2,3)')}")
+
+    # Whole-map inference
+    size = 1000
+    big = GridKnowledgeBase(size, size)
+    free = np.random.rand(size, size) > 0.2
+    big.layer("Free")[:] = free
+    big.told_layers["Free"][:] = free
+    big.add_layer_rule(["Free"], "Safe")
+    big.add_layer_rule(["Free", "Safe"], "CanMove")
+    start = time.perf_counter()
+    big.infer()
+    elapsed = time.perf_counter() - start
+    print(f"\n{size}x{size} map inference: {elapsed * 1000:.2f} ms")
+    print(big)
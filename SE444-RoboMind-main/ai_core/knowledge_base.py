@@ -8,18 +8,31 @@ Phase 2 (Week 3-4)
 
 from typing import Set, List
 
+from utils.tracing import tracer, DEBUG, INFO
+
 
 class KnowledgeBase:
     """
     A simple knowledge base for propositional logic.
     
     Stores facts and rules, performs forward chaining inference.
+    
+    Every derived fact keeps the rules that justify it, so a fact can be
+    retracted later and only the conclusions that depended on it are
+    withdrawn (justification-based truth maintenance).
     """
     
     def __init__(self):
         """Initialize empty knowledge base."""
         self.facts = set()   # Known facts: "Safe(2,3)", "Obstacle(4,5)"
         self.rules = []      # Rules: ("A", "B", "C") means "A AND B → C"
+        
+        # Truth maintenance bookkeeping
+        self.told = set()           # Facts added directly with tell()
+        self.justifications = {}    # conclusion -> indices of rules that derived it
+        self.dependents = {}        # premise -> indices of rules that use it
+        self.concluding = {}        # conclusion -> indices of rules that conclude it
+        self.rule_index = {}        # (premises, conclusion) -> rule index
     
     def tell(self, fact: str):
         """
@@ -35,7 +48,9 @@ class KnowledgeBase:
         """
         # TODO: Implement
         self.facts.add(fact)
-        print(f"Added fact: {fact}")
+        self.told.add(fact)
+        if tracer.level <= DEBUG:
+            tracer.event(DEBUG, 'kb.tell', fact=fact)
     
     def add_rule(self, premises: List[str], conclusion: str):
         """
@@ -50,8 +65,19 @@ class KnowledgeBase:
             This means: If Safe(X) AND Free(X) then CanMove(X)
         """
         # TODO: Implement
+        # Agents re-add the same rules on every perceive(), keep a single copy
+        # so the justification indexes do not grow without bound
+        key = (tuple(premises), conclusion)
+        if key in self.rule_index:
+            return
+        index = len(self.rules)
+        self.rule_index[key] = index
         self.rules.append((premises, conclusion))
-        print(f"Added rule: {' AND '.join(premises)} → {conclusion}")
+        for premise in premises:
+            self.dependents.setdefault(premise, set()).add(index)
+        self.concluding.setdefault(conclusion, set()).add(index)
+        if tracer.level <= DEBUG:
+            tracer.event(DEBUG, 'kb.add_rule', premises=list(premises), conclusion=conclusion)
     
     def ask(self, query: str) -> bool:
         """
@@ -107,8 +133,10 @@ class KnowledgeBase:
             fact_added = False
             #itertae through all rules (premises list, conclusion)
             #and check if premises exists in facts
-            for premises, conclusion in self.rules:
+            for index, (premises, conclusion) in enumerate(self.rules):
                 if all(p in self.facts for p in premises):
+                    #remember that this rule justifies the conclusion
+                    self.justifications.setdefault(conclusion, set()).add(index)
                     #if the premises satisfied the facts, check if the conclusion is new
                     #to add it to the facts and set flag (fact_added = True)
                     if conclusion not in self.facts:
@@ -117,16 +145,97 @@ class KnowledgeBase:
                        
         # raise NotImplementedError("Forward chaining not implemented yet!")
     
+    def retract(self, fact: str) -> Set[str]:
+        """
+        Remove a fact and every derived fact that depended on it.
+        
+        Works incrementally in two passes (delete and re-derive):
+            1. Withdraw the fact and, following the dependency index, every
+               derived conclusion that was justified through it
+            2. Restore the withdrawn facts that still have a justification
+               whose premises all hold without the retracted fact
+        
+        Facts added with tell() are never withdrawn as a side effect, and a
+        fact that still follows from other facts stays in the KB.
+        
+        Args:
+            fact: The proposition to retract, e.g. "Free(2,3)"
+        
+        Returns:
+            The set of facts that are no longer in the KB
+        
+        Example:
+            >>> kb.tell("Free(2,3)")
+            >>> kb.add_rule(["Free(2,3)"], "Safe(2,3)")
+            >>> kb.infer()
+            >>> kb.retract("Free(2,3)")
+            {'Free(2,3)', 'Safe(2,3)'}
+        """
+        self.told.discard(fact)
+        if fact not in self.facts:
+            return set()
+        
+        # Pass 1: over-delete everything reachable from the retracted fact
+        removed = set()
+        pending = [fact]
+        while pending:
+            current = pending.pop()
+            if current in removed or current not in self.facts:
+                continue
+            if current in self.told:
+                continue  # told facts stand on their own
+            removed.add(current)
+            self.facts.discard(current)
+            for index in self.dependents.get(current, ()):
+                conclusion = self.rules[index][1]
+                self.justifications.get(conclusion, set()).discard(index)
+                pending.append(conclusion)
+        
+        # Pass 2: re-derive withdrawn facts that still have valid support
+        restored = True
+        while restored:
+            restored = False
+            for candidate in list(removed):
+                for index in self.concluding.get(candidate, ()):
+                    premises = self.rules[index][0]
+                    if all(p in self.facts for p in premises):
+                        self.facts.add(candidate)
+                        self.justifications.setdefault(candidate, set()).add(index)
+                        removed.discard(candidate)
+                        restored = True
+                        break
+        
+        for gone in removed:
+            self.justifications.pop(gone, None)
+        if tracer.level <= INFO:
+            tracer.event(INFO, 'kb.retract', fact=fact, withdrawn=len(removed))
+        return removed
+    
     def __str__(self) -> str:
         """String representation of KB."""
         return f"KB with {len(self.facts)} facts and {len(self.rules)} rules"
 
 
+def mark_obstacle(kb, row: int, col: int):
+    """
+    Record that (row, col) just became an obstacle, for either KB backend.
+    
+    Withdrawing Free/Safe also withdraws CanMove and anything built on it.
+    """
+    kb.retract(f"Free({row},{col})")
+    kb.retract(f"Safe({row},{col})")
+    kb.tell(f"Obstacle({row},{col})")
+    kb.add_rule([f"Obstacle({row},{col})"], f"NotSafe({row},{col})")
+
+
 # ============================================================================
 # Testing Code
 # ============================================================================
 
 if __name__ == "__main__":
+    from utils import tracing
+    tracing.enable(level=DEBUG)  # show every fact and rule on the console
+    
     print("=" * 60)
     print("  Testing Knowledge Base")
     print("=" * 60 + "\n")
@@ -159,5 +268,11 @@ if __name__ == "__main__":
     except NotImplementedError:
         print("⚠️  Forward chaining not implemented yet!")
     
+    # Retraction (the cell became blocked)
+    print("\nRetracting Free(2,3)...")
+    withdrawn = kb.retract("Free(2,3)")
+    print(f"Withdrawn facts: {sorted(withdrawn)}")
+    print(f"Is CanMove(2,3) still known? {kb.ask('CanMove(2,3)')}")
+    
     print(f"\n{kb}")
     print("\n💡 Tip: Implement forward chaining to automatically derive new facts!")
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+ALT Landmark Heuristics - A*, Landmarks and the Triangle inequality
+SE444 - Artificial Intelligence Course Project
+
+Precomputes exact distances from K landmark cells to every cell of a map.
+For any landmark L the triangle inequality gives
+
+    d(n, goal) >= |d(L, goal) - d(L, n)|
+
+so the largest of these over all landmarks is an admissible heuristic that
+knows about walls, unlike Manhattan or Euclidean distance.
+
+    select_landmarks() - farthest-point landmark selection
+    LandmarkTable      - the distance arrays and the heuristic
+    get_landmarks()    - table for a GridWorld: cached on the world,
+                         loaded from <map file>.landmarks.npz or built
+                         (and saved) on first use
+
+Usage:
+    path, cost, expanded = astar(env, start, goal, heuristic='alt')
+"""
+
+import hashlib
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ai_core.search_algorithms import distance_field
+from utils.tracing import tracer, INFO, WARNING
+
+DEFAULT_LANDMARKS = 8
+
+# Unreachable cells in the stored arrays. Such pairs have no path at all,
+# so whatever the heuristic returns for them is harmless.
+UNREACHABLE = -1.0
+
+# Up to this many cells the heuristic for a goal is computed for the whole
+# map at once; on bigger maps each cell is looked up when A* asks for it
+FULL_FIELD_CELLS = 1 << 20
+
+
+def grid_digest(env) -> str:
+    """Hash of the map layout and connectivity (detects stale cache files)."""
+    digest = hashlib.sha1(np.ascontiguousarray(np.asarray(env.grid) == 1).tobytes())
+    digest.update(f"{env.height}x{env.width}/{env.connectivity}".encode())
+    return digest.hexdigest()
+
+
+def select_landmarks(env, k: int = DEFAULT_LANDMARKS) -> Tuple[List[Tuple[int, int]], List[np.ndarray]]:
+    """
+    Pick k landmarks by farthest-point selection.
+
+    The first landmark is the cell farthest from a seed cell in the main
+    connected region (the map's start when it lies there); each next one
+    maximizes the distance to its nearest landmark so far. Landmarks end
+    up on the outskirts of the map, where they give the tightest bounds.
+
+    Returns:
+        (landmarks, distance fields of the landmarks)
+    """
+    free = np.argwhere(np.asarray(env.grid) != 1)
+    if len(free) == 0:
+        return [], []
+
+    # Start inside the main connected region: the map's start may sit in a
+    # small pocket, and landmarks there would bound nothing elsewhere
+    seeds = [tuple(env.start)] if env.is_valid(env.start) else []
+    seeds += [tuple(int(v) for v in free[i]) for i in np.linspace(0, len(free) - 1, 5, dtype=int)]
+    nearest, reached = None, -1
+    for seed in seeds:
+        field = distance_field(env, seed)
+        count = int(np.isfinite(field).sum())
+        if count > reached:
+            nearest, reached = field, count
+        if 2 * count >= len(free):
+            break
+
+    landmarks, fields = [], []
+    for _ in range(min(k, len(free))):
+        candidates = np.where(np.isfinite(nearest), nearest, -1.0)
+        index = np.unravel_index(int(np.argmax(candidates)), candidates.shape)
+        if candidates[index] <= 0 and landmarks:
+            break  # every reachable cell already is a landmark
+        landmark = (int(index[0]), int(index[1]))
+        field = distance_field(env, landmark)
+        landmarks.append(landmark)
+        fields.append(field)
+        nearest = field if len(fields) == 1 else np.minimum(nearest, field)
+    return landmarks, fields
+
+
+class LandmarkTable:
+    """
+    Distances from K landmarks to every cell, as one float32 array.
+
+    Example:
+        >>> table = LandmarkTable.build(env, k=8)
+        >>> h = table.heuristic(goal)
+        >>> h((0, 0))
+    """
+
+    def __init__(self, landmarks: List[Tuple[int, int]], distances: np.ndarray,
+                 digest: str, connectivity: int = 4, k: Optional[int] = None):
+        self.landmarks = landmarks
+        self.k = k if k is not None else len(landmarks)   # landmarks asked for
+        self.distances = distances                  # (k, height, width) float32
+        self.digest = digest
+        self.connectivity = connectivity
+        self.version = None                         # env.version it matches
+        k, height, width = distances.shape
+        self.width = width
+        # one row of k distances per cell, so a lookup is a single index
+        self._rows = np.ascontiguousarray(distances.reshape(k, -1).T)
+        # float32 rounding of octile distances may overshoot slightly;
+        # shave that off so the heuristic stays admissible
+        self._slack = (4 * float(np.finfo(np.float32).eps) * float(distances.max(initial=0))
+                       if connectivity == 8 else 0.0)
+
+    @classmethod
+    def build(cls, env, k: int = DEFAULT_LANDMARKS) -> "LandmarkTable":
+        """Select landmarks and compute their distance fields."""
+        landmarks, fields = select_landmarks(env, k)
+        if fields:
+            distances = np.stack(fields).astype(np.float32)
+        else:
+            distances = np.zeros((0, env.height, env.width), dtype=np.float32)
+        distances[~np.isfinite(distances)] = UNREACHABLE
+        return cls(landmarks, distances, grid_digest(env), env.connectivity, k)
+
+    def save(self, path: str):
+        np.savez(path, landmarks=np.array(self.landmarks, dtype=np.int32).reshape(-1, 2),
+                 distances=self.distances, digest=np.array(self.digest),
+                 connectivity=np.array(self.connectivity), k=np.array(self.k))
+
+    @classmethod
+    def load(cls, path: str) -> "LandmarkTable":
+        with np.load(path) as data:
+            landmarks = [tuple(int(v) for v in row) for row in data['landmarks']]
+            return cls(landmarks, data['distances'], str(data['digest']),
+                       int(data['connectivity']), int(data['k']))
+
+    def heuristic(self, goal: Tuple[int, int]):
+        """ALT heuristic toward goal: pos -> max over landmarks of |d(L, goal) - d(L, pos)|."""
+        if not self.landmarks:
+            return lambda pos: 0.0
+        rows, width, slack = self._rows, self.width, self._slack
+        to_goal = rows[goal[0] * width + goal[1]]
+
+        if len(rows) <= FULL_FIELD_CELLS:
+            # one vectorized pass for the whole map, then plain list lookups
+            field = np.abs(self.distances - to_goal[:, None, None]).max(axis=0) - slack
+            values = np.maximum(field, 0.0).ravel().tolist()
+            return lambda pos: values[pos[0] * width + pos[1]]
+
+        def h(pos):
+            bound = float(np.abs(rows[pos[0] * width + pos[1]] - to_goal).max()) - slack
+            return bound if bound > 0 else 0.0
+        return h
+
+
+def cache_path(map_file: str, cache_dir: Optional[str] = None) -> str:
+    """Landmark file of a map: next to it, or in cache_dir when given."""
+    if cache_dir is None:
+        return map_file + '.landmarks.npz'
+    return os.path.join(cache_dir, os.path.basename(map_file) + '.landmarks.npz')
+
+
+def get_landmarks(env, k: int = DEFAULT_LANDMARKS, cache_dir: Optional[str] = None) -> LandmarkTable:
+    """
+    Landmark table for env, reusing the cheapest source available.
+
+    1. env.landmarks, if built for the current map version
+    2. the cached <map file>.landmarks.npz, if it matches the map layout and k
+    3. a fresh table, saved next to the map file (or in cache_dir) when
+       there is one and the grid has not been changed since it was loaded
+    """
+    table = env.landmarks
+    if table is not None and table.version == env.version and table.k == k:
+        return table
+
+    digest = grid_digest(env)
+    path = cache_path(env.map_file, cache_dir) if env.map_file else None
+    table = None
+    if path and os.path.exists(path):
+        try:
+            cached = LandmarkTable.load(path)
+            if cached.digest == digest and cached.k == k:
+                table = cached
+        except (OSError, ValueError, KeyError) as error:
+            if tracer.level <= WARNING:
+                tracer.event(WARNING, 'landmarks.bad_cache', path=path, error=str(error))
+
+    if table is None:
+        table = LandmarkTable.build(env, k)
+        if tracer.level <= INFO:
+            tracer.event(INFO, 'landmarks.built', landmarks=len(table.landmarks),
+                         cells=env.width * env.height)
+        if path and env.version == env.map_version:
+            try:
+                if cache_dir is not None:
+                    os.makedirs(cache_dir, exist_ok=True)
+                table.save(path)
+            except OSError as error:
+                if tracer.level <= WARNING:
+                    tracer.event(WARNING, 'landmarks.save_failed', path=path, error=str(error))
+
+    table.version = env.version
+    env.landmarks = table
+    return table
+
+
+# ============================================================================
+# Testing Code
+# ============================================================================
+
+if __name__ == "__main__":
+    import glob
+    import time
+
+    from environment import GridWorld
+    from ai_core.search_algorithms import astar
+
+    print("=" * 60)
+    print("  Testing ALT Landmark Heuristics")
+    print("=" * 60 + "\n")
+
+    maps_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'maps')
+    for map_file in sorted(glob.glob(os.path.join(maps_dir, '*.txt'))):
+        env = GridWorld()
+        env.load_map(map_file)
+        t0 = time.perf_counter()
+        table = get_landmarks(env)
+        elapsed = time.perf_counter() - t0
+
+        _, cost_m, expanded_m = astar(env, env.start, env.goal, 'manhattan')
+        _, cost_a, expanded_a = astar(env, env.start, env.goal, 'alt')
+        print(f"{os.path.basename(map_file)}: {len(table.landmarks)} landmarks in {elapsed * 1000:.1f} ms")
+        print(f"  Manhattan: cost {cost_m}, expanded {expanded_m}")
+        print(f"  ALT:       cost {cost_a}, expanded {expanded_a}\n")
@@ -0,0 +1,367 @@
+"""
+Localization - Grid Histogram Filter and Particle Filter
+SE444 - Artificial Intelligence Course Project
+
+Tracks a posterior over the robot position when odometry is noisy, instead
+of trusting env.agent_pos.
+
+    HistogramFilter: dense posterior over every free cell. The motion update
+                     is a convolution of the posterior with a slip kernel,
+                     the measurement update multiplies in the sensor_model()
+                     likelihood of the wall readings for every cell at once.
+    ParticleFilter:  sampled posterior for maps too large for a dense array.
+
+Both filters share the same interface:
+    predict(action)   - motion update for 'up', 'down', 'left', 'right', 'stay'
+    update(readings)  - measurement update from (up, down, left, right) wall readings
+    estimate()        - most likely (row, col)
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ai_core.bayes_reasoning import sensor_model
+
+
+# Intended displacement of each action
+ACTIONS = {
+    'stay': (0, 0),
+    'up': (-1, 0),
+    'down': (1, 0),
+    'left': (0, -1),
+    'right': (0, 1),
+}
+
+# Order of the wall readings returned by sense_walls()
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def slip_kernel(slip: float = 0.1) -> np.ndarray:
+    """
+    3x3 motion kernel centred on the intended destination.
+
+    With probability 1 - slip the robot lands where it meant to go; the
+    slip mass is shared by the four cells around that destination
+    (undershoot, overshoot and sideways drift).
+    """
+    kernel = np.zeros((3, 3))
+    kernel[1, 1] = 1 - slip
+    for dr, dc in DIRECTIONS:
+        kernel[1 + dr, 1 + dc] = slip / 4
+    return kernel
+
+
+def wall_map(env) -> Dict[Tuple[int, int], np.ndarray]:
+    """
+    For each direction, a boolean raster telling whether the neighbour in
+    that direction is an obstacle or outside the map.
+    """
+    free = env.grid != 1
+    walls = {}
+    for dr, dc in DIRECTIONS:
+        wall = np.ones((env.height, env.width), dtype=bool)
+        source, target = _slices(env.height, env.width, dr, dc)
+        wall[source] = ~free[target]
+        walls[(dr, dc)] = wall
+    return walls
+
+
+def _slices(height: int, width: int, dr: int, dc: int):
+    """
+    (source, target) slices so that array[target] is array[source] shifted
+    by (dr, dc): source cell (r, c) lines up with target cell (r+dr, c+dc).
+    """
+    def axis(n, d):
+        if d >= 0:
+            return slice(0, max(n - d, 0)), slice(d, n)
+        return slice(-d, n), slice(0, max(n + d, 0))
+    rows_src, rows_dst = axis(height, dr)
+    cols_src, cols_dst = axis(width, dc)
+    return (rows_src, cols_src), (rows_dst, cols_dst)
+
+
+def sense_walls(env, pos: Tuple[int, int], sensor_accuracy: float = 0.9,
+                rng: Optional[np.random.Generator] = None) -> Tuple[bool, ...]:
+    """
+    Simulate a noisy wall reading in the four directions around pos.
+
+    Returns:
+        (up, down, left, right) booleans, each correct with probability
+        sensor_accuracy
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    row, col = pos
+    readings = []
+    for dr, dc in DIRECTIONS:
+        wall = not env.is_valid((row + dr, col + dc))
+        readings.append(wall if rng.random() < sensor_accuracy else not wall)
+    return tuple(readings)
+
+
+def simulate_motion(env, pos: Tuple[int, int], action: str, slip: float = 0.1,
+                    rng: Optional[np.random.Generator] = None) -> Tuple[int, int]:
+    """Move the true robot with the same slip model the filters assume."""
+    rng = rng if rng is not None else np.random.default_rng()
+    kernel = slip_kernel(slip)
+    index = rng.choice(9, p=kernel.ravel())
+    dr, dc = ACTIONS[action]
+    new_pos = (pos[0] + dr + index // 3 - 1, pos[1] + dc + index % 3 - 1)
+    return new_pos if env.is_valid(new_pos) else pos
+
+
+def _reading_likelihoods(readings, sensor_accuracy: float):
+    """Per direction (P(reading | wall), P(reading | no wall))."""
+    likelihoods = []
+    for reading in readings:
+        pick = 0 if reading else 1
+        likelihoods.append((sensor_model(True, sensor_accuracy)[pick],
+                            sensor_model(False, sensor_accuracy)[pick]))
+    return likelihoods
+
+
+class HistogramFilter:
+    """
+    Dense grid posterior over the robot position.
+
+    All buffers are allocated once, so a tick does no array allocation.
+    """
+
+    def __init__(self, env, slip: float = 0.1, sensor_accuracy: float = 0.9):
+        """
+        Create a histogram filter for the current map.
+
+        Args:
+            env: GridWorld to localize in
+            slip: Probability that a move does not land where intended
+            sensor_accuracy: Accuracy of each wall reading
+        """
+        self.env = env
+        self.sensor_accuracy = sensor_accuracy
+        self.kernel = slip_kernel(slip)
+        self.free = (env.grid != 1)
+        self.walls = {d: w.astype(np.float32) for d, w in wall_map(env).items()}
+
+        shape = (env.height, env.width)
+        self.posterior = np.zeros(shape, dtype=np.float32)
+        self._next = np.zeros(shape, dtype=np.float32)
+        self._moved = np.zeros(shape, dtype=np.float32)
+        self._motion = {}  # action -> precomputed motion masks
+        self.reset()
+
+    def reset(self, position: Optional[Tuple[int, int]] = None):
+        """Uniform belief over free cells, or certainty at a known position."""
+        self.posterior[:] = 0
+        if position is None:
+            self.posterior[self.free] = 1.0 / max(int(self.free.sum()), 1)
+        else:
+            self.posterior[position] = 1.0
+
+    def _motion_model(self, action: str):
+        """
+        Precomputed masks for an action (cached per action):
+
+            stay:  fraction of each cell's mass that is blocked and stays put
+            moves: (weighted mask, dr, dc) per kernel entry, the fraction of
+                   each cell's mass that is shifted by (dr, dc)
+        """
+        model = self._motion.get(action)
+        if model is None:
+            adr, adc = ACTIONS[action]
+            height, width = self.env.height, self.env.width
+            stay = np.zeros(self.free.shape, dtype=np.float32)
+            moves = []
+            for (kr, kc), weight in np.ndenumerate(self.kernel):
+                if weight == 0:
+                    continue
+                dr, dc = adr + kr - 1, adc + kc - 1
+                source, target = _slices(height, width, dr, dc)
+                valid = np.zeros(self.free.shape, dtype=np.float32)
+                valid[source] = self.free[target]
+                stay += weight * (1 - valid)
+                moves.append((weight * valid, dr, dc))
+            model = (stay, moves)
+            self._motion[action] = model
+        return model
+
+    def predict(self, action: str):
+        """
+        Motion update: convolve the posterior with the slip kernel.
+
+        Probability mass that would end up in an obstacle or off the map
+        stays where it was (the robot bumped and did not move).
+        """
+        stay, moves = self._motion_model(action)
+        out, moved, src = self._next, self._moved, self.posterior
+        np.multiply(src, stay, out=out)
+        height, width = self.env.height, self.env.width
+        for weighted_valid, dr, dc in moves:
+            np.multiply(src, weighted_valid, out=moved)
+            source, target = _slices(height, width, dr, dc)
+            out[target] += moved[source]
+        self.posterior, self._next = out, self.posterior
+
+    def update(self, readings):
+        """
+        Measurement update from (up, down, left, right) wall readings.
+
+        The likelihood of every cell is built from sensor_model() and the
+        precomputed wall rasters, then the posterior is renormalized.
+        """
+        moved = self._moved
+        for (likely_wall, likely_free), direction in zip(
+                _reading_likelihoods(readings, self.sensor_accuracy), DIRECTIONS):
+            # likelihood = likely_free + (likely_wall - likely_free) * wall
+            np.multiply(self.walls[direction], likely_wall - likely_free, out=moved)
+            moved += likely_free
+            self.posterior *= moved
+        total = float(self.posterior.sum())
+        if total > 0:
+            self.posterior /= total
+        else:
+            self.reset()  # readings contradicted every cell, start over
+
+    def estimate(self) -> Tuple[int, int]:
+        """Most likely position."""
+        row, col = np.unravel_index(int(np.argmax(self.posterior)), self.posterior.shape)
+        return int(row), int(col)
+
+    def probability(self, pos: Tuple[int, int]) -> float:
+        """Posterior probability of being at pos."""
+        return float(self.posterior[pos])
+
+
+class ParticleFilter:
+    """
+    Sampled posterior over the robot position.
+
+    Memory and time grow with the number of particles rather than the map
+    size, which suits maps too big for a dense histogram.
+    """
+
+    def __init__(self, env, num_particles: int = 10000, slip: float = 0.1,
+                 sensor_accuracy: float = 0.9, rng: Optional[np.random.Generator] = None):
+        """
+        Create a particle filter for the current map.
+
+        Args:
+            env: GridWorld to localize in
+            num_particles: Number of position hypotheses
+            slip: Probability that a move does not land where intended
+            sensor_accuracy: Accuracy of each wall reading
+            rng: Random generator (for reproducible runs)
+        """
+        self.env = env
+        self.num_particles = num_particles
+        self.sensor_accuracy = sensor_accuracy
+        self.rng = rng if rng is not None else np.random.default_rng()
+        kernel = slip_kernel(slip)
+        self.offsets = np.argwhere(kernel > 0) - 1
+        self.offset_weights = kernel[kernel > 0]
+        self.free = (env.grid != 1)
+        self.walls = wall_map(env)
+        self.reset()
+
+    def reset(self, position: Optional[Tuple[int, int]] = None):
+        """Spread particles over free cells, or put them all at a known position."""
+        if position is None:
+            cells = np.flatnonzero(self.free)
+            flat = self.rng.choice(cells, size=self.num_particles)
+            self.rows, self.cols = np.divmod(flat, self.env.width)
+        else:
+            self.rows = np.full(self.num_particles, position[0], dtype=np.intp)
+            self.cols = np.full(self.num_particles, position[1], dtype=np.intp)
+        self.weights = np.full(self.num_particles, 1.0 / self.num_particles)
+
+    def predict(self, action: str):
+        """Motion update: move every particle with a sampled slip."""
+        adr, adc = ACTIONS[action]
+        picks = self.rng.choice(len(self.offsets), size=self.num_particles, p=self.offset_weights)
+        rows = self.rows + adr + self.offsets[picks, 0]
+        cols = self.cols + adc + self.offsets[picks, 1]
+        inside = (rows >= 0) & (rows < self.env.height) & (cols >= 0) & (cols < self.env.width)
+        valid = inside.copy()
+        valid[inside] = self.free[rows[inside], cols[inside]]
+        self.rows = np.where(valid, rows, self.rows)
+        self.cols = np.where(valid, cols, self.cols)
+
+    def update(self, readings):
+        """Measurement update: reweight by the wall-reading likelihood, then resample."""
+        for (likely_wall, likely_free), direction in zip(
+                _reading_likelihoods(readings, self.sensor_accuracy), DIRECTIONS):
+            wall = self.walls[direction][self.rows, self.cols]
+            self.weights *= np.where(wall, likely_wall, likely_free)
+        total = self.weights.sum()
+        if total <= 0:
+            self.reset()
+            return
+        self.weights /= total
+        if 1.0 / np.sum(self.weights ** 2) < self.num_particles / 2:
+            self._resample()
+
+    def _resample(self):
+        """Systematic (low-variance) resampling."""
+        n = self.num_particles
+        positions = (self.rng.random() + np.arange(n)) / n
+        indices = np.searchsorted(np.cumsum(self.weights), positions)
+        indices = np.minimum(indices, n - 1)
+        self.rows, self.cols = self.rows[indices], self.cols[indices]
+        self.weights = np.full(n, 1.0 / n)
+
+    def estimate(self) -> Tuple[int, int]:
+        """Cell holding the largest particle weight."""
+        flat = self.rows * self.env.width + self.cols
+        cells, inverse = np.unique(flat, return_inverse=True)
+        mass = np.bincount(inverse, weights=self.weights)
+        row, col = divmod(int(cells[int(np.argmax(mass))]), self.env.width)
+        return row, col
+
+    def probability(self, pos: Tuple[int, int]) -> float:
+        """Particle weight at pos."""
+        mask = (self.rows == pos[0]) & (self.cols == pos[1])
+        return float(self.weights[mask].sum())
+
+
+# ============================================================================
+# Testing Code
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+    from environment import GridWorld
+
+    print("=" * 60)
+    print("  Testing Localization")
+    print("=" * 60 + "\n")
+
+    rng = np.random.default_rng(0)
+    np.random.seed(0)
+    env = GridWorld(width=30, height=30)
+    env.add_random_obstacles(200)
+    true_pos = env.start
+
+    for name, filt in [('Histogram', HistogramFilter(env)),
+                       ('Particle', ParticleFilter(env, 5000, rng=rng))]:
+        pos = true_pos
+        hits = 0
+        for step in range(200):
+            action = ['up', 'down', 'left', 'right'][rng.integers(4)]
+            pos = simulate_motion(env, pos, action, rng=rng)
+            filt.predict(action)
+            filt.update(sense_walls(env, pos, rng=rng))
+            hits += filt.estimate() == pos
+        print(f"{name} filter: estimate correct on {hits}/200 ticks")
+
+    # Timing on a large map
+    size = 1000
+    big = GridWorld(width=size, height=size)
+    big.grid = (np.random.rand(size, size) < 0.2).astype(int)
+    big.grid[0, 0] = 0
+    for name, filt in [('Histogram', HistogramFilter(big)),
+                       ('Particle', ParticleFilter(big, 100000, rng=rng))]:
+        start = time.perf_counter()
+        for _ in range(10):
+            filt.predict('right')
+            filt.update(sense_walls(big, (0, 0), rng=rng))
+        elapsed = (time.perf_counter() - start) / 10
+        print(f"{name} filter on {size}x{size}: {elapsed * 1000:.1f} ms per tick")
@@ -0,0 +1,617 @@
+"""
+Multi-Agent Path Finding - Windowed Cooperative A* (WHCA*)
+SE444 - Artificial Intelligence Course Project
+
+Plans collision-free moves for a fleet of robots sharing one GridWorld
+(env.agent_positions / env.agent_goals).
+
+    ReservationTable    - hashed space-time reservations of cells and moves
+    GoalDistances       - Reverse Resumable A* from one goal: exact, lazily
+                          computed distances for a goal few robots share
+    GoalField           - full distance_field() of a goal many robots share
+    CooperativePlanner  - plans the robots one after another in space-time
+                          (x, y, t) for a window of W steps, each avoiding
+                          the reservations of the robots planned before it
+
+Usage:
+    planner = CooperativePlanner(env, window=16)
+    while not planner.all_arrived():
+        planner.step()          # replans when due, then moves every robot
+
+Robots make the moves of env.get_neighbors() (diagonals too on 8-connected
+maps, never crossing another robot's diagonal) or wait in place; every
+action takes one tick and costs what env.get_cost() says, a wait costs 1.
+The space-time search reads those moves from a flat neighbor table built
+with array shifts, since calling get_neighbors() per cell takes about a
+second on a 256x256 map and the search touches each cell many times.
+
+Since every robot's current cell is reserved for the next tick before
+planning starts, the first step of every plan is always collision free,
+even for robots whose search gave up. Those robots are searched again on
+the next tick (a repair) while the others keep their plans; robots that
+cannot reach their goal at all (see connected_components()) park where
+they are.
+
+Exact goal distances are built under a per-tick budget: until a robot's
+distances reach it, it steers by the Manhattan (octile) lower bound, so
+the first plan of a big fleet with distinct goals stays within a tick.
+"""
+
+import heapq
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ai_core.search_algorithms import SQRT2, connected_components, distance_field, make_heuristic
+from utils.tracing import tracer, DEBUG, INFO
+
+
+class ReservationTable:
+    """
+    Space-time reservations keyed by plain integers in hash sets.
+
+    A cell c (flat index) at time t is the key t * cells + c; the move
+    a -> b between t and t + 1 is stored as (t * cells + a) * cells + b so
+    that swaps can be detected by looking up the reverse move.
+    """
+
+    def __init__(self, cells: int):
+        self.cells = cells
+        self.vertices = set()
+        self.edges = set()
+
+    def clear(self):
+        self.vertices.clear()
+        self.edges.clear()
+
+    def is_free(self, cell: int, t: int) -> bool:
+        return t * self.cells + cell not in self.vertices
+
+    def move_free(self, a: int, b: int, t: int) -> bool:
+        """True if moving a -> b between t and t + 1 swaps with nobody."""
+        return (t * self.cells + b) * self.cells + a not in self.edges
+
+    def reserve_path(self, path: List[int], horizon: Optional[int] = None):
+        """
+        Reserve path[t] at time t (path[0] is the current cell at t = 0).
+
+        With horizon, the last cell stays reserved until that time (the
+        robot waits there).
+        """
+        cells = self.cells
+        for t in range(1, len(path)):
+            self.vertices.add(t * cells + path[t])
+            if path[t] != path[t - 1]:
+                self.edges.add(((t - 1) * cells + path[t - 1]) * cells + path[t])
+        if horizon is not None:
+            for t in range(len(path), horizon + 1):
+                self.vertices.add(t * cells + path[-1])
+
+
+class GoalDistances:
+    """
+    Reverse Resumable A* (Silver 2005) from one goal.
+
+    The search runs backwards from the goal and is resumed only as far as
+    needed whenever distance() asks for a cell that is not settled yet, so
+    the exact distances are computed lazily and reused by every robot (and
+    every replan) with the same goal. Distances ignore other robots, which
+    makes them an admissible and consistent heuristic for the space-time
+    search. settle() resumes under an expansion budget, so the first and
+    most expensive part can be spread over several ticks.
+    """
+
+    def __init__(self, neighbors: List[List[Tuple[int, float]]], width: int, goal: int,
+                 diagonal: bool = False):
+        self.neighbors = neighbors
+        self.width = width
+        self.goal = goal
+        self.diagonal = diagonal
+        self.closed: Dict[int, float] = {}
+        self.g: Dict[int, float] = {goal: 0}
+        self.open = [(0, 0, goal)]        # (f, g, cell)
+        self.target = None
+        self.expanded = 0
+
+    def settled(self, cell: int) -> bool:
+        """True if distance(cell) is a lookup (no search left to run)."""
+        return cell in self.closed or not self.open
+
+    def distance(self, cell: int) -> float:
+        """Exact cost from cell to the goal (inf if unreachable)."""
+        d = self.closed.get(cell)
+        if d is not None:
+            return d
+        if not self.open:
+            return float('inf')
+        if self.target is None:
+            self.target = cell
+        return self._resume(cell)
+
+    def settle(self, cell: int, budget: int) -> int:
+        """Resume toward cell for at most `budget` expansions; returns those used."""
+        if self.settled(cell):
+            return 0
+        if self.target is None:
+            self.target = cell
+        before = self.expanded
+        self._resume(cell, self.expanded + budget)
+        return self.expanded - before
+
+    def _resume(self, cell: int, stop: Optional[int] = None) -> Optional[float]:
+        # The open list stays ordered toward the first cell asked for (the
+        # robot's start); later cells lie near that path and settle soon
+        tr, tc = divmod(self.target, self.width)
+        width, g, closed, neighbors, open_list = self.width, self.g, self.closed, self.neighbors, self.open
+        diagonal = self.diagonal
+        while open_list:
+            if stop is not None and self.expanded >= stop:
+                return None
+            _, cost, node = heapq.heappop(open_list)
+            if node in closed or cost > g[node]:
+                continue
+            closed[node] = cost
+            self.expanded += 1
+            for nxt, step in neighbors[node]:
+                nxt_cost = cost + step
+                if nxt not in closed and nxt_cost < g.get(nxt, float('inf')):
+                    g[nxt] = nxt_cost
+                    r, c = divmod(nxt, width)
+                    dr, dc = abs(r - tr), abs(c - tc)
+                    if diagonal:
+                        h = max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+                    else:
+                        h = dr + dc
+                    heapq.heappush(open_list, (nxt_cost + h, nxt_cost, nxt))
+            if node == cell:
+                return cost
+        return float('inf')
+
+
+class GoalField:
+    """Complete distances to a shared goal (one distance_field(), then O(1) lookups)."""
+
+    def __init__(self, env, goal: Tuple[int, int]):
+        field = distance_field(env, goal)
+        self.expanded = int(np.isfinite(field).sum())
+        self.distance = field.ravel().tolist().__getitem__
+
+    def settled(self, cell: int) -> bool:
+        return True
+
+
+def neighbor_table(grid: np.ndarray, connectivity: int = 4) -> List[List[Tuple[int, float]]]:
+    """
+    (neighbor, move cost) pairs of every cell, by flat index.
+
+    Same moves and costs as GridWorld.get_neighbors()/get_cost(): diagonals
+    on 8-connected grids need both orthogonal cells free.
+    """
+    height, width = grid.shape
+    free = np.asarray(grid) != 1
+    padded = np.zeros((height + 2, width + 2), dtype=bool)
+    padded[1:-1, 1:-1] = free
+    index = np.arange(height * width).reshape(height, width)
+    table = [[] for _ in range(height * width)]
+    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]      # up, down, left, right
+    if connectivity == 8:
+        moves += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    for dr, dc in moves:
+        mask = free & padded[1 + dr:1 + dr + height, 1 + dc:1 + dc + width]
+        if dr and dc:
+            # no corner cutting
+            mask &= padded[1 + dr:1 + dr + height, 1:1 + width]
+            mask &= padded[1:1 + height, 1 + dc:1 + dc + width]
+        step = SQRT2 if dr and dc else 1.0
+        offset = dr * width + dc
+        for a in index[mask].tolist():
+            table[a].append((a + offset, step))
+    return table
+
+
+class CooperativePlanner:
+    """
+    Windowed Hierarchical Cooperative A* for the robots of a GridWorld.
+
+    Example:
+        >>> env.add_agent((0, 0), (9, 9))
+        >>> env.add_agent((9, 9), (0, 0))
+        >>> planner = CooperativePlanner(env, window=8)
+        >>> planner.step()
+    """
+
+    def __init__(self, env, window: int = 16, replan_every: Optional[int] = None,
+                 max_expansions: Optional[int] = None, shared_goal: int = 3,
+                 heuristic_budget: int = 20_000):
+        """
+        Args:
+            env: GridWorld with robots added via env.add_agent()
+            window: Number of ticks every robot plans (and reserves) ahead
+            replan_every: Ticks between replans (default window // 2)
+            max_expansions: Space-time nodes one robot may expand per plan
+                            before it gives up and waits (default 20 * window)
+            shared_goal: Goals of at least this many robots get a full
+                         distance field instead of a lazy RRA* search
+            heuristic_budget: Goal-distance work per tick (RRA* expansions,
+                              or the cells of a distance field)
+        """
+        self.env = env
+        self.window = window
+        self.replan_every = min(replan_every or max(1, window // 2), window)
+        self.max_expansions = max_expansions or 20 * window
+        self.shared_goal = shared_goal
+        self.heuristic_budget = heuristic_budget
+
+        self.plans: List[List[int]] = []   # flat cells for t = 0..window
+        self.tick = 0                      # ticks executed since the last plan or repair
+        self.age = 0                       # ticks executed since the last full plan
+        self.replans = 0
+        self.repairs = 0                   # partial replans of robots that gave up
+        self.failures = 0                  # robots that had to wait in place
+        self.expanded = 0                  # space-time nodes, all plans
+        self.bounded = 0                   # searches run on the geometric lower bound
+        self.last_plan_time = 0.0
+        self._order_offset = 0
+        self._failed = set()               # robots that gave up in the last search
+        self._parked = set()               # robots that cannot reach their goal
+        self._heuristics: Dict[int, object] = {}   # GoalDistances or GoalField
+        self._bounds: Dict[int, object] = {}       # goal -> lower bound while they build
+        self._budget = heuristic_budget            # heuristic work left in this tick
+        self._map_version = None
+        self._build()
+
+    def _build(self):
+        """(Re)build the flat neighbor table; drops heuristics of the old map."""
+        env = self.env
+        self.width = env.width
+        self.cells = env.width * env.height
+        self.diagonal = env.connectivity == 8
+        self.neighbors = neighbor_table(np.asarray(env.grid), env.connectivity)
+        self.components = connected_components(env).ravel().tolist()
+        self.reservations = ReservationTable(self.cells)
+        self._heuristics.clear()
+        self._map_version = env.version
+
+    def heuristic(self, goal: int, robots: int = 1):
+        """
+        Distances to goal, built once per goal and shared by its robots.
+
+        A goal of many robots gets the whole field (None while this tick's
+        budget is spent); for the others only the cells their searches
+        touch are ever computed.
+        """
+        distances = self._heuristics.get(goal)
+        if distances is None:
+            if robots >= self.shared_goal:
+                if self._budget <= 0:
+                    return None
+                distances = GoalField(self.env, self._pos(goal))
+                self._budget -= distances.expanded
+            else:
+                distances = GoalDistances(self.neighbors, self.width, goal, self.diagonal)
+            self._heuristics[goal] = distances
+        return distances
+
+    def distance_to(self, start: int, goal: int, robots: int = 1):
+        """
+        Distance function toward goal for a robot at start.
+
+        The exact distances once they reach start, built with what is left
+        of this tick's budget; until then the Manhattan (octile on
+        8-connected maps) lower bound from make_heuristic().
+        """
+        distances = self.heuristic(goal, robots)
+        if distances is not None:
+            if not distances.settled(start) and self._budget > 0:
+                self._budget -= distances.settle(start, self._budget)
+            if distances.settled(start):
+                return distances.distance
+        bound = self._bounds.get(goal)
+        if bound is None:
+            h = make_heuristic(self.env, 'octile' if self.diagonal else 'manhattan', self._pos(goal))
+            width = self.width
+            bound = self._bounds[goal] = lambda cell: h(divmod(cell, width))
+        return bound
+
+    def _flat(self, pos: Tuple[int, int]) -> int:
+        return pos[0] * self.width + pos[1]
+
+    def _pos(self, cell: int) -> Tuple[int, int]:
+        return divmod(cell, self.width)
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def plan(self):
+        """Plan the next window for every robot, one after another."""
+        t0 = time.perf_counter()
+        if self.env.version != self._map_version:
+            self._build()
+        env = self.env
+        self.reservations.clear()
+
+        starts = [self._flat(p) for p in env.agent_positions]
+        goals = [self._flat(g) for g in env.agent_goals]
+
+        # Nobody may step into a cell that is occupied right now, so the
+        # first move of every plan is safe whatever happens later on
+        for cell in starts:
+            self.reservations.vertices.add(self.cells + cell)
+
+        count = len(starts)
+        # rotate priorities so no robot is always planned last
+        order = [(self._order_offset + k) % count for k in range(count)] if count else []
+        self._order_offset = (self._order_offset + 1) % max(1, count)
+
+        # robots whose goal lies in another component park for the whole
+        # window before anyone plans, so nobody routes through them
+        self.plans = [None] * count
+        self._parked = set()
+        for i in range(count):
+            if self.components[starts[i]] != self.components[goals[i]]:
+                self._parked.add(i)
+                self.plans[i] = [starts[i]]
+                self.reservations.reserve_path(self.plans[i], horizon=self.window)
+        self._plan_robots([i for i in order if i not in self._parked], starts, goals, self.window)
+        self.tick = 0
+        self.age = 0
+        self.replans += 1
+        self.last_plan_time = time.perf_counter() - t0
+        if tracer.level <= INFO:
+            tracer.event(INFO, 'mapf.plan', agents=count, failures=len(self._failed),
+                         parked=len(self._parked), goals=len(self._heuristics),
+                         seconds=self.last_plan_time)
+        return self.plans
+
+    def repair(self):
+        """
+        Search again only for the robots that gave up in the last search.
+
+        A robot that gave up reserved a single tick, so the others may have
+        planned through its cell later on. Everybody else keeps the rest of
+        their plan, except robots about to step into the cell of a robot
+        being repaired: that one may have to wait there again, so they are
+        repaired too. Searches only reach to the end of the current window.
+        """
+        t0 = time.perf_counter()
+        env = self.env
+        table = self.reservations
+        table.clear()
+
+        starts = [self._flat(p) for p in env.agent_positions]
+        goals = [self._flat(g) for g in env.agent_goals]
+        rest = [path[self.tick:] or path[-1:] for path in self.plans]
+
+        repair = set(self._failed)
+        occupied = {starts[i] for i in repair}
+        grown = True
+        while grown:
+            grown = False
+            for i, path in enumerate(rest):
+                if i not in repair and len(path) > 1 and path[1] in occupied:
+                    repair.add(i)
+                    occupied.add(starts[i])
+                    grown = True
+
+        for cell in starts:
+            table.vertices.add(self.cells + cell)
+        window = self.window - self.age
+        for i, path in enumerate(rest):
+            if i not in repair:
+                table.reserve_path(path, horizon=window)
+                self.plans[i] = path
+        self._plan_robots(sorted(repair), starts, goals, window)
+        self.tick = 0
+        self.repairs += 1
+        self.last_plan_time = time.perf_counter() - t0
+        if tracer.level <= DEBUG:
+            tracer.event(DEBUG, 'mapf.repair', robots=len(repair), failures=len(self._failed),
+                         seconds=self.last_plan_time)
+        return self.plans
+
+    def _plan_robots(self, order: List[int], starts: List[int], goals: List[int], window: int):
+        """Search and reserve the robots in order; fills self.plans."""
+        table = self.reservations
+        robots_per_goal = Counter(goals)
+        failed = set()
+        for i in order:
+            table.vertices.discard(self.cells + starts[i])
+            h = self.distance_to(starts[i], goals[i], robots_per_goal[goals[i]])
+            if h is self._bounds.get(goals[i]):
+                self.bounded += 1
+            path = self._search(starts[i], goals[i], window, h)
+            if path is None:
+                # wait one tick; later ticks may already belong to others
+                failed.add(i)
+                path = [starts[i], starts[i]]
+                table.reserve_path(path)
+            else:
+                table.reserve_path(path, horizon=window)
+            self.plans[i] = path
+        # a robot that gave up only reserved one tick: repair it right away
+        self._failed = failed
+        self.failures += len(failed)
+
+    def _search(self, start: int, goal: int, window: int, h) -> Optional[List[int]]:
+        """
+        Space-time A* from start for `window` ticks.
+
+        g is the cost of the moves and waits so far, h(cell) a consistent
+        estimate of the rest ignoring other robots. A path ends at the window
+        or once the robot sits on its goal and no later reservation needs
+        that cell. Returns flat cells for t = 0..T.
+        """
+        cells, width, diagonal = self.cells, self.width, self.diagonal
+        vertices, edges = self.reservations.vertices, self.reservations.edges
+        neighbors = self.neighbors
+
+        h0 = h(start)
+        if h0 == float('inf'):
+            return None
+        open_list = [(h0, 0, start)]
+        g_score = {start: 0}            # key t * cells + cell -> cost
+        parent = {start: None}          # key -> previous key
+        closed = set()
+        expanded = 0
+        while open_list:
+            _, neg_t, cell = heapq.heappop(open_list)
+            t = -neg_t
+            key = t * cells + cell
+            if key in closed:
+                continue
+            closed.add(key)
+            expanded += 1
+            if t == window or (cell == goal and all(s * cells + goal not in vertices
+                                                    for s in range(t + 1, window + 1))):
+                self.expanded += expanded
+                return self._unwind(parent, key)
+            if expanded > self.max_expansions:
+                break
+            g = g_score[key]
+            nt = t + 1
+            base = nt * cells
+            for nxt, step in neighbors[cell] + [(cell, 1.0)]:
+                nkey = base + nxt
+                if nkey in closed or nkey in vertices:
+                    continue
+                if nxt != cell:
+                    if (t * cells + nxt) * cells + cell in edges:
+                        continue  # someone comes the other way
+                    if diagonal and step != 1.0:
+                        # someone moves along the other diagonal of the square
+                        row, col = divmod(cell, width)
+                        a = row * width + nxt % width
+                        b = nxt - nxt % width + col
+                        if (t * cells + a) * cells + b in edges or (t * cells + b) * cells + a in edges:
+                            continue
+                ng = g + step
+                if ng < g_score.get(nkey, float('inf')):
+                    g_score[nkey] = ng
+                    parent[nkey] = key
+                    # prefer deeper nodes on ties: they are closer to done
+                    heapq.heappush(open_list, (ng + h(nxt), -nt, nxt))
+        self.expanded += expanded
+        return None
+
+    def _unwind(self, parent: Dict[int, int], key: int) -> List[int]:
+        path = []
+        while key is not None:
+            path.append(key % self.cells)
+            key = parent[key]
+        path.reverse()
+        return path
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def step(self) -> List[Tuple[int, int]]:
+        """Replan if due, then move every robot one tick along its plan."""
+        self._budget = self.heuristic_budget
+        if (self.age >= self.replan_every
+                or len(self.plans) != len(self.env.agent_positions)
+                or self.env.version != self._map_version):
+            self.plan()
+        elif self._failed:
+            self.repair()
+        self.tick += 1
+        self.age += 1
+        positions = []
+        for path in self.plans:
+            cell = path[self.tick] if self.tick < len(path) else path[-1]
+            positions.append(self._pos(cell))
+        self.env.move_agents(positions)
+        self._prepare()
+        if tracer.level <= DEBUG:
+            tracer.event(DEBUG, 'mapf.step', tick=self.tick, arrived=self.arrived())
+        return positions
+
+    def _prepare(self):
+        """Spend what is left of this tick's budget on distances robots still lack."""
+        if self._budget <= 0 or self.env.version != self._map_version:
+            return
+        goals = [self._flat(g) for g in self.env.agent_goals]
+        robots_per_goal = Counter(goals)
+        for i, (pos, goal) in enumerate(zip(self.env.agent_positions, goals)):
+            if i not in self._parked:
+                self.distance_to(self._flat(pos), goal, robots_per_goal[goal])
+                if self._budget <= 0:
+                    break
+
+    def arrived(self) -> int:
+        """Number of robots currently on their goal."""
+        return sum(p == g for p, g in zip(self.env.agent_positions, self.env.agent_goals))
+
+    def all_arrived(self) -> bool:
+        return self.arrived() == len(self.env.agent_positions)
+
+    def stats(self) -> Dict:
+        return {
+            'agents': len(self.env.agent_positions),
+            'goals': len(self._heuristics),
+            'replans': self.replans,
+            'repairs': self.repairs,
+            'failures': self.failures,
+            'parked': len(self._parked),
+            'bounded': self.bounded,
+            'expanded': self.expanded,
+            'heuristic_expanded': sum(d.expanded for d in self._heuristics.values()),
+            'last_plan_ms': 1000 * self.last_plan_time,
+        }
+
+
+def random_fleet(env, count: int, rng: Optional[np.random.Generator] = None):
+    """Add `count` robots with distinct random free starts and goals."""
+    rng = rng or np.random.default_rng()
+    free = np.argwhere(np.asarray(env.grid) != 1)
+    if len(free) < count:
+        raise ValueError(f"only {len(free)} free cells for {count} agents")
+    starts = rng.choice(len(free), size=count, replace=False)
+    goals = rng.choice(len(free), size=count, replace=False)
+    for s, g in zip(starts, goals):
+        env.add_agent(tuple(int(v) for v in free[s]), tuple(int(v) for v in free[g]))
+
+
+# ============================================================================
+# Testing Code
+# ============================================================================
+
+if __name__ == "__main__":
+    from environment import GridWorld
+
+    print("=" * 60)
+    print("  Testing Windowed Cooperative A*")
+    print("=" * 60 + "\n")
+
+    rng = np.random.default_rng(0)
+    env = GridWorld(width=256, height=256)
+    env.grid = (rng.random((256, 256)) < 0.1).astype(int)
+    random_fleet(env, 500, rng)
+
+    planner = CooperativePlanner(env, window=16)
+    planner.plan()
+    print(f"First plan: {planner.last_plan_time * 1000:.1f} ms")
+
+    ticks, plan_times, repair_times = 0, [], []
+    while not planner.all_arrived() and ticks < 2000:
+        replans, repairs = planner.replans, planner.repairs
+        planner.step()
+        if planner.replans != replans:
+            plan_times.append(planner.last_plan_time)
+        elif planner.repairs != repairs:
+            repair_times.append(planner.last_plan_time)
+        ticks += 1
+
+    stats = planner.stats()
+    print(f"Ticks: {ticks} | Arrived: {planner.arrived()}/{stats['agents']} | Parked: {stats['parked']}")
+    print(f"Replans: {stats['replans']} | Repairs: {stats['repairs']} | "
+          f"Robots that waited: {stats['failures']}")
+    if plan_times:
+        print(f"Replan time: median {1000 * float(np.median(plan_times)):.1f} ms, "
+              f"max {1000 * max(plan_times):.1f} ms")
+    if repair_times:
+        print(f"Repair time: median {1000 * float(np.median(repair_times)):.1f} ms, "
+              f"max {1000 * max(repair_times):.1f} ms")
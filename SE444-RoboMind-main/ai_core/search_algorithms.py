@@ -1,6 +1,13 @@
 from typing import Tuple, List, Optional
 from collections import deque
 import heapq
+import sys
+
+import numpy as np
+
+from utils.tracing import tracer, DEBUG
+
+SQRT2 = 2 ** 0.5
 
 
 def bfs(env, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[Optional[List], float, int]:
@@ -20,7 +27,8 @@ def bfs(env, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[Optional[Li
         if current == goal: 
             path = reconstruct_path(parent,start,goal)   #Build the final path for the search   
             cost = len(path) - 1  # BFS cost is number of steps
-            print("the Path is ", path)
+            if tracer.level <= DEBUG:
+                tracer.event(DEBUG, 'search.path', algorithm='bfs', path=path, cost=cost, expanded=expanded)
             return path, cost, expanded
         
         for neighbor in env.get_neighbors(current):#Explore all valid neighbors
@@ -57,7 +65,8 @@ def ucs(env, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[Optional[Li
         
         if current == goal:
             path = reconstruct_path(parent,start,goal)#Build the final path for the search 
-            print("The path is :",path)
+            if tracer.level <= DEBUG:
+                tracer.event(DEBUG, 'search.path', algorithm='ucs', path=path, cost=current_cost, expanded=expanded)
             return path, current_cost, expanded # UCS returns actual g(goal)
         
         for neighbor in env.get_neighbors(current):
@@ -74,20 +83,40 @@ def ucs(env, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[Optional[Li
     
 
 
+def make_heuristic(env, heuristic, target: Tuple[int, int]):
+    """
+    Heuristic function pos -> estimated cost from pos to target.
+    
+    heuristic is 'manhattan', 'euclidean', 'octile', 'alt' (landmark
+    distances, see ai_core/landmarks.py) or a callable h(pos, target).
+    """
+    if callable(heuristic):
+        return lambda pos: heuristic(pos, target)
+    if heuristic == 'alt':
+        from ai_core.landmarks import get_landmarks  # imports this module
+        return get_landmarks(env).heuristic(target)
+    if heuristic == 'manhattan':
+        return lambda pos: env.manhattan_distance(pos, target)
+    elif heuristic == 'euclidean':
+        return lambda pos: env.euclidean_distance(pos, target)
+    elif heuristic == 'octile':
+        return lambda pos: env.octile_distance(pos, target)
+    raise ValueError(f"Unknown heuristic: {heuristic}")
+
+
 def astar(env, start: Tuple[int, int], goal: Tuple[int, int], 
           heuristic='manhattan') -> Tuple[Optional[List], float, int]:
     """
     A* Search - Find optimal path using cost + heuristic.
+    
+    Use heuristic='octile' on 8-connected (MovingAI) maps; Manhattan
+    distance overestimates diagonal moves there. heuristic='alt' uses
+    precomputed landmark distances, which know about walls; any callable
+    h(pos, goal) works too (see make_heuristic).
     """
     
-    # Choose heuristic function
     # Heuristic h(n): estimated cost from n → goal
-    if heuristic == 'manhattan':
-        h = lambda pos: env.manhattan_distance(pos, goal)
-    elif heuristic == 'euclidean':
-        h = lambda pos: env.euclidean_distance(pos, goal)
-    else:
-        raise ValueError(f"Unknown heuristic: {heuristic}")
+    h = make_heuristic(env, heuristic, goal)
     
     # A* uses f(n) = g(n) + h(n) as priority
     g_score = {start: 0}#g(n): cost from start to node
@@ -108,7 +137,8 @@ def astar(env, start: Tuple[int, int], goal: Tuple[int, int],
         
         if current == goal:
            path = reconstruct_path(parent,start,goal)#Build the final path for the search 
-           print("the Path is ", path)
+           if tracer.level <= DEBUG:
+               tracer.event(DEBUG, 'search.path', algorithm='astar', path=path, cost=g_score[current], expanded=expanded)
            return path, g_score[current], expanded
         
         for neighbor in env.get_neighbors(current):
@@ -127,6 +157,662 @@ def astar(env, start: Tuple[int, int], goal: Tuple[int, int],
     
 
 
+def bidirectional_bfs(env, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[Optional[List], float, int]:
+    """
+    Bidirectional BFS - BFS from both ends that stops where they meet.
+    
+    Each round expands one whole layer of the smaller frontier. Once a
+    layer touches the other search, the shortest connection found in the
+    whole layer is optimal, so the cost (in steps) always equals bfs(). Two
+    frontiers of radius d/2 replace one of radius d, which pays off most
+    on long corridors and mazes.
+    """
+    if start == goal:
+        return [start], 0, 1
+    
+    parents = ({start: None}, {goal: None})   # forward, backward
+    depths = ({start: 0}, {goal: 0})
+    frontiers = ([start], [goal])
+    expanded = 0
+    
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other = depths[side], depths[1 - side]
+        next_layer = []
+        best, best_cost = None, float('inf')
+        for current in frontiers[side]:
+            expanded += 1
+            for neighbor in env.get_neighbors(current):
+                if neighbor in other:
+                    cost = seen[current] + 1 + other[neighbor]
+                    if cost < best_cost:
+                        best, best_cost = (current, neighbor), cost
+                elif neighbor not in seen:
+                    seen[neighbor] = seen[current] + 1
+                    parents[side][neighbor] = current
+                    next_layer.append(neighbor)
+        if best is not None:
+            near, far = best if side == 0 else best[::-1]
+            path = _join_paths(parents, near, far)
+            cost = len(path) - 1
+            if tracer.level <= DEBUG:
+                tracer.event(DEBUG, 'search.path', algorithm='bidirectional_bfs', path=path,
+                             cost=cost, expanded=expanded)
+            return path, cost, expanded
+        frontiers = (next_layer, frontiers[1]) if side == 0 else (frontiers[0], next_layer)
+    
+    return None, float('inf'), expanded
+
+
+def bidirectional_astar(env, start: Tuple[int, int], goal: Tuple[int, int],
+                        heuristic='manhattan') -> Tuple[Optional[List], float, int]:
+    """
+    Bidirectional A* - front-to-end A* from both ends.
+    
+    The forward search estimates the distance to goal and the backward
+    search the distance to start. Every time a search reaches a node the
+    other side has seen, the connection is a candidate path of cost mu.
+    Each open list's smallest f is a lower bound on any path still to be
+    found through it, so the search stops once
+    
+        mu <= max(min f forward, min f backward)
+    
+    which keeps the cost equal to astar() for any admissible heuristic.
+    The side with the smaller open list is expanded next.
+    """
+    if start == goal:
+        return [start], 0, 1
+    h = (make_heuristic(env, heuristic, goal), make_heuristic(env, heuristic, start))
+    g_score = ({start: 0}, {goal: 0})
+    parents = ({start: None}, {goal: None})
+    frontiers = ([(h[0](start), start)], [(h[1](goal), goal)])
+    explored = (set(), set())
+    expanded = 0
+    best_cost = float('inf')
+    meeting = None
+    
+    while frontiers[0] and frontiers[1]:
+        # drop stale heap entries so the tops are real lower bounds
+        for side in (0, 1):
+            frontier = frontiers[side]
+            while frontier and frontier[0][1] in explored[side]:
+                heapq.heappop(frontier)
+        if not frontiers[0] or not frontiers[1]:
+            break
+        if best_cost <= max(frontiers[0][0][0], frontiers[1][0][0]):
+            break
+        
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        g, other_g = g_score[side], g_score[1 - side]
+        _, current = heapq.heappop(frontiers[side])
+        explored[side].add(current)
+        expanded += 1
+        
+        for neighbor in env.get_neighbors(current):
+            if neighbor in explored[side]:
+                continue
+            tentative_g = g[current] + env.get_cost(current, neighbor)
+            if neighbor not in g or tentative_g < g[neighbor]:
+                g[neighbor] = tentative_g
+                parents[side][neighbor] = current
+                heapq.heappush(frontiers[side], (tentative_g + h[side](neighbor), neighbor))
+                if neighbor in other_g and tentative_g + other_g[neighbor] < best_cost:
+                    best_cost = tentative_g + other_g[neighbor]
+                    meeting = neighbor
+    
+    if meeting is None:
+        return None, float('inf'), expanded
+    path = _join_paths(parents, meeting, meeting)
+    if tracer.level <= DEBUG:
+        tracer.event(DEBUG, 'search.path', algorithm='bidirectional_astar', path=path,
+                     cost=best_cost, expanded=expanded)
+    return path, best_cost, expanded
+
+
+def _join_paths(parents, near: Tuple[int, int], far: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Path start → near (forward parents) followed by far → goal (backward parents)."""
+    path = []
+    node = near
+    while node is not None:
+        path.append(node)
+        node = parents[0][node]
+    path.reverse()
+    node = far if far != near else parents[1][far]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
+    return path
+
+
+# Estimated bytes of one IDA* transposition entry (slot pointer plus the
+# (cell, g, round) tuple and the cell tuple and float it keeps alive) and
+# of one cell on the current path (path, g_path and on_path slots, g and
+# the neighbor iterator with its list)
+IDA_ENTRY_BYTES = 8 + sys.getsizeof((0, 0.0, 0)) + sys.getsizeof((0, 0)) + sys.getsizeof(0.0)
+IDA_PATH_BYTES = 32 + sys.getsizeof(0.0) + sys.getsizeof(iter([])) + sys.getsizeof([(0, 0)] * 4)
+
+# Tables with fewer slots prune too little to pay for themselves
+IDA_MIN_TABLE = 16
+
+
+def ida_star(env, start: Tuple[int, int], goal: Tuple[int, int], heuristic='manhattan',
+             max_nodes: Optional[int] = None, stats: Optional[dict] = None,
+             max_bytes: Optional[int] = None,
+             max_expansions: Optional[int] = None) -> Tuple[Optional[List], float, int]:
+    """
+    IDA* - memory-bounded optimal search.
+    
+    Repeated depth-first searches, each limited to paths with
+    f = g + h <= bound, where the bound grows to the smallest f that was
+    cut off in the previous round. Only the current path is kept, plus a
+    transposition table that prunes paths reaching a cell no cheaper than
+    before. There is no heap, no stale duplicates and no parent map as in
+    astar(), so memory is the table plus one path.
+    
+    Without a budget the table holds every cell reached. With max_nodes
+    (or max_bytes) it is a fixed array of that many slots, allocated up
+    front; when two cells share a slot, the one closer to the start wins:
+    pruning near the start saves the biggest subtrees. Budgets below
+    IDA_MIN_TABLE slots drop the table and run plain IDA*, which keeps
+    only the path but re-expands every transposition. The search stays
+    optimal with any budget, but slows down sharply (exponentially on open
+    maps with detours) once the budget is much smaller than the region A*
+    would explore; max_expansions bounds that time. An aborted search
+    returns (None, inf, expanded) with stats['aborted'] set.
+    
+    Needs a consistent heuristic (all three built-in ones are).
+    
+    Args:
+        max_nodes: Slots in the transposition table (the memory budget)
+        stats: Optional dict filled with iterations, peak_nodes (table
+               entries + path at their largest), peak_bytes (estimated),
+               table_slots, evictions, bound and aborted
+        max_bytes: Budget in bytes instead of slots (see IDA_ENTRY_BYTES)
+        max_expansions: Give up after this many expansions
+    """
+    h = make_heuristic(env, heuristic, goal)
+    width = env.width
+    if max_bytes is not None:
+        max_nodes = max_bytes // IDA_ENTRY_BYTES
+    # slot -> (cell, cheapest g seen, round it was set in); kept across
+    # rounds, since f never decreases along a path a cheaper route to a
+    # cell is always searched again in later rounds
+    if max_nodes is None:
+        size = env.width * env.height   # one slot per cell, filled on demand
+        table = {}
+        lookup = table.get
+    elif max_nodes >= IDA_MIN_TABLE:
+        size = max_nodes
+        table = [None] * size
+        lookup = table.__getitem__
+    else:
+        size = 0
+        table = None
+    used = 0
+    evictions = 0
+    bound = h(start)
+    expanded = 0
+    peak = 0
+    peak_bytes = 0
+    iterations = 0
+    aborted = False
+    result = (None, float('inf'))
+    
+    while result[0] is None:
+        iterations += 1
+        path, g_path = [start], [0]
+        on_path = {start}
+        stack = [iter(env.get_neighbors(start))]
+        expanded += 1
+        next_bound = float('inf')
+        if start == goal:
+            result = ([start], 0)
+            break
+        
+        while stack:
+            neighbor = next(stack[-1], None)
+            if neighbor is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                g_path.pop()
+                continue
+            
+            g = g_path[-1] + env.get_cost(path[-1], neighbor)
+            f = g + h(neighbor)
+            if f > bound + 1e-9:
+                next_bound = min(next_bound, f)
+                continue
+            if neighbor in on_path:
+                continue
+            
+            if table is not None:
+                slot = (neighbor[0] * width + neighbor[1]) % size
+                entry = lookup(slot)
+                if entry is None:
+                    table[slot] = (neighbor, g, iterations)
+                    used += 1
+                elif entry[0] == neighbor:
+                    _, best, seen_in = entry
+                    if g > best + 1e-9 or (seen_in == iterations and g > best - 1e-9):
+                        continue  # reached at least as cheaply before
+                    table[slot] = (neighbor, g, iterations)
+                elif g < entry[1]:
+                    table[slot] = (neighbor, g, iterations)
+                    evictions += 1
+            
+            if neighbor == goal:
+                result = (path + [neighbor], g)
+                break
+            
+            path.append(neighbor)
+            g_path.append(g)
+            on_path.add(neighbor)
+            stack.append(iter(env.get_neighbors(neighbor)))
+            expanded += 1
+            if used + len(path) > peak:
+                peak = used + len(path)
+            if used * IDA_ENTRY_BYTES + len(path) * IDA_PATH_BYTES > peak_bytes:
+                peak_bytes = used * IDA_ENTRY_BYTES + len(path) * IDA_PATH_BYTES
+            if max_expansions is not None and expanded >= max_expansions:
+                aborted = True
+                break
+        
+        if result[0] is not None or aborted:
+            break
+        if next_bound == float('inf'):
+            break  # nothing was cut off: the goal is unreachable
+        bound = next_bound
+    
+    if stats is not None:
+        if table is not None:
+            # container overhead (the whole slot array of a fixed table);
+            # the slot of each entry is already in IDA_ENTRY_BYTES
+            peak_bytes += sys.getsizeof(table) - 8 * used
+        stats.update(iterations=iterations, peak_nodes=peak, peak_bytes=peak_bytes,
+                     table_slots=len(table) if isinstance(table, list) else used,
+                     evictions=evictions, bound=bound, aborted=aborted)
+    path, cost = result
+    if path is not None and tracer.level <= DEBUG:
+        tracer.event(DEBUG, 'search.path', algorithm='ida_star', path=path, cost=cost,
+                     expanded=expanded)
+    return path, cost, expanded
+
+
+def belief_probabilities(beliefs) -> np.ndarray:
+    """P(obstacle) array from a BeliefGrid/OccupancyGrid or a plain array."""
+    if hasattr(beliefs, 'probabilities'):
+        return beliefs.probabilities()
+    return np.asarray(beliefs)
+
+
+def risk_penalties(probabilities: np.ndarray, mode: str = 'expected',
+                   risk_weight: float = 10.0, max_risk: float = 0.5) -> np.ndarray:
+    """
+    Extra cost of entering each cell, computed for the whole map at once.
+    
+    Modes:
+        'expected': risk_weight * P(obstacle), the expected collision cost
+        'chance':   0 where P(obstacle) <= max_risk, infinity elsewhere, so
+                    no cell on the path exceeds the allowed risk
+    """
+    if mode == 'expected':
+        return risk_weight * probabilities.astype(np.float64)
+    elif mode == 'chance':
+        return np.where(probabilities > max_risk, np.inf, 0.0)
+    raise ValueError(f"Unknown risk mode: {mode}")
+
+
+def risk_astar(env, start: Tuple[int, int], goal: Tuple[int, int], beliefs,
+               mode: str = 'expected', risk_weight: float = 10.0, max_risk: float = 0.5,
+               heuristic='manhattan') -> Tuple[Optional[List], float, int]:
+    """
+    A* Search on a belief map - edge cost is the move cost plus the risk
+    penalty of the cell being entered.
+    
+    The penalty raster is built once per search with vectorized NumPy, so
+    the inner loop only indexes into it. The goal is always enterable.
+    Every step except the last one into the goal pays at least the smallest
+    penalty on the map, so the heuristic adds that much per remaining step
+    (counted in moves: Manhattan on 4-connected grids, Chebyshev on
+    8-connected ones) and stays admissible. heuristic is anything
+    make_heuristic accepts; use 'octile' on 8-connected maps.
+    """
+    penalties = risk_penalties(belief_probabilities(beliefs), mode, risk_weight, max_risk)
+    min_penalty = float(penalties.min())
+    if min_penalty == float('inf'):
+        # every cell but the goal violates the chance constraint
+        if start != goal and goal not in env.get_neighbors(start):
+            return None, float('inf'), 0
+        min_penalty = 0.0
+    penalty = penalties.tolist()
+    penalty[goal[0]][goal[1]] = 0.0
+    
+    distance = make_heuristic(env, heuristic, goal)
+    if env.connectivity == 8:
+        steps = lambda pos: max(abs(pos[0] - goal[0]), abs(pos[1] - goal[1]))
+    else:
+        steps = lambda pos: abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+    h = lambda pos: distance(pos) + min_penalty * max(steps(pos) - 1, 0)
+    
+    g_score = {start: 0}
+    frontier = [(h(start), start)]
+    explored = set()
+    parent = {start: None}
+    expanded = 0
+    
+    while frontier:
+        current_f, current = heapq.heappop(frontier)
+        
+        if current in explored:
+            continue
+        
+        explored.add(current)
+        expanded += 1
+        
+        if current == goal:
+            path = reconstruct_path(parent, start, goal)
+            return path, g_score[current], expanded
+        
+        for neighbor in env.get_neighbors(current):
+            if neighbor in explored:
+                continue
+            
+            step_risk = penalty[neighbor[0]][neighbor[1]]
+            if step_risk == float('inf'):
+                continue  # violates the chance constraint
+            tentative_g = g_score[current] + env.get_cost(current, neighbor) + step_risk
+            
+            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                g_score[neighbor] = tentative_g
+                parent[neighbor] = current
+                heapq.heappush(frontier, (tentative_g + h(neighbor), neighbor))
+    
+    return None, float('inf'), expanded
+
+
+class RiskAwarePlanner:
+    """
+    Keeps a risk-aware plan and replans only when the beliefs along the
+    remaining path have moved by more than a threshold since planning.
+    
+    Example:
+        >>> planner = RiskAwarePlanner(env, agent.beliefs)
+        >>> next_pos = planner.next_step(env.agent_pos)
+    """
+    
+    def __init__(self, env, beliefs, mode: str = 'expected', risk_weight: float = 10.0,
+                 max_risk: float = 0.5, replan_threshold: float = 0.1, heuristic='manhattan'):
+        """
+        Args:
+            env: The GridWorld environment
+            beliefs: Shared belief store (BeliefGrid/OccupancyGrid) or array
+            mode: 'expected' or 'chance' (see risk_penalties)
+            risk_weight: Cost per unit of obstacle probability ('expected')
+            max_risk: Highest allowed obstacle probability per cell ('chance')
+            replan_threshold: Belief change along the path that triggers a replan
+            heuristic: Heuristic for risk_astar ('octile' on 8-connected maps)
+        """
+        self.env = env
+        self.beliefs = beliefs
+        self.mode = mode
+        self.risk_weight = risk_weight
+        self.max_risk = max_risk
+        self.replan_threshold = replan_threshold
+        self.heuristic = heuristic
+        
+        self.path = None
+        self.cost = float('inf')
+        self.index = 0              # position of the agent on the path
+        self.plans = 0              # number of searches run
+        self._rows = None           # path cells as index arrays
+        self._cols = None
+        self._snapshot = None       # beliefs along the path when planned
+        self._seen_version = None   # belief version already checked
+        self._failed_at = None      # (belief version, start) of the last failed search
+    
+    def plan(self, start: Tuple[int, int]) -> Optional[List]:
+        """Run risk_astar from start and remember the beliefs along the path."""
+        path, cost, expanded = risk_astar(self.env, start, self.env.goal, self.beliefs,
+                                          self.mode, self.risk_weight, self.max_risk,
+                                          self.heuristic)
+        self.plans += 1
+        self.env.expanded += expanded
+        self.path, self.cost, self.index = path, cost, 0
+        self._failed_at = None if path else (getattr(self.beliefs, 'version', None), start)
+        if path:
+            cells = np.array(path, dtype=np.intp)
+            self._rows, self._cols = cells[:, 0], cells[:, 1]
+            self._snapshot = belief_probabilities(self.beliefs)[self._rows, self._cols].copy()
+        self._seen_version = getattr(self.beliefs, 'version', None)
+        return path
+    
+    def needs_replan(self) -> bool:
+        """
+        True when the beliefs along the rest of the path changed too much.
+        
+        Without a path, a search is only retried once the beliefs have
+        changed since the last one failed (always, for plain arrays).
+        """
+        version = getattr(self.beliefs, 'version', None)
+        if not self.path:
+            return self._failed_at is None or version is None or version != self._failed_at[0]
+        if version is not None and version == self._seen_version:
+            return False  # nothing changed since the last check
+        self._seen_version = version
+        rows, cols = self._rows[self.index:], self._cols[self.index:]
+        current = belief_probabilities(self.beliefs)[rows, cols]
+        drift = np.abs(current - self._snapshot[self.index:])
+        if drift.size and float(drift.max()) > self.replan_threshold:
+            return True
+        if self.mode == 'chance' and current.size > 1 and float(current[1:-1].max(initial=0)) > self.max_risk:
+            return True
+        return False
+    
+    def next_step(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Next cell to move to from pos, replanning only when needed."""
+        if self.path and self.index < len(self.path) and self.path[self.index] != pos:
+            # the agent left the plan (e.g. another component moved it)
+            if pos in self.path[self.index:]:
+                self.index = self.path.index(pos, self.index)
+            else:
+                self.path = None
+        if not self.path and self._failed_at is not None and self._failed_at[1] != pos:
+            self._failed_at = None  # the last failure was from somewhere else
+        if self.needs_replan():
+            self.plan(pos)
+        if not self.path or self.index + 1 >= len(self.path):
+            return None
+        self.index += 1
+        return self.path[self.index]
+
+
+def distance_field(env, source: Tuple[int, int]) -> np.ndarray:
+    """
+    Exact path cost from source to every cell of the grid.
+    
+    A single Dijkstra sweep over flat cell indices (a plain BFS on
+    4-connected grids, where every move costs 1). Moves are symmetric, so
+    the result is also the cost from every cell *to* source, which makes
+    it a perfect heuristic toward that cell.
+    
+    Returns:
+        float array of shape (height, width); inf for obstacles and cells
+        that cannot reach source
+    """
+    return multi_source_field(env, [source])[0]
+
+
+def multi_source_field(env, sources: List[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distance from every cell to its nearest source, in one sweep.
+    
+    Same search as distance_field() but started from all sources at once,
+    e.g. the distance from every cell to the closest charger.
+    
+    Returns:
+        (distances, nearest): float array with the cost to the nearest
+        source (inf if none is reachable) and int array with the index of
+        that source in `sources` (-1 if none)
+    """
+    height, width = env.height, env.width
+    # pad with a ring of obstacles so neighbors never leave the grid
+    stride = width + 2
+    padded = np.zeros((height + 2, stride), dtype=bool)
+    padded[1:-1, 1:-1] = np.asarray(env.grid) != 1
+    free = padded.ravel().tolist()
+    inf = float('inf')
+    dist = [inf] * len(free)
+    owner = [-1] * len(free)
+    origins = []
+    for index, source in enumerate(sources):
+        origin = (source[0] + 1) * stride + source[1] + 1
+        if free[origin] and owner[origin] < 0:
+            dist[origin] = 0.0
+            owner[origin] = index
+            origins.append(origin)
+    
+    straight = (-stride, stride, -1, 1)
+    if env.connectivity != 8:
+        queue = deque(origins)
+        pop, push = queue.popleft, queue.append
+        while queue:
+            cell = pop()
+            d = dist[cell] + 1.0
+            for nxt in (cell - stride, cell + stride, cell - 1, cell + 1):
+                if d < dist[nxt] and free[nxt]:
+                    dist[nxt] = d
+                    owner[nxt] = owner[cell]
+                    push(nxt)
+    else:
+        diagonal = ((-stride - 1, -stride, -1), (-stride + 1, -stride, 1),
+                    (stride - 1, stride, -1), (stride + 1, stride, 1))
+        frontier = [(0.0, origin) for origin in origins]
+        while frontier:
+            d, cell = heapq.heappop(frontier)
+            if d > dist[cell]:
+                continue
+            for offset in straight:
+                nxt = cell + offset
+                if d + 1.0 < dist[nxt] and free[nxt]:
+                    dist[nxt] = d + 1.0
+                    owner[nxt] = owner[cell]
+                    heapq.heappush(frontier, (d + 1.0, nxt))
+            for offset, vertical, horizontal in diagonal:
+                nxt = cell + offset
+                # no corner cutting: both orthogonal cells must be free too
+                if (d + SQRT2 < dist[nxt] and free[nxt]
+                        and free[cell + vertical] and free[cell + horizontal]):
+                    dist[nxt] = d + SQRT2
+                    owner[nxt] = owner[cell]
+                    heapq.heappush(frontier, (d + SQRT2, nxt))
+    
+    distances = np.array(dist).reshape(height + 2, stride)[1:-1, 1:-1].copy()
+    nearest = np.array(owner, dtype=np.int64).reshape(height + 2, stride)[1:-1, 1:-1].copy()
+    return distances, nearest
+
+
+def connected_components(env) -> np.ndarray:
+    """
+    Label of the connected region of every cell, in one sweep.
+    
+    Two cells share a label exactly when a path joins them. Diagonal moves
+    need both orthogonal cells free, so 8-connected maps have the same
+    regions as 4-connected ones.
+    
+    Returns:
+        int array of shape (height, width); -1 for obstacles
+    """
+    height, width = env.height, env.width
+    stride = width + 2
+    padded = np.zeros((height + 2, stride), dtype=bool)
+    padded[1:-1, 1:-1] = np.asarray(env.grid) != 1
+    free = padded.ravel().tolist()
+    labels = [-1] * len(free)
+    for seed, open_cell in enumerate(free):
+        if not open_cell or labels[seed] >= 0:
+            continue
+        labels[seed] = seed
+        queue = [seed]
+        for cell in queue:
+            for nxt in (cell - stride, cell + stride, cell - 1, cell + 1):
+                if labels[nxt] < 0 and free[nxt]:
+                    labels[nxt] = seed
+                    queue.append(nxt)
+    return np.array(labels, dtype=np.int64).reshape(height + 2, stride)[1:-1, 1:-1].copy()
+
+
+def nearest_goals(env, start: Tuple[int, int], goals: Optional[List[Tuple[int, int]]] = None,
+                  k: Optional[int] = 1, radius: Optional[float] = None) -> Tuple[List, int]:
+    """
+    Nearest reachable goals from start, in one search pass.
+    
+    A single uniform-cost search from start visits cells in order of path
+    cost, so goals are found nearest first. It stops after k goals, or
+    once the cost exceeds radius, instead of running one search per goal.
+    
+    Args:
+        goals: Candidate cells (defaults to env.get_goals())
+        k: Number of goals wanted (None = no limit)
+        radius: Largest path cost to report (None = no limit)
+    
+    Returns:
+        results: List of (goal, path, cost), nearest first
+        expanded: Number of nodes expanded
+    """
+    targets = set(env.get_goals() if goals is None else (tuple(g) for g in goals))
+    results = []
+    if not targets or (k is not None and k <= 0):
+        return results, 0
+    
+    frontier = [(0, start)]
+    explored = set()
+    cost_so_far = {start: 0}
+    parent = {start: None}
+    expanded = 0
+    
+    while frontier:
+        current_cost, current = heapq.heappop(frontier)
+        if current in explored:
+            continue
+        if radius is not None and current_cost > radius:
+            break
+        explored.add(current)
+        expanded += 1
+        
+        if current in targets:
+            results.append((current, reconstruct_path(parent, start, current), current_cost))
+            if (k is not None and len(results) >= k) or len(results) == len(targets):
+                break
+        
+        for neighbor in env.get_neighbors(current):
+            new_cost = current_cost + env.get_cost(current, neighbor)
+            if neighbor not in explored and new_cost < cost_so_far.get(neighbor, float('inf')):
+                cost_so_far[neighbor] = new_cost
+                parent[neighbor] = current
+                heapq.heappush(frontier, (new_cost, neighbor))
+    
+    if tracer.level <= DEBUG:
+        tracer.event(DEBUG, 'search.goals', found=[(g, c) for g, _, c in results],
+                     candidates=len(targets), expanded=expanded)
+    return results, expanded
+
+
+def nearest_goal(env, start: Tuple[int, int],
+                 goals: Optional[List[Tuple[int, int]]] = None) -> Tuple[Optional[List], float, int]:
+    """Path to the nearest reachable goal, as (path, cost, expanded) like the other searches."""
+    results, expanded = nearest_goals(env, start, goals, k=1)
+    if not results:
+        return None, float('inf'), expanded
+    _, path, cost = results[0]
+    return path, cost, expanded
+
+
+def goals_within(env, start: Tuple[int, int], radius: float,
+                 goals: Optional[List[Tuple[int, int]]] = None) -> Tuple[List, int]:
+    """Every goal reachable within path cost radius, nearest first (see nearest_goals)."""
+    return nearest_goals(env, start, goals, k=None, radius=radius)
+
+
 def reconstruct_path(parent: dict, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
     """
     Reconstruct path from parent pointers.
@@ -173,6 +859,9 @@ if __name__ == "__main__":
         ('UCS', lambda: ucs(env, start, goal)),
         ('A* (Manhattan)', lambda: astar(env, start, goal, 'manhattan')),
         ('A* (Euclidean)', lambda: astar(env, start, goal, 'euclidean')),
+        ('Bidir BFS', lambda: bidirectional_bfs(env, start, goal)),
+        ('Bidir A*', lambda: bidirectional_astar(env, start, goal, 'manhattan')),
+        ('IDA*', lambda: ida_star(env, start, goal, 'manhattan')),
     ]
     
     results = []
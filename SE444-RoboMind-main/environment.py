@@ -6,8 +6,13 @@ This file provides the simulation environment for the RoboMind project.
 Students should NOT modify this file - use it to test your agents.
 """
 
-import pygame
 import numpy as np
+
+# pygame is only needed for the display; headless runs work without it
+try:
+    import pygame
+except ImportError:
+    pygame = None
 from typing import Tuple, List, Optional
 
 # Colors
@@ -20,6 +25,10 @@ GRAY = (200, 200, 200)
 YELLOW = (255, 235, 59)
 ORANGE = (255, 152, 0)
 
+# MovingAI map terrain: '.', 'G' and 'S' are passable; '@', 'O', 'T' and
+# 'W' (water, impassable for ground units) are obstacles
+MOVINGAI_PASSABLE = b'.GS'
+
 # Cell types
 FREE = 0
 OBSTACLE = 1
@@ -29,6 +38,8 @@ PATH = 4
 VISITED = 5
 UNCERTAIN = 6
 
+SQRT2 = 2 ** 0.5
+
 
 class GridWorld:
     """
@@ -51,16 +62,44 @@ class GridWorld:
         # Create empty grid
         self.grid = np.zeros((height, width), dtype=int)
         
+        # 4 = up/down/left/right; 8 adds diagonal moves (MovingAI maps)
+        self.connectivity = 4
+        
         # Agent position
         self.start = (0, 0)
         self.goal = (height-1, width-1)
         self.agent_pos = self.start
         
+        # Every target of multi-goal tasks (chargers, pick items); empty
+        # means the single goal above. Maps list them as several 'G' cells.
+        self.goals: List[Tuple[int, int]] = []
+        
+        # Fleet of extra robots sharing the grid (multi-agent planning);
+        # agent_pos above stays the single-agent interface
+        self.agent_positions: List[Tuple[int, int]] = []
+        self.agent_goals: List[Tuple[int, int]] = []
+        
         # State tracking
         self.path = []
         self.visited = set()
         self.expanded = 0
         
+        # Map change tracking: version is bumped on every grid change and
+        # listeners are called as listener(row, col, cell_type)
+        self.version = 0
+        self.listeners = []
+        
+        # File the map was loaded from (None for generated maps), the
+        # version right after loading it, and the ALT landmark table built
+        # for the grid (see ai_core/landmarks.py)
+        self.map_file = None
+        self.map_version = None
+        self.landmarks = None
+        
+        # Optional belief map (BeliefGrid/OccupancyGrid) shared by the agents;
+        # when set, free cells are shaded by their obstacle probability
+        self.beliefs = None
+        
         # Pygame setup
         self.screen = None
         self.clock = None
@@ -74,7 +113,8 @@ class GridWorld:
             0 = free space
             1 = obstacle
             S = start
-            G = goal
+            G = goal (may appear several times; the first is self.goal and
+                all of them are in self.goals)
             ? = uncertain
         """
         with open(map_file, 'r') as f:
@@ -83,6 +123,7 @@ class GridWorld:
         self.height = len(lines)
         self.width = len(lines[0].strip().split())
         self.grid = np.zeros((self.height, self.width), dtype=int)
+        self.goals = []
         
         for i, line in enumerate(lines):
             cells = line.strip().split()
@@ -93,24 +134,113 @@ class GridWorld:
                     self.start = (i, j)
                     self.agent_pos = self.start
                 elif cell == 'G':
-                    self.goal = (i, j)
+                    if not self.goals:
+                        self.goal = (i, j)
+                    self.goals.append((i, j))
                 elif cell == '?':
                     self.grid[i][j] = UNCERTAIN
+        
+        self.map_file = map_file
+        self.version += 1
+        self.map_version = self.version
+    
+    def load_movingai_map(self, map_file: str):
+        """
+        Load a map in the MovingAI benchmark format (.map).
+        
+        Format:
+            type octile
+            height H
+            width W
+            map
+            <H rows of W characters>
+        
+        '.', 'G' and 'S' are passable, everything else is an obstacle.
+        The world switches to 8-connectivity with octile costs (diagonal
+        moves cost sqrt(2) and may not cut corners), which is what the
+        optimal lengths in MovingAI .scen files assume. Start and goal are
+        set to the first and last passable cells; scenarios override them.
+        """
+        with open(map_file, 'rb') as f:
+            header = {}
+            while True:
+                line = f.readline()
+                if not line:
+                    raise ValueError(f"{map_file}: missing 'map' line")
+                line = line.strip()
+                if line == b'map':
+                    break
+                if line:
+                    key, _, value = line.partition(b' ')
+                    header[key.decode()] = value.strip().decode()
+            height, width = int(header['height']), int(header['width'])
+            rows = f.read().split()
+        
+        if len(rows) < height or any(len(row) < width for row in rows[:height]):
+            raise ValueError(f"{map_file}: expected {height} rows of {width} cells")
+        cells = np.frombuffer(b''.join(row[:width] for row in rows[:height]), dtype=np.uint8)
+        passable = np.isin(cells, np.frombuffer(MOVINGAI_PASSABLE, dtype=np.uint8))
+        
+        self.height = height
+        self.width = width
+        self.grid = np.where(passable, FREE, OBSTACLE).reshape(height, width)
+        self.connectivity = 8
+        self.goals = []
+        
+        free = np.flatnonzero(passable)
+        if free.size:
+            self.start = tuple(int(v) for v in divmod(int(free[0]), width))
+            self.goal = tuple(int(v) for v in divmod(int(free[-1]), width))
+        self.agent_pos = self.start
+        self.map_file = map_file
+        self.version += 1
+        self.map_version = self.version
+    
+    def add_listener(self, listener):
+        """
+        Register a callback for grid changes.
+        
+        Args:
+            listener: Callable invoked as listener(row, col, cell_type)
+                      whenever a cell changes type
+        """
+        self.listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        """Unregister a callback added with add_listener()."""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
     
     def add_obstacle(self, row: int, col: int):
         """Add an obstacle at (row, col)."""
         if 0 <= row < self.height and 0 <= col < self.width:
+            if self.grid[row][col] == OBSTACLE:
+                return
             self.grid[row][col] = OBSTACLE
+            self.version += 1
+            for listener in self.listeners:
+                listener(row, col, OBSTACLE)
     
-    def add_random_obstacles(self, num_obstacles: int):
-        """Add random obstacles to the grid."""
+    def add_random_obstacles(self, num_obstacles: int, rng: Optional[np.random.Generator] = None):
+        """
+        Add random obstacles to the grid.
+        
+        Args:
+            num_obstacles: Number of obstacles to place
+            rng: Optional numpy Generator for reproducible maps (defaults
+                 to the global np.random state)
+        """
         count = 0
         while count < num_obstacles:
-            row = np.random.randint(0, self.height)
-            col = np.random.randint(0, self.width)
+            if rng is not None:
+                row = int(rng.integers(0, self.height))
+                col = int(rng.integers(0, self.width))
+            else:
+                row = np.random.randint(0, self.height)
+                col = np.random.randint(0, self.width)
             
-            # Don't place obstacle on start or goal
-            if (row, col) != self.start and (row, col) != self.goal:
+            # Don't place obstacle on start or goal(s)
+            if (row, col) != self.start and (row, col) != self.goal and (row, col) not in self.goals:
                 if self.grid[row][col] == FREE:
                     self.add_obstacle(row, col)
                     count += 1
@@ -126,8 +256,26 @@ class GridWorld:
         """Check if position is the goal."""
         return pos == self.goal
     
+    def add_goal(self, pos: Tuple[int, int]):
+        """Add a target for multi-goal queries (the first one also becomes self.goal)."""
+        if not self.is_valid(pos):
+            raise ValueError(f"goal {pos} must be a free cell")
+        if not self.goals:
+            self.goal = tuple(pos)
+        if tuple(pos) not in self.goals:
+            self.goals.append(tuple(pos))
+    
+    def get_goals(self) -> List[Tuple[int, int]]:
+        """All targets: self.goals, or just self.goal when there are none."""
+        return list(self.goals) if self.goals else [self.goal]
+    
     def get_neighbors(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
-        """Get valid neighboring positions (4-connected: up, down, left, right)."""
+        """
+        Get valid neighboring positions (4-connected: up, down, left, right).
+        
+        With connectivity 8, diagonal moves are added when both cells they
+        pass between are free (no corner cutting).
+        """
         row, col = pos
         neighbors = []
         
@@ -139,12 +287,21 @@ class GridWorld:
             if self.is_valid(new_pos):
                 neighbors.append(new_pos)
         
+        if self.connectivity == 8:
+            for dr, dc in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+                if (self.is_valid((row + dr, col + dc)) and
+                        self.is_valid((row + dr, col)) and
+                        self.is_valid((row, col + dc))):
+                    neighbors.append((row + dr, col + dc))
+        
         return neighbors
     
     def get_cost(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
         """Get movement cost between two adjacent positions."""
-        # Base cost is 1
+        # Base cost is 1; diagonal moves (8-connectivity) cost sqrt(2)
         # You can modify this for terrain costs (e.g., rough terrain = 2)
+        if pos1[0] != pos2[0] and pos1[1] != pos2[1]:
+            return SQRT2
         return 1.0
     
     def manhattan_distance(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
@@ -155,6 +312,61 @@ class GridWorld:
         """Calculate Euclidean distance heuristic."""
         return np.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
     
+    def octile_distance(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
+        """Calculate octile distance heuristic (exact on an empty 8-connected grid)."""
+        dr = abs(pos1[0] - pos2[0])
+        dc = abs(pos1[1] - pos2[1])
+        return max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+    
+    def add_agent(self, start: Tuple[int, int], goal: Tuple[int, int]) -> int:
+        """
+        Add a robot to the fleet.
+        
+        Args:
+            start: Free cell not occupied by another robot
+            goal: Free cell the robot should reach (robots may share goals)
+        
+        Returns:
+            Index of the new robot in agent_positions/agent_goals
+        """
+        if not self.is_valid(start) or not self.is_valid(goal):
+            raise ValueError(f"start {start} and goal {goal} must be free cells")
+        if start in self.agent_positions:
+            raise ValueError(f"cell {start} is already occupied by another agent")
+        self.agent_positions.append(tuple(start))
+        self.agent_goals.append(tuple(goal))
+        return len(self.agent_positions) - 1
+    
+    def clear_agents(self):
+        """Remove every robot of the fleet."""
+        self.agent_positions = []
+        self.agent_goals = []
+    
+    def move_agents(self, positions: List[Tuple[int, int]]):
+        """
+        Move the whole fleet by one synchronous step.
+        
+        Every robot moves to an adjacent cell or waits. Raises ValueError on
+        invalid moves, two robots in one cell (vertex conflict) or two
+        robots swapping cells (edge conflict).
+        """
+        if len(positions) != len(self.agent_positions):
+            raise ValueError(f"expected {len(self.agent_positions)} positions, got {len(positions)}")
+        previous = {}
+        for i, (old, new) in enumerate(zip(self.agent_positions, positions)):
+            if new != old and new not in self.get_neighbors(old):
+                raise ValueError(f"agent {i} cannot move from {old} to {new}")
+            previous[old] = i
+        occupied = {}
+        for i, (old, new) in enumerate(zip(self.agent_positions, positions)):
+            if new in occupied:
+                raise ValueError(f"agents {occupied[new]} and {i} collide at {new}")
+            occupied[new] = i
+            j = previous.get(new)
+            if j is not None and j != i and positions[j] == old:
+                raise ValueError(f"agents {i} and {j} swap cells {old} <-> {new}")
+        self.agent_positions = [tuple(p) for p in positions]
+    
     def reset(self):
         """Reset agent to start position."""
         self.agent_pos = self.start
@@ -164,6 +376,8 @@ class GridWorld:
     
     def init_display(self):
         """Initialize Pygame display."""
+        if pygame is None:
+            raise ImportError("pygame is required for the display (pip install pygame)")
         pygame.init()
         screen_width = self.width * self.cell_size
         screen_height = self.height * self.cell_size + 100  # Extra space for info
@@ -182,13 +396,18 @@ class GridWorld:
                         (x, y, self.cell_size, self.cell_size), 1)
     
     def draw_agent(self):
-        """Draw the agent as a blue circle."""
+        """Draw the agent as a blue circle (fleet robots in orange)."""
         row, col = self.agent_pos
         center_x = col * self.cell_size + self.cell_size // 2
         center_y = row * self.cell_size + self.cell_size // 2
         pygame.draw.circle(self.screen, BLUE, 
                           (center_x, center_y), 
                           self.cell_size // 3)
+        for row, col in self.agent_positions:
+            pygame.draw.circle(self.screen, ORANGE,
+                               (col * self.cell_size + self.cell_size // 2,
+                                row * self.cell_size + self.cell_size // 2),
+                               max(1, self.cell_size // 3))
     
     def draw_text(self, text: str, pos: Tuple[int, int], size: int = 24):
         """Draw text on screen."""
@@ -204,6 +423,9 @@ class GridWorld:
         # Fill background
         self.screen.fill(WHITE)
         
+        beliefs = self.beliefs.probabilities() if self.beliefs is not None else None
+        goals = set(self.goals)
+        
         # Draw grid cells
         for row in range(self.height):
             for col in range(self.width):
@@ -212,7 +434,7 @@ class GridWorld:
                 # Determine color based on cell type
                 if pos == self.start:
                     color = GREEN
-                elif pos == self.goal:
+                elif pos == self.goal or pos in goals:
                     color = RED
                 elif pos in self.visited:
                     color = (200, 230, 255)  # Light blue for visited
@@ -222,6 +444,10 @@ class GridWorld:
                     color = BLACK
                 elif self.grid[row][col] == UNCERTAIN:
                     color = ORANGE
+                elif self.beliefs is not None:
+                    # darker orange tint = higher obstacle probability
+                    p = float(beliefs[row, col])
+                    color = (255, int(255 - 80 * p), int(255 - 200 * p))
                 else:
                     color = WHITE
                 
@@ -9,6 +9,11 @@ Run different modes of the simulation:
     python main.py --test-probability  # Test probabilistic agent
     python main.py --test-hybrid       # Test hybrid agent
     python main.py --experiment all    # Run all experiments
+    python main.py --experiment all --headless --episodes 100 --workers 8
+    python main.py --test-hybrid --profile  # Per-phase timing breakdown
+    python main.py --test-hybrid --sensor-accuracy 0.8 --density 0.2
+    python main.py --test-hybrid --planner risk  # Plan around likely obstacles
+    python -m utils.sweep --agent hybrid --param sensor_accuracy=0.7,0.8,0.9  # Tune parameters
 """
 
 import argparse
@@ -36,6 +41,20 @@ try:
 except ImportError:
     HybridAgent = None
 
+from ai_core.knowledge_base import KnowledgeBase
+from ai_core.grid_knowledge_base import GridKnowledgeBase
+from utils.profiler import StepProfiler, profile_agent
+from utils.recording import EpisodeRecorder
+from utils import tracing
+
+
+def open_probability(text: str) -> float:
+    """argparse type for a probability strictly between 0 and 1."""
+    value = float(text)
+    if not 0 < value < 1:
+        raise argparse.ArgumentTypeError(f"must lie strictly between 0 and 1, got {text}")
+    return value
+
 
 def print_header(title):
     """Print a formatted header."""
@@ -44,6 +63,40 @@ def print_header(title):
     print("=" * 60 + "\n")
 
 
+def finish_profile(profiler, output: str | None = None):
+    """Print the profiler breakdown and optionally export it as JSON."""
+    if profiler is None:
+        return
+    profiler.print_report()
+    if output:
+        profiler.export_json(output)
+        print(f"Profile written to {output}")
+
+
+def finish_recording(recorder, path: str | None):
+    """Save a recorded episode."""
+    if recorder is None:
+        return
+    recorder.save(path)
+    print(f"Episode ({recorder.ticks} ticks) recorded to {path}")
+
+
+def init_display(env, viewer: bool = False):
+    """Open the pygame window, or stream frames to a viewer process."""
+    if viewer:
+        from utils.viewer import attach_viewer
+        attach_viewer(env)
+    else:
+        env.init_display()
+
+
+def make_kb(env, backend: str = 'set'):
+    """Create the knowledge base backend used by the logic-based agents."""
+    if backend == 'grid':
+        return GridKnowledgeBase(env.height, env.width)
+    return KnowledgeBase()
+
+
 def run_demo():
     """Run environment demonstration."""
     print_header("RoboMind Environment Demo")
@@ -112,7 +165,9 @@ def test_search():
     print("-" * 60)
 
 
-def test_logic(seed: int | None = None):
+def test_logic(seed: int | None = None, kb_backend: str = 'set', profiler=None,
+               record: str | None = None, density: float | None = None,
+               viewer: bool = False):
     """Test logic-based agent."""
     print_header("Testing Logic Agent")
     
@@ -144,7 +199,7 @@ def test_logic(seed: int | None = None):
 
     # Add random obstacles with density cap, avoiding start/goal
     total_cells = env.width * env.height
-    requested_density = 0.18  # slightly higher than probability test
+    requested_density = density if density is not None else 0.18  # slightly higher than probability test
     max_density_cap = 0.25
     num_obstacles_requested = int(total_cells * requested_density)
     max_obstacles_allowed = int((total_cells - 2) * max_density_cap)
@@ -157,16 +212,22 @@ def test_logic(seed: int | None = None):
     print(f"Obstacles: {(env.grid == 1).sum()}\n")
 
     # Initialize display
-    env.init_display()
+    init_display(env, viewer)
 
     # Create logic agent
-    agent = LogicAgent(env)
+    agent = LogicAgent(env, make_kb(env, kb_backend))
+    if profiler is not None:
+        profile_agent(profiler, agent, env)
+    recorder = EpisodeRecorder(env) if record else None
 
     max_steps = env.width * env.height
     steps = 0
     reached = False
 
     while env.running and steps < max_steps:
+        if profiler is not None:
+            profiler.start()
+
         # Handle window events
         if not env.handle_events():
             break
@@ -175,6 +236,8 @@ def test_logic(seed: int | None = None):
         if env.is_goal(env.agent_pos):
             reached = True
             env.render()
+            if profiler is not None:
+                profiler.tick()
             break
 
         # Agent cycle: perceive → reason → act
@@ -191,6 +254,10 @@ def test_logic(seed: int | None = None):
 
         # Render and small delay
         env.render()
+        if profiler is not None:
+            profiler.tick()
+        if recorder is not None:
+            recorder.record_tick()
         try:
             import pygame
             pygame.time.delay(300)  # slower animation
@@ -200,7 +267,9 @@ def test_logic(seed: int | None = None):
 
         steps += 1
 
+    agent.close()
     env.close()
+    finish_recording(recorder, record)
     if reached:
         print(" Goal reached!")
         print(f"Path Length: {len(env.path)} | Expanded: {env.expanded}")
@@ -209,8 +278,10 @@ def test_logic(seed: int | None = None):
         print(f"Path Length: {len(env.path)} | Expanded: {env.expanded}")
 
 
-def test_probability(seed: int | None = None):
-    """Test probabilistic agent."""
+def test_probability(seed: int | None = None, mode: str = 'greedy', profiler=None,
+                     record: str | None = None, density: float | None = None,
+                     agent_params: dict | None = None, viewer: bool = False):
+    """Test probabilistic agent (agent_params: initial_belief, sensor_accuracy)."""
     print_header("Testing Probabilistic Agent")
     
     
@@ -240,7 +311,7 @@ def test_probability(seed: int | None = None):
 
     # Add random obstacles (avoid start/goal) with a hard cap on density
     total_cells = env.width * env.height
-    requested_density = 0.15  # requested obstacle density (more open)
+    requested_density = density if density is not None else 0.15  # requested obstacle density (more open)
     max_density_cap = 0.25    # do not exceed 25% obstacles overall
     num_obstacles_requested = int(total_cells * requested_density)
     max_obstacles_allowed = int((total_cells - 2) * max_density_cap)  # reserve start & goal
@@ -253,16 +324,22 @@ def test_probability(seed: int | None = None):
     print(f"Obstacles: {(env.grid == 1).sum()}\n")
 
     # Initialize display
-    env.init_display()
+    init_display(env, viewer)
 
     # Create probabilistic agent
-    agent = ProbabilisticAgent(env)
+    agent = ProbabilisticAgent(env, mode=mode, **(agent_params or {}))
+    if profiler is not None:
+        profile_agent(profiler, agent, env)
+    recorder = EpisodeRecorder(env) if record else None
 
     # Simple loop: update beliefs and move toward lowest-risk neighbor
     max_steps = env.width * env.height * 2
     steps = 0
     reached = False
     while env.running and steps < max_steps:
+        if profiler is not None:
+            profiler.start()
+
         # Handle window events and render
         if not env.handle_events():
             break
@@ -271,6 +348,8 @@ def test_probability(seed: int | None = None):
         if env.is_goal(env.agent_pos):
             reached = True
             env.render()
+            if profiler is not None:
+                profiler.tick()
             break
 
         # Simulate a sensor reading at current position: it's free if we can stand there
@@ -293,6 +372,10 @@ def test_probability(seed: int | None = None):
 
         # Render frame and slow down step progression
         env.render()
+        if profiler is not None:
+            profiler.tick()
+        if recorder is not None:
+            recorder.record_tick()
         try:
             import pygame
             pygame.time.delay(300)  # slower animation
@@ -303,6 +386,7 @@ def test_probability(seed: int | None = None):
         steps += 1
 
     env.close()
+    finish_recording(recorder, record)
     if reached:
         print("✓ Goal reached!")
         print(f"Path Length: {len(env.path)} | Expanded: {env.expanded}")
@@ -311,7 +395,9 @@ def test_probability(seed: int | None = None):
         print(f"Path Length: {len(env.path)} | Expanded: {env.expanded}")
 
 
-def test_hybrid(seed: int | None = None):
+def test_hybrid(seed: int | None = None, kb_backend: str = 'set', profiler=None,
+                record: str | None = None, density: float | None = None,
+                agent_params: dict | None = None, viewer: bool = False):
     """Test hybrid agent with search + logic + probability."""
     print_header("Testing Hybrid Agent")
     
@@ -339,7 +425,7 @@ def test_hybrid(seed: int | None = None):
 
     # Add random obstacles with density cap
     total_cells = env.width * env.height
-    requested_density = 0.18
+    requested_density = density if density is not None else 0.18
     max_density_cap = 0.25
     num_obstacles_requested = int(total_cells * requested_density)
     max_obstacles_allowed = int((total_cells - 2) * max_density_cap)
@@ -352,16 +438,22 @@ def test_hybrid(seed: int | None = None):
     print(f"Obstacles: {(env.grid == 1).sum()}\n")
 
     # Initialize display
-    env.init_display()
+    init_display(env, viewer)
 
     # Create hybrid agent
-    agent = HybridAgent(env)
+    agent = HybridAgent(env, make_kb(env, kb_backend), **(agent_params or {}))
+    if profiler is not None:
+        profile_agent(profiler, agent, env)
+    recorder = EpisodeRecorder(env) if record else None
 
     max_steps = env.width * env.height * 2
     steps = 0
     reached = False
 
     while env.running and steps < max_steps:
+        if profiler is not None:
+            profiler.start()
+
         # Handle window events
         if not env.handle_events():
             break
@@ -370,6 +462,8 @@ def test_hybrid(seed: int | None = None):
         if env.is_goal(env.agent_pos):
             reached = True
             env.render()
+            if profiler is not None:
+                profiler.tick()
             break
 
         # Agent cycle: perceive → reason → act (belief updates inside perceive/act)
@@ -385,6 +479,10 @@ def test_hybrid(seed: int | None = None):
         # Allow same position occasionally (e.g., replanning), but track it
         if next_pos == env.agent_pos:
             # Don't break immediately - let agent try again
+            if profiler is not None:
+                profiler.tick()
+            if recorder is not None:
+                recorder.record_tick()
             steps += 1
             continue
 
@@ -396,6 +494,10 @@ def test_hybrid(seed: int | None = None):
 
         # Render and delay
         env.render()
+        if profiler is not None:
+            profiler.tick()
+        if recorder is not None:
+            recorder.record_tick()
         try:
             import pygame
             pygame.time.delay(200)
@@ -405,13 +507,17 @@ def test_hybrid(seed: int | None = None):
 
         steps += 1
 
+    agent.close()
     env.close()
+    finish_recording(recorder, record)
     if reached:
         print("✓ Goal reached!")
         print(f"Path Length: {len(env.path)} | Expanded: {env.expanded}")
     else:
         print("✗ Goal not reached.")
         print(f"Path Length: {len(env.path)} | Expanded: {env.expanded}")
+    stats = agent.planning_stats()
+    print(f"Plans computed: {stats['plans_computed']} over {stats['ticks']} ticks")
 
 
 def run_experiments():
@@ -420,7 +526,30 @@ def run_experiments():
     test_probability()
     test_logic()
     test_hybrid()
-    
+
+
+def run_headless_experiments(args):
+    """Run many seeded episodes without a display on a worker pool."""
+    from utils.experiment_runner import (AGENT_TYPES, make_episode_specs,
+                                         run_experiments_parallel, print_summary)
+    print_header("Headless Experiments")
+
+    agents = AGENT_TYPES if args.experiment == 'all' else [args.experiment]
+    sizes = [int(s) for s in args.sizes.split(',')]
+    densities = [float(d) for d in args.densities.split(',')]
+    specs = make_episode_specs(agents, sizes, densities, args.episodes,
+                               base_seed=args.seed or 0)
+
+    print(f"Agents: {', '.join(agents)}")
+    print(f"Sizes: {sizes} | Densities: {densities} | Episodes each: {args.episodes}")
+    if args.output:
+        print(f"Writing results to {args.output}")
+    print()
+
+    rows = run_experiments_parallel(specs, args.output, args.workers)
+    print()
+    print_summary(rows)
+
 
 def main():
     """Main entry point."""
@@ -435,6 +564,13 @@ Examples:
   python main.py --test-probability  # Test probabilistic agent
   python main.py --test-hybrid       # Test hybrid agent
   python main.py --experiment all    # Run all experiments
+  python main.py --experiment all --headless --episodes 100 --output results.csv
+  python main.py --test-hybrid --profile   # Per-phase timing breakdown
+  python main.py --test-hybrid --trace run.jsonl --trace-level debug
+  python main.py --test-hybrid --record run.rmrec   # then --replay run.rmrec
+  python main.py --test-hybrid --viewer    # render in a separate process
+  python main.py --test-hybrid --sensor-accuracy 0.8 --initial-belief 0.2 --density 0.2
+  python main.py --test-hybrid --planner risk   # risk-aware A* on the beliefs
         """
     )
     
@@ -450,8 +586,48 @@ Examples:
                        help='Set random seed for reproducible demo/tests')
     parser.add_argument('--test-hybrid', action='store_true',
                        help='Test hybrid agent')
-    parser.add_argument('--experiment', choices=['all', 'search', 'logic', 'probability'],
+    parser.add_argument('--planner', choices=['astar', 'risk'], default='astar',
+                       help='Hybrid agent planner: A* on the map or risk-aware A* on its beliefs')
+    parser.add_argument('--kb', choices=['set', 'grid'], default='set',
+                       help='Knowledge base backend for logic/hybrid agents')
+    parser.add_argument('--explore', action='store_true',
+                       help='Probabilistic agent explores by information gain')
+    parser.add_argument('--density', type=float,
+                       help='Obstacle density of the logic/probability/hybrid tests '
+                            '(default 0.18, 0.15 for probability)')
+    parser.add_argument('--initial-belief', type=open_probability,
+                       help='Prior obstacle probability of the probabilistic/hybrid agents (default 0.35)')
+    parser.add_argument('--sensor-accuracy', type=float,
+                       help='Sensor accuracy of the probabilistic/hybrid agents (default 0.9)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Time perceive/reason/act/search/render per tick and print a breakdown')
+    parser.add_argument('--profile-output',
+                       help='Also export the profile as JSON to this file')
+    parser.add_argument('--viewer', action='store_true',
+                       help='Draw in a separate viewer process fed by per-tick delta frames')
+    parser.add_argument('--record', metavar='FILE',
+                       help='Record the logic/probability/hybrid episode to FILE')
+    parser.add_argument('--replay', metavar='FILE',
+                       help='Replay a recorded episode without running the agents')
+    parser.add_argument('--trace', nargs='?', const='-', metavar='FILE',
+                       help='Trace agent/search/KB events to FILE (.jsonl or binary); '
+                            'without FILE, print them to the console')
+    parser.add_argument('--trace-level', choices=['debug', 'info', 'warning'], default='info',
+                       help='Lowest event level to trace (default: info)')
+    parser.add_argument('--experiment', choices=['all', 'search', 'logic', 'probability', 'hybrid'],
                        help='Run experiments')
+    parser.add_argument('--headless', action='store_true',
+                       help='Run experiments without a display on a worker pool')
+    parser.add_argument('--episodes', type=int, default=10,
+                       help='Headless episodes per agent/size/density')
+    parser.add_argument('--sizes', default='10',
+                       help='Comma-separated grid sizes for headless experiments')
+    parser.add_argument('--densities', default='0.15',
+                       help='Comma-separated obstacle densities for headless experiments')
+    parser.add_argument('--workers', type=int,
+                       help='Worker processes for headless experiments (default: CPU count)')
+    parser.add_argument('--output',
+                       help='Results file for headless experiments (.csv or .jsonl)')
     
     args = parser.parse_args()
     
@@ -465,19 +641,38 @@ Examples:
         print("  python main.py --help\n")
         return
     
+    profiler = StepProfiler() if args.profile or args.profile_output else None
+    agent_params = {name: value for name, value in [('initial_belief', args.initial_belief),
+                                                    ('sensor_accuracy', args.sensor_accuracy)]
+                    if value is not None}
+    if args.trace:
+        tracing.enable(None if args.trace == '-' else args.trace, args.trace_level)
+    
     # Run requested mode
     if args.demo:
         run_demo()
     elif args.test_search:
         test_search()
+    elif args.replay:
+        from utils.recording import main as replay_main
+        replay_main(['play', args.replay])
     elif args.test_logic:
-        test_logic(args.seed)
+        test_logic(args.seed, args.kb, profiler, args.record, args.density, viewer=args.viewer)
+        finish_profile(profiler, args.profile_output)
     elif args.test_probability:
-        test_probability(args.seed)
+        test_probability(args.seed, 'explore' if args.explore else 'greedy', profiler, args.record,
+                         args.density, agent_params, viewer=args.viewer)
+        finish_profile(profiler, args.profile_output)
     elif args.test_hybrid:
-        test_hybrid(args.seed)
+        test_hybrid(args.seed, args.kb, profiler, args.record, args.density,
+                    dict(agent_params, planner=args.planner), viewer=args.viewer)
+        finish_profile(profiler, args.profile_output)
+    elif args.experiment and args.headless:
+        run_headless_experiments(args)
     elif args.experiment:
         run_experiments()
+    
+    tracing.disable()
 
 
 if __name__ == "__main__":
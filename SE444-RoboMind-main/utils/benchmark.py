@@ -0,0 +1,399 @@
+"""
+Search Benchmark Suite - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+Runs every registered search engine on generated random maps and on the
+stored maps in maps/, and reports per map and engine:
+
+    time per query (median over repeats), nodes expanded per second,
+    peak memory (tracemalloc) and path cost
+
+Usage:
+    python -m utils.benchmark                                # quick preset
+    python -m utils.benchmark --sizes 10,256,4096 --save baseline.json
+    python -m utils.benchmark --compare baseline.json --threshold 0.15
+
+--compare reruns the configuration stored in the baseline and exits with
+status 1 if any engine got slower, expanded fewer nodes per second, used
+more memory than the threshold allows, or returned a different cost.
+
+New engines only need an entry in ENGINES (or a call to register_engine);
+an engine is any callable (env, start, goal) -> (path, cost, expanded).
+Engines in OPT_IN_ENGINES only run when named with --engines, and engines
+in ENGINE_MAX_CELLS are skipped on bigger maps. Per-map preprocessing
+(ENGINE_SETUP, e.g. ALT landmarks) runs before the timed repeats; landmark
+caches go to a temporary directory unless --landmark-cache is given.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from environment import GridWorld
+from ai_core.search_algorithms import (bfs, ucs, astar, bidirectional_bfs, bidirectional_astar,
+                                     ida_star)
+from ai_core.landmarks import get_landmarks
+
+
+ENGINES: Dict[str, Callable] = {
+    'bfs': bfs,
+    'ucs': ucs,
+    'astar_manhattan': lambda env, start, goal: astar(env, start, goal, 'manhattan'),
+    'astar_euclidean': lambda env, start, goal: astar(env, start, goal, 'euclidean'),
+    'astar_alt': lambda env, start, goal: astar(env, start, goal, 'alt'),
+    'bidir_bfs': bidirectional_bfs,
+    'bidir_astar': lambda env, start, goal: bidirectional_astar(env, start, goal, 'manhattan'),
+    'ida_star': lambda env, start, goal: ida_star(env, start, goal, 'manhattan'),
+}
+
+# Not part of the default engine set: IDA* re-expands nodes and ALT needs
+# landmark preprocessing, both impractical on the 'full' preset
+OPT_IN_ENGINES = {'ida_star', 'astar_alt'}
+
+# Largest map (in cells) an engine is run on, even when asked for
+ENGINE_MAX_CELLS = {'ida_star': 256 * 256}
+
+# Untimed per-map preparation: engine -> setup(env, cache_dir)
+ENGINE_SETUP: Dict[str, Callable] = {
+    'astar_alt': lambda env, cache_dir: get_landmarks(env, cache_dir=cache_dir),
+}
+
+# Landmark files written while benchmarking (instead of next to maps/*.txt)
+LANDMARK_CACHE = os.path.join(tempfile.gettempdir(), 'robomind-landmarks')
+
+SIZE_PRESETS = {
+    'quick': [10, 64, 256],
+    'full': [10, 64, 256, 1024, 4096],
+}
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'maps')
+
+# Metrics checked by --compare: (name, True if higher is better)
+COMPARED_METRICS = [
+    ('time_per_query_ms', False),
+    ('expansions_per_s', True),
+    ('peak_memory_kb', False),
+]
+
+
+def register_engine(name: str, engine: Callable, setup: Optional[Callable] = None):
+    """
+    Add a search engine (env, start, goal) -> (path, cost, expanded).
+
+    setup(env, cache_dir), if given, runs once per map outside the timing.
+    """
+    ENGINES[name] = engine
+    if setup is not None:
+        ENGINE_SETUP[name] = setup
+
+
+def default_engines() -> List[str]:
+    return [name for name in ENGINES if name not in OPT_IN_ENGINES]
+
+
+# ============================================================================
+# Benchmark maps
+# ============================================================================
+
+def generated_map(size: int, density: float, seed: int) -> GridWorld:
+    """
+    Random square map with obstacles at the given density.
+
+    Obstacles are drawn in one vectorized pass so even 4096x4096 maps are
+    built in well under a second.
+    """
+    rng = np.random.default_rng(seed)
+    env = GridWorld(width=size, height=size)
+    env.grid = (rng.random((size, size)) < density).astype(int)
+    env.grid[env.start] = 0
+    env.grid[env.goal] = 0
+    return env
+
+
+def stored_maps(maps_dir: str = MAPS_DIR) -> List[str]:
+    """Paths of the text maps that ship with the project."""
+    return sorted(glob.glob(os.path.join(maps_dir, '*.txt')))
+
+
+def load_stored_map(path: str) -> GridWorld:
+    """Load a map file into a fresh GridWorld."""
+    env = GridWorld()
+    env.load_map(path)
+    return env
+
+
+def make_queries(env, count: int, seed: int) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """
+    Seeded (start, goal) pairs on free cells.
+
+    The map's own start/goal is always the first query; the rest are
+    random free cells, so some queries may have no path.
+    """
+    rng = np.random.default_rng(seed)
+    free = np.argwhere(env.grid == 0)
+    queries = [(tuple(env.start), tuple(env.goal))]
+    while len(queries) < count and len(free) > 1:
+        a, b = rng.choice(len(free), size=2, replace=False)
+        queries.append((tuple(int(v) for v in free[a]), tuple(int(v) for v in free[b])))
+    return queries[:count]
+
+
+def benchmark_maps(sizes: List[int], density: float, seed: int,
+                   include_stored: bool = True) -> List[Tuple[str, Callable[[], GridWorld]]]:
+    """(name, factory) for every map in the suite, smallest first."""
+    maps = []
+    if include_stored:
+        for path in stored_maps():
+            name = os.path.splitext(os.path.basename(path))[0]
+            maps.append((name, lambda path=path: load_stored_map(path)))
+    for size in sizes:
+        maps.append((f"random{size}x{size}",
+                     lambda size=size: generated_map(size, density, seed + size)))
+    return maps
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+def measure(engine: Callable, env, queries, repeats: int = 3,
+            track_memory: bool = True) -> Dict:
+    """
+    Benchmark one engine on one map.
+
+    Each query is timed `repeats` times and the median is kept. Peak memory
+    is measured in a separate run because tracemalloc slows allocation.
+    """
+    times = []
+    expanded_total = 0
+    costs = []
+    found = 0
+    for start, goal in queries:
+        samples = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            path, cost, expanded = engine(env, start, goal)
+            samples.append(time.perf_counter() - t0)
+        times.append(statistics.median(samples))
+        expanded_total += expanded
+        if path is not None:
+            found += 1
+            costs.append(float(cost))
+
+    peak = 0
+    if track_memory:
+        for start, goal in queries:
+            tracemalloc.start()
+            engine(env, start, goal)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    total_time = sum(times)
+    return {
+        'queries': len(queries),
+        'found': found,
+        'time_per_query_ms': 1000 * total_time / len(queries),
+        'expanded': expanded_total,
+        'expansions_per_s': expanded_total / total_time if total_time > 0 else 0.0,
+        'peak_memory_kb': peak / 1024,
+        'total_cost': sum(costs),
+    }
+
+
+def run_suite(config: Dict, verbose: bool = True) -> List[Dict]:
+    """
+    Run every engine in config['engines'] on every map of the suite.
+
+    Args:
+        config: Dict with engines, sizes, density, seed, queries, repeats,
+                stored_maps and memory (see default_config())
+
+    Returns:
+        One result dict per (map, engine)
+    """
+    results = []
+    for map_name, factory in benchmark_maps(config['sizes'], config['density'],
+                                            config['seed'], config['stored_maps']):
+        env = factory()
+        queries = make_queries(env, config['queries'], config['seed'])
+        cells = env.width * env.height
+        for engine_name in config['engines']:
+            if cells > ENGINE_MAX_CELLS.get(engine_name, cells):
+                if verbose:
+                    print(f"{map_name:<18} {engine_name:<17} skipped (more than "
+                          f"{ENGINE_MAX_CELLS[engine_name]} cells)")
+                continue
+            setup = ENGINE_SETUP.get(engine_name)
+            if setup is not None:
+                setup(env, config.get('landmark_cache', LANDMARK_CACHE))
+            row = {'map': map_name, 'engine': engine_name, 'cells': cells}
+            row.update(measure(ENGINES[engine_name], env, queries,
+                               config['repeats'], config['memory']))
+            results.append(row)
+            if verbose:
+                print_row(row)
+    return results
+
+
+def default_config(**overrides) -> Dict:
+    """Benchmark settings; stored with the baseline so --compare can rerun them."""
+    config = {
+        'engines': default_engines(),
+        'sizes': SIZE_PRESETS['quick'],
+        'density': 0.2,
+        'seed': 0,
+        'queries': 5,
+        'repeats': 3,
+        'stored_maps': True,
+        'memory': True,
+        'landmark_cache': LANDMARK_CACHE,
+    }
+    config.update({k: v for k, v in overrides.items() if v is not None})
+    return config
+
+
+# ============================================================================
+# Baselines and comparison
+# ============================================================================
+
+def save_baseline(path: str, config: Dict, results: List[Dict]):
+    """Write results as a JSON baseline with the config and machine info."""
+    baseline = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+        'config': config,
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+    print(f"\nBaseline saved to {path}")
+
+
+def load_baseline(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: List[Dict], current: List[Dict], threshold: float) -> List[str]:
+    """
+    Find regressions of current results against a baseline.
+
+    A metric regresses when it is worse than the baseline by more than
+    `threshold` (0.1 = 10%). A changed path cost is always reported since
+    it means an engine returns different answers.
+
+    Returns:
+        Human-readable regression messages (empty if none)
+    """
+    previous = {(r['map'], r['engine']): r for r in baseline}
+    regressions = []
+    for row in current:
+        key = (row['map'], row['engine'])
+        old = previous.get(key)
+        if old is None:
+            continue
+        label = f"{row['engine']} on {row['map']}"
+        for metric, higher_is_better in COMPARED_METRICS:
+            before, after = old[metric], row[metric]
+            if before <= 0:
+                continue
+            change = (after - before) / before
+            if (higher_is_better and change < -threshold) or \
+                    (not higher_is_better and change > threshold):
+                regressions.append(f"{label}: {metric} {before:.2f} -> {after:.2f} "
+                                   f"({change:+.1%})")
+        if old['found'] != row['found'] or not np.isclose(old['total_cost'], row['total_cost']):
+            regressions.append(f"{label}: cost {old['total_cost']} ({old['found']} found) -> "
+                               f"{row['total_cost']} ({row['found']} found)")
+    return regressions
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def print_table_header():
+    print(f"{'Map':<18} {'Engine':<17} {'Found':<7} {'ms/query':<10} "
+          f"{'Expanded/s':<12} {'Peak KB':<10} {'Cost':<8}")
+    print("-" * 86)
+
+
+def print_row(row: Dict):
+    print(f"{row['map']:<18} {row['engine']:<17} {row['found']}/{row['queries']:<5} "
+          f"{row['time_per_query_ms']:<10.3f} {row['expansions_per_s']:<12.0f} "
+          f"{row['peak_memory_kb']:<10.1f} {row['total_cost']:<8.0f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="RoboMind search benchmark suite")
+    parser.add_argument('--engines', help=f"Comma-separated engines (default: {', '.join(default_engines())}; "
+                                          f"opt-in: {', '.join(sorted(OPT_IN_ENGINES))})")
+    parser.add_argument('--sizes', help="Comma-separated generated map sizes")
+    parser.add_argument('--preset', choices=list(SIZE_PRESETS), default='quick',
+                        help="Size preset when --sizes is not given")
+    parser.add_argument('--density', type=float, help="Obstacle density of generated maps")
+    parser.add_argument('--seed', type=int, help="Seed for maps and queries")
+    parser.add_argument('--queries', type=int, help="Queries per map")
+    parser.add_argument('--repeats', type=int, help="Timed repeats per query")
+    parser.add_argument('--no-stored', action='store_true', help="Skip the maps in maps/")
+    parser.add_argument('--no-memory', action='store_true', help="Skip tracemalloc runs")
+    parser.add_argument('--landmark-cache', metavar='DIR', help=f"Directory for ALT landmark files (default {LANDMARK_CACHE})")
+    parser.add_argument('--save', help="Write results to this JSON baseline")
+    parser.add_argument('--compare', help="Baseline to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Allowed relative slowdown before flagging (default 0.1)")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    if baseline is not None:
+        config = baseline['config']
+    else:
+        sizes = [int(s) for s in args.sizes.split(',')] if args.sizes else SIZE_PRESETS[args.preset]
+        engines = args.engines.split(',') if args.engines else None
+        config = default_config(engines=engines, sizes=sizes, density=args.density,
+                                seed=args.seed, queries=args.queries, repeats=args.repeats,
+                                stored_maps=not args.no_stored, memory=not args.no_memory,
+                                landmark_cache=args.landmark_cache)
+
+    unknown = [name for name in config['engines'] if name not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engines: {', '.join(unknown)}")
+
+    print("=" * 86)
+    print("  Search Benchmark")
+    print("=" * 86)
+    print(f"Sizes: {config['sizes']} | Density: {config['density']} | "
+          f"Queries: {config['queries']} | Repeats: {config['repeats']}\n")
+    print_table_header()
+    results = run_suite(config)
+
+    if args.save:
+        save_baseline(args.save, config, results)
+
+    if baseline is not None:
+        regressions = compare(baseline['results'], results, args.threshold)
+        print(f"\nCompared with {args.compare} (threshold {args.threshold:.0%})")
+        if regressions:
+            print(f"{len(regressions)} regression(s):")
+            for message in regressions:
+                print(f"  ✗ {message}")
+            return 1
+        print("✓ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
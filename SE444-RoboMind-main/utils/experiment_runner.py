@@ -0,0 +1,306 @@
+"""
+Headless Experiment Runner - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+Runs many seeded episodes without a display, spread over a pool of worker
+processes, and streams one result row per episode to a CSV or JSONL file.
+
+    python main.py --experiment all --headless --episodes 1000 \\
+        --sizes 10,20 --densities 0.1,0.2 --workers 8 --output results.csv
+
+Every episode is fully described by its spec (agent, size, density, seed),
+so any row of the results can be reproduced on its own with run_episode().
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from environment import GridWorld
+
+
+AGENT_TYPES = ['search', 'logic', 'probability', 'hybrid']
+
+RESULT_FIELDS = ['episode', 'agent', 'size', 'density', 'seed',
+                 'success', 'path_length', 'expansions', 'steps', 'wall_time']
+
+# Do not exceed 25% obstacles overall (same cap as the interactive tests)
+MAX_DENSITY_CAP = 0.25
+
+# Upper bound on the episodes a worker runs per task; results of a chunk
+# are streamed together, so big chunks would delay them
+MAX_CHUNK = 16
+
+# Constructor parameters each agent type accepts through spec['params']
+AGENT_PARAMS = {
+    'search': [],
+    'logic': [],
+    'probability': ['initial_belief', 'sensor_accuracy'],
+    'hybrid': ['initial_belief', 'sensor_accuracy', 'replan_threshold'],
+}
+
+
+def make_episode_specs(agents: List[str], sizes: List[int], densities: List[float],
+                       episodes: int, base_seed: int = 0) -> List[Dict]:
+    """
+    Build the list of episodes to run.
+
+    Each (agent, size, density) combination gets `episodes` runs. Seeds
+    depend only on the map settings and the run index, so every agent type
+    is evaluated on the same set of maps.
+    """
+    specs = []
+    seed = base_seed
+    for size in sizes:
+        for density in densities:
+            for _ in range(episodes):
+                seed += 1
+                for agent in agents:
+                    specs.append({
+                        'episode': len(specs),
+                        'agent': agent,
+                        'size': size,
+                        'density': density,
+                        'seed': seed,
+                    })
+    return specs
+
+
+def build_world(size: int, density: float, seed: int) -> GridWorld:
+    """Create a seeded square world with random start, goal and obstacles."""
+    rng = np.random.default_rng(seed)
+    env = GridWorld(width=size, height=size)
+
+    env.start = (int(rng.integers(0, env.height)), int(rng.integers(0, env.width)))
+    env.goal = env.start
+    while env.goal == env.start:
+        env.goal = (int(rng.integers(0, env.height)), int(rng.integers(0, env.width)))
+    env.agent_pos = env.start
+
+    total_cells = env.width * env.height
+    num_obstacles = min(int(total_cells * density),
+                        int((total_cells - 2) * MAX_DENSITY_CAP))
+    env.add_random_obstacles(num_obstacles, rng=rng)
+    return env
+
+
+def _run_search(env) -> Dict:
+    from agents.search_agent import SearchAgent
+    agent = SearchAgent(env)
+    path, cost, expanded = agent.search('astar')
+    env.expanded = expanded
+    return {'success': path is not None,
+            'path_length': len(path) - 1 if path else 0,
+            'steps': 1}
+
+
+def _run_loop(env, agent, step, max_steps: int, stop_when_stuck: bool) -> Dict:
+    """Shared perceive/act loop of the interactive tests, without rendering."""
+    steps = 0
+    while steps < max_steps and not env.is_goal(env.agent_pos):
+        next_pos = step(agent)
+        if next_pos is None:
+            break
+        if next_pos == env.agent_pos:
+            if stop_when_stuck:
+                break
+            steps += 1
+            continue
+        env.visited.add(env.agent_pos)
+        env.path.append(next_pos)
+        env.agent_pos = next_pos
+        env.expanded += 1
+        steps += 1
+    return {'success': env.is_goal(env.agent_pos),
+            'path_length': len(env.path),
+            'steps': steps}
+
+
+def logic_step(agent):
+    """One perceive → reason → act cycle; returns the chosen cell."""
+    agent.perceive()
+    agent.reason()
+    return agent.act()
+
+
+def probability_step(agent):
+    """Sense the current cell, update beliefs and act; returns the chosen cell."""
+    env = agent.env
+    sensor_reading = (env.grid[env.agent_pos[0]][env.agent_pos[1]] == 1)
+    agent.update_beliefs(sensor_reading, env.agent_pos)
+    return agent.act()
+
+
+def run_episode(spec: Dict) -> Dict:
+    """
+    Run one headless episode.
+
+    Args:
+        spec: Dict with 'agent', 'size', 'density' and 'seed' (and 'episode');
+              an optional 'params' dict is passed to the agent constructor
+              (only the names in AGENT_PARAMS for that agent)
+
+    Returns:
+        The spec extended with success, path_length, expansions, steps and
+        wall_time (seconds)
+    """
+    env = build_world(spec['size'], spec['density'], spec['seed'])
+    np.random.seed(spec['seed'])  # agents that use the global state
+
+    start = time.perf_counter()
+    agent_type = spec['agent']
+    params = {name: value for name, value in (spec.get('params') or {}).items()
+              if name in AGENT_PARAMS.get(agent_type, [])}
+    if agent_type == 'search':
+        outcome = _run_search(env)
+    elif agent_type == 'logic':
+        from agents.logic_agent import LogicAgent
+        outcome = _run_loop(env, LogicAgent(env), logic_step,
+                            env.width * env.height, stop_when_stuck=False)
+    elif agent_type == 'probability':
+        from agents.probabilistic_agent import ProbabilisticAgent
+        outcome = _run_loop(env, ProbabilisticAgent(env, **params), probability_step,
+                            env.width * env.height * 2, stop_when_stuck=True)
+    elif agent_type == 'hybrid':
+        from agents.hybrid_agent import HybridAgent
+        outcome = _run_loop(env, HybridAgent(env, **params), logic_step,
+                            env.width * env.height * 2, stop_when_stuck=False)
+    else:
+        raise ValueError(f"Unknown agent type: {agent_type}")
+    wall_time = time.perf_counter() - start
+
+    result = dict(spec)
+    result.update(outcome)
+    result['success'] = bool(result['success'])
+    result['expansions'] = int(env.expanded)
+    result['wall_time'] = round(wall_time, 6)
+    return result
+
+
+class ResultWriter:
+    """Streams result rows to a .csv or .jsonl file as they arrive."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'w', newline='')
+        self.jsonl = path.endswith('.jsonl') or path.endswith('.json')
+        self.csv = None if self.jsonl else csv.DictWriter(self.file, fieldnames=RESULT_FIELDS)
+        if self.csv is not None:
+            self.csv.writeheader()
+
+    def write(self, result: Dict):
+        if self.jsonl:
+            self.file.write(json.dumps({k: result[k] for k in RESULT_FIELDS}) + '\n')
+        else:
+            self.csv.writerow({k: result[k] for k in RESULT_FIELDS})
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def run_experiments_parallel(specs: List[Dict], output: Optional[str] = None,
+                             workers: Optional[int] = None,
+                             progress_every: int = 100) -> List[Dict]:
+    """
+    Run episodes in a process pool, streaming each result to `output`.
+
+    Episodes are handed to workers in small chunks to keep scheduling
+    overhead low, so throughput scales with the number of cores. Rows are
+    written in completion order: a slow episode only holds back the few
+    episodes of its own chunk.
+
+    Args:
+        specs: Episodes from make_episode_specs()
+        output: Path of the .csv or .jsonl results file (None = no file)
+        workers: Number of worker processes (defaults to the CPU count)
+        progress_every: Print a progress line every this many episodes
+
+    Returns:
+        Per-group summaries (see summarize())
+    """
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, min(MAX_CHUNK, len(specs) // (workers * 8)))
+    chunks = iter([specs[i:i + chunksize] for i in range(0, len(specs), chunksize)])
+    writer = ResultWriter(output) if output else None
+    summary = {}
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # a bounded number of chunks in flight, refilled as they finish
+            pending = {pool.submit(run_episodes, chunk) for chunk in _take(chunks, workers * 4)}
+            done = 0
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for result in future.result():
+                        if writer is not None:
+                            writer.write(result)
+                        _accumulate(summary, result)
+                        done += 1
+                        if progress_every and done % progress_every == 0:
+                            print(f"  {done}/{len(specs)} episodes")
+                pending |= {pool.submit(run_episodes, chunk) for chunk in _take(chunks, len(finished))}
+    finally:
+        if writer is not None:
+            writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"Ran {len(specs)} episodes on {workers} workers in {elapsed:.1f}s "
+          f"({len(specs) / elapsed:.1f} episodes/s)")
+    return summarize(summary)
+
+
+def run_episodes(specs: List[Dict]) -> List[Dict]:
+    """Run a chunk of episodes in one worker call."""
+    return [run_episode(spec) for spec in specs]
+
+
+def _take(iterator, n: int) -> List:
+    return [chunk for _, chunk in zip(range(n), iterator)]
+
+
+def _accumulate(summary: Dict, result: Dict):
+    key = (result['agent'], result['size'], result['density'])
+    group = summary.setdefault(key, {'episodes': 0, 'successes': 0, 'path_length': 0,
+                                     'expansions': 0, 'wall_time': 0.0})
+    group['episodes'] += 1
+    group['successes'] += int(result['success'])
+    if result['success']:
+        group['path_length'] += result['path_length']
+    group['expansions'] += result['expansions']
+    group['wall_time'] += result['wall_time']
+
+
+def summarize(summary: Dict) -> List[Dict]:
+    """Turn accumulated totals into one row per (agent, size, density)."""
+    rows = []
+    for (agent, size, density), group in sorted(summary.items()):
+        episodes = group['episodes']
+        successes = group['successes']
+        rows.append({
+            'agent': agent,
+            'size': size,
+            'density': density,
+            'episodes': episodes,
+            'success_rate': successes / episodes,
+            'mean_path_length': group['path_length'] / successes if successes else 0.0,
+            'mean_expansions': group['expansions'] / episodes,
+            'mean_wall_time': group['wall_time'] / episodes,
+        })
+    return rows
+
+
+def print_summary(rows: Iterable[Dict]):
+    """Print the summary table."""
+    print(f"{'Agent':<12} {'Size':<6} {'Density':<8} {'Episodes':<9} {'Success':<8} "
+          f"{'Path':<8} {'Expanded':<10} {'Time (ms)':<10}")
+    print("-" * 75)
+    for row in rows:
+        print(f"{row['agent']:<12} {row['size']:<6} {row['density']:<8} {row['episodes']:<9} "
+              f"{row['success_rate']:<8.1%} {row['mean_path_length']:<8.1f} "
+              f"{row['mean_expansions']:<10.1f} {row['mean_wall_time'] * 1000:<10.2f}")
@@ -0,0 +1,414 @@
+"""
+Offscreen Frame Export - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+Builds episode frames as NumPy images straight from the grid, trail and
+belief arrays (no display, no per-cell draw calls) and writes them as an
+image sequence, an animated GIF or a video.
+
+Frames are palette indexed: every cell gets one palette index (cell type,
+trail, start/goal, or one of BELIEF_LEVELS shades of obstacle
+probability), the index map is scaled up to pixels in one broadcast, and
+grid lines and agents are stamped on top. RGB is only produced when a
+writer needs it (palette[indices]).
+
+    GIF       written here: the palette becomes the GIF color table and each
+              frame only stores the rectangle that changed
+    PNG       written here (indexed PNG via zlib): a '%05d' pattern or a directory
+    MP4 etc.  piped to ffmpeg as raw RGB when ffmpeg is on the PATH
+
+Usage:
+    python main.py --test-hybrid --record run.rmrec
+    python -m utils.frames run.rmrec run.gif --cell-size 8 --fps 10
+    python -m utils.frames run.rmrec frames/ --every 5
+
+    capture = FrameCapture(env)              # live episodes
+    with open_writer("run.gif", PALETTE) as writer:
+        ...each tick: writer.write(capture.capture())
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from environment import (WHITE, BLACK, GREEN, RED, BLUE, GRAY, YELLOW, ORANGE,
+                         FREE, OBSTACLE, START, GOAL, PATH as PATH_CELL, VISITED as VISITED_CELL,
+                         UNCERTAIN)
+
+
+# Marks of the trail (same precedence as GridWorld.render: visited over path)
+VISITED = 1
+PATH = 2
+
+# Palette indices
+FREE_COLOR, OBSTACLE_COLOR, START_COLOR, GOAL_COLOR = 0, 1, 2, 3
+VISITED_COLOR, PATH_COLOR, UNCERTAIN_COLOR, LINE_COLOR = 4, 5, 6, 7
+AGENT_COLOR, FLEET_COLOR = 8, 9
+BELIEF_BASE = 16
+BELIEF_LEVELS = 64
+
+PALETTE = np.zeros((256, 3), dtype=np.uint8)
+PALETTE[:10] = [WHITE, BLACK, GREEN, RED, (200, 230, 255), YELLOW, ORANGE, GRAY, BLUE, ORANGE]
+# free cells shaded by obstacle probability, as in GridWorld.render
+_p = np.linspace(0.0, 1.0, BELIEF_LEVELS)
+PALETTE[BELIEF_BASE:BELIEF_BASE + BELIEF_LEVELS] = np.stack(
+    [np.full_like(_p, 255), 255 - 80 * _p, 255 - 200 * _p], axis=1).astype(np.uint8)
+
+# Palette index of each cell type stored in the grid
+CELL_COLORS = np.full(256, FREE_COLOR, dtype=np.uint8)
+CELL_COLORS[[FREE, OBSTACLE, START, GOAL, PATH_CELL, VISITED_CELL, UNCERTAIN]] = [
+    FREE_COLOR, OBSTACLE_COLOR, START_COLOR, GOAL_COLOR, PATH_COLOR, VISITED_COLOR, UNCERTAIN_COLOR]
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.webm', '.avi', '.mov')
+
+
+class FrameRenderer:
+    """
+    Turns map state into palette-indexed frames of a fixed size.
+
+    Example:
+        >>> renderer = FrameRenderer(env.height, env.width, cell_size=8)
+        >>> indices = renderer.render(grid, marks, beliefs, position, start, goal)
+        >>> rgb = PALETTE[indices]
+    """
+
+    def __init__(self, height: int, width: int, cell_size: int = 8, grid_lines: bool = True):
+        self.height, self.width, self.cell_size = height, width, cell_size
+        self.shape = (height * cell_size, width * cell_size)
+        self.grid_lines = grid_lines and cell_size >= 4
+        # agent disk of radius cell_size / 3, as drawn by GridWorld.draw_agent
+        offsets = np.arange(cell_size) - (cell_size - 1) / 2
+        radius = max(cell_size / 3, 0.5)
+        self.disk = offsets[:, None] ** 2 + offsets[None, :] ** 2 <= radius ** 2
+
+    def cells(self, grid: np.ndarray, marks: Optional[np.ndarray] = None,
+              beliefs: Optional[np.ndarray] = None, start=None, goal=None,
+              goals: Iterable = ()) -> np.ndarray:
+        """(height, width) palette indices, one per cell."""
+        grid = np.asarray(grid)
+        codes = CELL_COLORS[grid.astype(np.uint8)]
+        if beliefs is not None:
+            free = codes == FREE_COLOR
+            levels = np.clip(np.asarray(beliefs) * (BELIEF_LEVELS - 1) + 0.5, 0, BELIEF_LEVELS - 1)
+            codes[free] = BELIEF_BASE + levels.astype(np.uint8)[free]
+        if marks is not None:
+            codes[(marks & PATH) != 0] = PATH_COLOR
+            codes[(marks & VISITED) != 0] = VISITED_COLOR
+        for row, col in goals:
+            codes[row, col] = GOAL_COLOR
+        if goal is not None:
+            codes[goal[0], goal[1]] = GOAL_COLOR
+        if start is not None:
+            codes[start[0], start[1]] = START_COLOR
+        return codes
+
+    def render(self, grid: np.ndarray, marks: Optional[np.ndarray] = None,
+               beliefs: Optional[np.ndarray] = None, position=None, start=None, goal=None,
+               goals: Iterable = (), agents: Iterable = ()) -> np.ndarray:
+        """
+        One frame as a (height * cell_size, width * cell_size) uint8 index image.
+
+        Args:
+            grid: Cell types (H, W)
+            marks: Trail marks (VISITED | PATH bits), or None
+            beliefs: Obstacle probabilities (H, W), or None
+            position: The agent's cell
+            start, goal, goals: Highlighted cells
+            agents: Cells of fleet robots (multi-agent worlds)
+        """
+        codes = self.cells(grid, marks, beliefs, start, goal, goals)
+        size = self.cell_size
+        # repeat (not broadcast_to) so the frame owns writable memory
+        frame = np.repeat(np.repeat(codes, size, axis=0), size, axis=1)
+        if self.grid_lines:
+            frame[::size] = LINE_COLOR
+            frame[size - 1::size] = LINE_COLOR
+            frame[:, ::size] = LINE_COLOR
+            frame[:, size - 1::size] = LINE_COLOR
+        for row, col in agents:
+            self._stamp(frame, row, col, FLEET_COLOR)
+        if position is not None:
+            self._stamp(frame, position[0], position[1], AGENT_COLOR)
+        return frame
+
+    def _stamp(self, frame: np.ndarray, row: int, col: int, color: int):
+        size = self.cell_size
+        frame[row * size:(row + 1) * size, col * size:(col + 1) * size][self.disk] = color
+
+
+class FrameCapture:
+    """
+    Frames of a live GridWorld episode, one per capture() call.
+
+    The trail is kept as a mark array updated from the agent's moves (like
+    the viewer does), so env.visited and env.path are never scanned.
+    """
+
+    def __init__(self, env, cell_size: int = 8, grid_lines: bool = True):
+        self.env = env
+        self.renderer = FrameRenderer(env.height, env.width, cell_size, grid_lines)
+        self.marks = np.zeros((env.height, env.width), dtype=np.uint8)
+        self.position = tuple(env.agent_pos)
+
+    def capture(self) -> np.ndarray:
+        """Index image of the current state."""
+        env = self.env
+        position = tuple(env.agent_pos)
+        if position != self.position:
+            self.marks[self.position] |= VISITED
+            self.marks[position] |= PATH
+            self.position = position
+        beliefs = env.beliefs.probabilities() if env.beliefs is not None else None
+        return self.renderer.render(env.grid, self.marks, beliefs, position, env.start,
+                                    env.goal, env.goals, env.agent_positions)
+
+
+def recording_frames(recording, cell_size: int = 8, grid_lines: bool = True,
+                     every: int = 1) -> Iterator[np.ndarray]:
+    """Index images of a recorded episode (utils/recording.py), every `every` ticks."""
+    renderer = FrameRenderer(recording.height, recording.width, cell_size, grid_lines)
+    marks = np.zeros((recording.height, recording.width), dtype=np.uint8)
+    position = recording.start
+    yield renderer.render(recording.grid, marks, recording.initial_beliefs, position,
+                          recording.start, recording.goal)
+    for state in recording.frames():
+        if state.position != position:
+            marks[position] |= VISITED
+            marks[state.position] |= PATH
+            position = state.position
+        if (state.tick + 1) % every == 0 or state.tick == recording.ticks - 1:
+            yield renderer.render(state.grid, marks, state.beliefs, position,
+                                  recording.start, recording.goal)
+
+
+# ============================================================================
+# Writers
+# ============================================================================
+
+class FrameWriter:
+    """Base class: write(indices) per frame, close() at the end."""
+
+    frames = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, indices: np.ndarray):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+
+def encode_png(indices: np.ndarray, palette: np.ndarray = PALETTE, level: int = 1) -> bytes:
+    """Indexed-color PNG of a palette index image."""
+    height, width = indices.shape
+    rows = np.zeros((height, width + 1), dtype=np.uint8)    # filter byte 0 per row
+    rows[:, 1:] = indices
+    colors = int(indices.max()) + 1
+    return (b'\x89PNG\r\n\x1a\n'
+            + _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0))
+            + _png_chunk(b'PLTE', palette[:colors].tobytes())
+            + _png_chunk(b'IDAT', zlib.compress(rows.tobytes(), level))
+            + _png_chunk(b'IEND', b''))
+
+
+class PngSequenceWriter(FrameWriter):
+    """frame_00000.png, frame_00001.png, ... in a directory, or a '%05d' pattern."""
+
+    def __init__(self, path: str, palette: np.ndarray = PALETTE, level: int = 1):
+        if '%' not in path:
+            os.makedirs(path, exist_ok=True)
+            path = os.path.join(path, 'frame_%05d.png')
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.pattern = path
+        self.palette = palette
+        self.level = level
+
+    def write(self, indices: np.ndarray):
+        with open(self.pattern % self.frames, 'wb') as f:
+            f.write(encode_png(indices, self.palette, self.level))
+        self.frames += 1
+
+
+# GIF image data without compression: every pixel is a 9-bit literal code,
+# with a clear code often enough that the decoder's table never grows past
+# 9-bit codes. Frames after the first only cover the changed rectangle, so
+# the files stay small even so.
+_GIF_CLEAR, _GIF_END = 256, 257
+_GIF_RUN = 250
+_GIF_BITS = np.arange(9, dtype=np.uint16)
+
+
+def _gif_image_data(pixels: np.ndarray) -> bytes:
+    flat = pixels.ravel().astype(np.uint16)
+    runs = -(-flat.size // _GIF_RUN)
+    # [clear, up to _GIF_RUN literals] for every run, then the end code
+    stream = np.empty(flat.size + runs + 1, dtype=np.uint16)
+    clears = np.arange(runs) * (_GIF_RUN + 1)
+    literal = np.ones(stream.size, dtype=bool)
+    literal[clears] = False
+    literal[-1] = False
+    stream[clears] = _GIF_CLEAR
+    stream[literal] = flat
+    stream[-1] = _GIF_END
+    bits = ((stream[:, None] >> _GIF_BITS) & 1).astype(np.uint8)
+    data = np.packbits(bits.ravel(), bitorder='little').tobytes()
+    blocks = [bytes([len(data[i:i + 255])]) + data[i:i + 255] for i in range(0, len(data), 255)]
+    return b'\x08' + b''.join(blocks) + b'\x00'
+
+
+class GifWriter(FrameWriter):
+    """Animated GIF; the 256-entry palette is the global color table."""
+
+    def __init__(self, path: str, palette: np.ndarray = PALETTE, fps: float = 10.0,
+                 loop: int = 0):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.palette = palette
+        self.delay = max(1, int(round(100 / fps)))    # hundredths of a second
+        self.loop = loop
+        self.previous = None
+
+    def write(self, indices: np.ndarray):
+        if self.previous is None:
+            height, width = indices.shape
+            self.file.write(b'GIF89a' + struct.pack('<HHBBB', width, height, 0xF7, 0, 0)
+                            + self.palette.tobytes()
+                            + b'\x21\xff\x0bNETSCAPE2.0\x03\x01'
+                            + struct.pack('<H', self.loop) + b'\x00')
+            top, left, bottom, right = 0, 0, height, width
+        else:
+            changed = indices != self.previous
+            rows, cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+            if rows.size:
+                top, bottom, left, right = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+            else:
+                top, bottom, left, right = 0, 1, 0, 1   # unchanged: one pixel keeps the timing
+        self.file.write(b'\x21\xf9\x04' + struct.pack('<BHBB', 0x04, self.delay, 0, 0)
+                        + b'\x2c' + struct.pack('<HHHHB', left, top, right - left, bottom - top, 0)
+                        + _gif_image_data(indices[top:bottom, left:right]))
+        self.previous = indices.copy()
+        self.frames += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.previous is None:
+            # no frame was written: a header-less file would not be a GIF
+            self.file.close()
+            os.remove(self.path)
+            return
+        self.file.write(b'\x3b')
+        self.file.close()
+
+
+class FfmpegWriter(FrameWriter):
+    """Video through an ffmpeg process fed raw RGB frames on stdin."""
+
+    def __init__(self, path: str, palette: np.ndarray = PALETTE, fps: float = 10.0,
+                 ffmpeg: Optional[str] = None):
+        self.path = path
+        self.palette = palette
+        self.fps = fps
+        self.ffmpeg = ffmpeg or shutil.which('ffmpeg')
+        if self.ffmpeg is None:
+            raise RuntimeError(f"writing {os.path.splitext(path)[1]} needs ffmpeg on the PATH; "
+                               "export a .gif or a PNG sequence instead")
+        self.process = None
+
+    def write(self, indices: np.ndarray):
+        if self.process is None:
+            height, width = indices.shape
+            # yuv420p (what most players expect) needs even dimensions
+            pad = f"pad={width + width % 2}:{height + height % 2}"
+            self.process = subprocess.Popen(
+                [self.ffmpeg, '-loglevel', 'error', '-y', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                 '-s', f'{width}x{height}', '-r', str(self.fps), '-i', '-',
+                 '-vf', pad, '-pix_fmt', 'yuv420p', self.path],
+                stdin=subprocess.PIPE)
+        self.process.stdin.write(self.palette[indices].tobytes())
+        self.frames += 1
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            if self.process.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed writing {self.path}")
+            self.process = None
+
+
+def open_writer(path: str, palette: np.ndarray = PALETTE, fps: float = 10.0) -> FrameWriter:
+    """
+    Writer for `path`, chosen by its form.
+
+    '.gif' -> GifWriter, video extensions -> FfmpegWriter, '.png' patterns
+    with '%' or anything else (a directory) -> PngSequenceWriter
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.gif':
+        return GifWriter(path, palette, fps)
+    if extension in VIDEO_EXTENSIONS:
+        return FfmpegWriter(path, palette, fps)
+    if extension == '.png' and '%' not in path:
+        raise ValueError("PNG sequences need a '%05d' style pattern or a directory")
+    return PngSequenceWriter(path, palette)
+
+
+def export_recording(recording, path: str, cell_size: int = 8, fps: float = 10.0,
+                     every: int = 1, grid_lines: bool = True) -> Tuple[int, float]:
+    """
+    Write a recorded episode as frames.
+
+    Returns:
+        (frames written, frames per second achieved)
+    """
+    start = time.perf_counter()
+    with open_writer(path, PALETTE, fps) as writer:
+        for indices in recording_frames(recording, cell_size, grid_lines, every):
+            writer.write(indices)
+    elapsed = time.perf_counter() - start
+    return writer.frames, writer.frames / elapsed if elapsed > 0 else float('inf')
+
+
+def main(argv=None) -> int:
+    from utils.recording import Recording
+
+    parser = argparse.ArgumentParser(description="Export a recorded episode as images or video")
+    parser.add_argument('recording', help="File written by EpisodeRecorder.save()")
+    parser.add_argument('output', help="out.gif, out.mp4 (needs ffmpeg), a directory or 'frames/%%05d.png'")
+    parser.add_argument('--cell-size', type=int, default=8, help="Pixels per cell (default 8)")
+    parser.add_argument('--fps', type=float, default=10.0, help="Playback speed of GIF/video")
+    parser.add_argument('--every', type=int, default=1, help="Keep every Nth tick")
+    parser.add_argument('--no-grid', action='store_true', help="Leave out the grid lines")
+    args = parser.parse_args(argv)
+
+    recording = Recording(args.recording)
+    try:
+        frames, rate = export_recording(recording, args.output, args.cell_size, args.fps,
+                                        max(1, args.every), not args.no_grid)
+    except (RuntimeError, ValueError) as error:
+        parser.error(str(error))
+    print(f"{frames} frames written to {args.output} ({rate:,.0f} frames/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+MovingAI Benchmark Runner - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+Runs the standard MovingAI grid benchmarks (https://movingai.com/benchmarks/)
+through the search_algorithms engines and checks every path cost against
+the optimal length recorded in the scenario file.
+
+    .map   - loaded with GridWorld.load_movingai_map() (8-connected, octile)
+    .scen  - "version 1" header, then one tab-separated line per query:
+             bucket  map  width  height  start_x  start_y  goal_x  goal_y  optimal_length
+
+Scenario files are read lazily and results are written one row at a time,
+so suites with thousands of queries per map run in constant memory.
+
+Usage:
+    python -m utils.movingai maps/movingai/rooms16.map.scen
+    python -m utils.movingai path/to/*.scen --engines astar_octile --output results.jsonl
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from environment import GridWorld
+from ai_core.search_algorithms import bfs, ucs, astar
+
+
+# name -> (engine, whether it is cost-optimal on 8-connected maps)
+# BFS minimizes the number of moves, not the octile cost, so its costs are
+# reported but not checked against the optimal lengths.
+ENGINES: Dict[str, tuple] = {
+    'bfs': (bfs, False),
+    'ucs': (ucs, True),
+    'astar_octile': (lambda env, start, goal: astar(env, start, goal, 'octile'), True),
+    'astar_euclidean': (lambda env, start, goal: astar(env, start, goal, 'euclidean'), True),
+    'astar_alt': (lambda env, start, goal: astar(env, start, goal, 'alt'), True),
+}
+
+# Optimal lengths are stored with 8 decimals
+COST_TOLERANCE = 1e-4
+
+
+class Scenario(NamedTuple):
+    """One query of a .scen file, with positions as (row, col)."""
+    bucket: int
+    map: str
+    width: int
+    height: int
+    start: tuple
+    goal: tuple
+    optimal: float
+
+
+def iter_scenarios(scen_file: str, buckets: Optional[set] = None) -> Iterator[Scenario]:
+    """
+    Read a .scen file one line at a time.
+
+    Args:
+        scen_file: Path of the scenario file
+        buckets: Only yield these buckets (None = all)
+    """
+    with open(scen_file) as f:
+        for line in f:
+            fields = line.split('\t')
+            if len(fields) < 9:
+                continue  # "version 1" header and blank lines
+            bucket = int(fields[0])
+            if buckets is not None and bucket not in buckets:
+                continue
+            start_x, start_y, goal_x, goal_y = (int(v) for v in fields[4:8])
+            yield Scenario(bucket, fields[1], int(fields[2]), int(fields[3]),
+                           (start_y, start_x), (goal_y, goal_x), float(fields[8]))
+
+
+def resolve_map(scen_file: str, map_name: str) -> str:
+    """Find a scenario's map: next to the .scen file, or in a sibling maps/ folder."""
+    base = os.path.dirname(os.path.abspath(scen_file))
+    candidates = [os.path.join(base, map_name),
+                  os.path.join(base, os.path.basename(map_name)),
+                  os.path.join(base, '..', 'maps', os.path.basename(map_name))]
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"Map {map_name} for {scen_file} not found")
+
+
+def path_cost(env, path: List) -> float:
+    """Octile cost of a path, recomputed from its moves."""
+    return sum(env.get_cost(a, b) for a, b in zip(path, path[1:]))
+
+
+def run_scenarios(scen_file: str, engines: List[str], buckets: Optional[set] = None,
+                  output=None, tolerance: float = COST_TOLERANCE) -> Dict:
+    """
+    Run every scenario of one .scen file through the given engines.
+
+    Args:
+        scen_file: Path of the scenario file
+        engines: Names from ENGINES
+        buckets: Only run these buckets (None = all)
+        output: Open text file; one JSON line per query is written to it
+        tolerance: Allowed difference from the optimal length
+
+    Returns:
+        Totals per (engine, bucket): queries, solved, mismatches,
+        expanded and time
+    """
+    maps = {}
+    totals = {}
+    for scenario in iter_scenarios(scen_file, buckets):
+        env = maps.get(scenario.map)
+        if env is None:
+            env = GridWorld()
+            env.load_movingai_map(resolve_map(scen_file, scenario.map))
+            if (env.width, env.height) != (scenario.width, scenario.height):
+                raise ValueError(f"{scenario.map} is {env.width}x{env.height}, "
+                                 f"scenario expects {scenario.width}x{scenario.height}")
+            maps = {scenario.map: env}  # .scen files are grouped by map
+
+        for name in engines:
+            engine, optimal = ENGINES[name]
+            start = time.perf_counter()
+            path, _, expanded = engine(env, scenario.start, scenario.goal)
+            elapsed = time.perf_counter() - start
+
+            cost = path_cost(env, path) if path is not None else float('inf')
+            correct = path is not None and abs(cost - scenario.optimal) <= tolerance
+            group = totals.setdefault((name, scenario.bucket), {
+                'queries': 0, 'solved': 0, 'mismatches': 0, 'expanded': 0, 'time': 0.0})
+            group['queries'] += 1
+            group['solved'] += path is not None
+            group['mismatches'] += optimal and not correct
+            group['expanded'] += expanded
+            group['time'] += elapsed
+
+            if output is not None:
+                output.write(json.dumps({
+                    'scen': os.path.basename(scen_file), 'bucket': scenario.bucket,
+                    'engine': name, 'start': scenario.start, 'goal': scenario.goal,
+                    'optimal': scenario.optimal,
+                    'cost': cost if path is not None else None,
+                    'correct': correct, 'expanded': expanded,
+                    'time_ms': round(elapsed * 1000, 4),
+                }) + '\n')
+    return totals
+
+
+def print_totals(scen_file: str, totals: Dict):
+    """Print per-engine, per-bucket results of one scenario file."""
+    print(f"\n{os.path.basename(scen_file)}")
+    print(f"{'Engine':<17} {'Bucket':<7} {'Queries':<8} {'Mismatch':<9} "
+          f"{'Expanded':<10} {'ms/query':<9}")
+    print("-" * 64)
+    for (name, bucket), group in sorted(totals.items()):
+        mismatches = group['mismatches'] if ENGINES[name][1] else '-'
+        print(f"{name:<17} {bucket:<7} {group['queries']:<8} {mismatches:<9} "
+              f"{group['expanded'] / group['queries']:<10.1f} "
+              f"{1000 * group['time'] / group['queries']:<9.3f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run MovingAI scenario files")
+    parser.add_argument('scenarios', nargs='+', help=".scen files")
+    parser.add_argument('--engines', default='ucs,astar_octile',
+                        help=f"Comma-separated engines from {', '.join(ENGINES)}")
+    parser.add_argument('--buckets', help="Comma-separated buckets to run (default: all)")
+    parser.add_argument('--output', help="Write one JSON line per query to this file")
+    args = parser.parse_args(argv)
+
+    engines = args.engines.split(',')
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engines: {', '.join(unknown)}")
+    buckets = {int(b) for b in args.buckets.split(',')} if args.buckets else None
+
+    mismatches = 0
+    with contextlib.ExitStack() as stack:
+        output = stack.enter_context(open(args.output, 'w')) if args.output else None
+        for scen_file in args.scenarios:
+            totals = run_scenarios(scen_file, engines, buckets, output)
+            print_totals(scen_file, totals)
+            mismatches += sum(group['mismatches'] for group in totals.values())
+
+    if mismatches:
+        print(f"\n✗ {mismatches} path cost(s) differ from the optimal lengths")
+        return 1
+    print("\n✓ All path costs match the optimal lengths")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
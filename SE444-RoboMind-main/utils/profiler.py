@@ -0,0 +1,222 @@
+"""
+Step Profiler - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+Times the phases of the perceive → reason → act loop (perceive, reason,
+act, belief updates, KB inference, search and rendering) per tick.
+
+Methods are instrumented by wrapping them on the instance, so nothing is
+wrapped - and nothing costs extra - unless a profiler is attached:
+
+    profiler = StepProfiler()
+    profile_agent(profiler, agent, env)
+    while ...:
+        agent.perceive(); agent.reason(); agent.act(); env.render()
+        profiler.tick()
+    profiler.print_report()
+    profiler.export_json("profile.json")
+
+Calls are often nested (act() runs a search, ask() runs infer()), so every
+phase reports both its total time and its self time, which excludes the
+time spent in other instrumented phases it called.
+"""
+
+import functools
+import json
+import time
+from array import array
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+PERCENTILES = (50, 95, 99)
+
+# Histogram bucket upper bounds in microseconds (powers of two up to ~67 s)
+HISTOGRAM_BOUNDS_US = [2 ** i for i in range(27)]
+
+
+class PhaseStats:
+    """Durations (seconds) of every call to one phase."""
+
+    def __init__(self):
+        self.total = array('d')
+        self.self_time = array('d')
+
+    def record(self, total: float, self_time: float):
+        self.total.append(total)
+        self.self_time.append(self_time)
+
+    def summary(self, ticks: int) -> Dict:
+        """Count, totals, percentiles and histogram of this phase."""
+        durations = np.frombuffer(self.total, dtype=np.float64) if len(self.total) else np.zeros(0)
+        own = np.frombuffer(self.self_time, dtype=np.float64) if len(self.self_time) else np.zeros(0)
+        result = {
+            'calls': int(durations.size),
+            'calls_per_tick': durations.size / ticks if ticks else 0.0,
+            'total_ms': float(durations.sum() * 1000),
+            'self_ms': float(own.sum() * 1000),
+            'mean_us': float(durations.mean() * 1e6) if durations.size else 0.0,
+        }
+        for p in PERCENTILES:
+            value = np.percentile(durations, p) * 1e6 if durations.size else 0.0
+            result[f'p{p}_us'] = float(value)
+        result['max_us'] = float(durations.max() * 1e6) if durations.size else 0.0
+        counts = np.bincount(np.searchsorted(HISTOGRAM_BOUNDS_US, durations * 1e6),
+                             minlength=len(HISTOGRAM_BOUNDS_US) + 1)
+        result['histogram_us'] = {f"<={bound}": int(count)
+                                  for bound, count in zip(HISTOGRAM_BOUNDS_US, counts) if count}
+        if counts[-1]:
+            result['histogram_us'][f">{HISTOGRAM_BOUNDS_US[-1]}"] = int(counts[-1])
+        return result
+
+
+class StepProfiler:
+    """
+    Per-phase timer for agent loops.
+
+    Attributes:
+        phases: phase name -> PhaseStats
+        ticks: Number of completed ticks
+        enabled: When False, instrumented methods skip all timing
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.enabled = True
+        self.phases: Dict[str, PhaseStats] = {}
+        self.tick_times = PhaseStats()
+        self.ticks = 0
+        self._stack: List[float] = []   # child time accumulated per open call
+        self._tick_start = None
+        self._wrapped = []               # (obj, method name) for uninstrument()
+
+    def instrument(self, obj, method: str, phase: Optional[str] = None) -> bool:
+        """
+        Time every call of obj.method under the given phase name.
+
+        Args:
+            obj: Any object (agent, KB, belief store, environment)
+            method: Name of the method to wrap
+            phase: Phase name in the report (defaults to the method name)
+
+        Returns:
+            True if the method exists and was wrapped
+        """
+        original = getattr(obj, method, None)
+        if original is None or not callable(original):
+            return False
+        if getattr(original, '_profiled_by', None) is self:
+            return True
+        stats = self.phases.setdefault(phase or method, PhaseStats())
+        profiler = self
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            if not profiler.enabled:
+                return original(*args, **kwargs)
+            stack = profiler._stack
+            stack.append(0.0)
+            start = profiler.clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = profiler.clock() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                stats.record(elapsed, elapsed - children)
+
+        timed._profiled_by = self
+        setattr(obj, method, timed)
+        self._wrapped.append((obj, method))
+        return True
+
+    def uninstrument(self):
+        """Restore every wrapped method."""
+        for obj, method in self._wrapped:
+            if method in vars(obj):
+                delattr(obj, method)
+        self._wrapped.clear()
+
+    def tick(self):
+        """Mark the end of one loop iteration."""
+        now = self.clock()
+        if self._tick_start is not None and self.enabled:
+            elapsed = now - self._tick_start
+            self.tick_times.record(elapsed, elapsed)
+            self.ticks += 1
+        self._tick_start = now
+
+    def start(self):
+        """Start timing the first tick (otherwise the first tick() does)."""
+        self._tick_start = self.clock()
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def report(self) -> Dict:
+        """Summary of all phases and of whole ticks."""
+        return {
+            'ticks': self.ticks,
+            'tick': self.tick_times.summary(self.ticks),
+            'phases': {name: stats.summary(self.ticks)
+                       for name, stats in self.phases.items() if len(stats.total)},
+        }
+
+    def export_json(self, path: str):
+        """Write report() to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def print_report(self):
+        """Print the per-phase breakdown, heaviest self time first."""
+        report = self.report()
+        tick_ms = report['tick']['total_ms']
+        print("\n" + "-" * 84)
+        print(f"PROFILE: {report['ticks']} ticks, {tick_ms:.1f} ms "
+              f"(p50 {report['tick']['p50_us'] / 1000:.2f} ms/tick)")
+        print("-" * 84)
+        print(f"{'Phase':<16} {'Calls':<7} {'Self ms':<9} {'Self %':<7} {'Total ms':<10} "
+              f"{'p50 us':<9} {'p95 us':<9} {'p99 us':<9}")
+        print("-" * 84)
+        phases = sorted(report['phases'].items(), key=lambda item: -item[1]['self_ms'])
+        for name, phase in phases:
+            share = phase['self_ms'] / tick_ms if tick_ms else 0.0
+            print(f"{name:<16} {phase['calls']:<7} {phase['self_ms']:<9.2f} {share:<7.1%} "
+                  f"{phase['total_ms']:<10.2f} {phase['p50_us']:<9.1f} "
+                  f"{phase['p95_us']:<9.1f} {phase['p99_us']:<9.1f}")
+        print("-" * 84)
+
+
+def profile_agent(profiler: StepProfiler, agent, env=None) -> List[str]:
+    """
+    Instrument the standard phases of an agent and its components.
+
+    Wraps perceive/reason/act/update_beliefs on the agent, search on the
+    agent or its search sub-agent, plan on its path planner, infer on its
+    knowledge base, observe on its belief store and render on the
+    environment - whichever exist.
+
+    Returns:
+        The phase names that were instrumented
+    """
+    targets = [(agent, name, name) for name in ('perceive', 'reason', 'act', 'update_beliefs')]
+    targets.append((agent, 'search', 'search'))
+    search_agent = getattr(agent, 'search_agent', None)
+    if search_agent is not None:
+        targets.append((search_agent, 'search', 'search'))
+    path_planner = getattr(agent, 'path_planner', None)
+    if path_planner is not None:
+        targets.append((path_planner, 'plan', 'search'))
+    kb = getattr(agent, 'kb', None)
+    if kb is not None:
+        targets.append((kb, 'infer', 'kb_infer'))
+    beliefs = getattr(agent, 'beliefs', None)
+    if beliefs is not None and not isinstance(beliefs, dict):
+        targets.append((beliefs, 'observe', 'belief_update'))
+    if env is not None:
+        targets.append((env, 'render', 'render'))
+
+    return [phase for obj, method, phase in targets if profiler.instrument(obj, method, phase)]
@@ -0,0 +1,375 @@
+"""
+Episode Recording and Replay - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+Records an episode to a compact binary file and replays it without
+running the agents.
+
+File layout (little endian, every section aligned to 8 bytes):
+
+    header          magic, version, map size, tick and record counts, start, goal
+    grid            uint8  (H, W)    map at the start of the episode
+    beliefs         float32 (H, W)   initial obstacle probabilities (optional)
+    positions       int16  (T, 2)    agent (row, col) after each tick
+    actions         uint8  (T,)      move taken on each tick (see ACTIONS)
+    cell_offsets    uint32 (T + 1,)  tick t changed cells[cell_offsets[t]:cell_offsets[t + 1]]
+    cells           int16  (C, 3)    (row, col, new cell type)
+    belief_offsets  uint32 (T + 1,)  same indexing for the belief deltas
+    belief_index    uint32 (B,)      flat cell index of each belief change
+    belief_value    float32 (B,)     new probability of that cell
+
+Every section is a fixed-size packed array, so Recording maps the file
+with np.memmap and any tick can be read without loading the rest.
+
+Usage:
+    recorder = EpisodeRecorder(env)          # snapshot map and beliefs
+    ...each tick, after the agent moved:
+    recorder.record_tick()
+    recorder.save("episode.rmrec")
+
+    python -m utils.recording info episode.rmrec
+    python -m utils.recording analyze episode.rmrec
+    python -m utils.recording play episode.rmrec --fps 10
+    python -m utils.frames episode.rmrec episode.gif     # offscreen export (utils/frames.py)
+"""
+
+import argparse
+import struct
+import sys
+import time
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+MAGIC = b'RMREC001'
+HEADER = struct.Struct('<8sHHHxxIIIhhhhB3x')  # 40 bytes
+ALIGN = 8
+
+# Action codes: index of the (drow, dcol) move
+ACTIONS = [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1),
+           (-1, -1), (-1, 1), (1, -1), (1, 1)]
+ACTION_NAMES = ['stay', 'up', 'down', 'left', 'right',
+                'up-left', 'up-right', 'down-left', 'down-right']
+JUMP = 255  # position changed by more than one cell (e.g. a reset)
+_ACTION_CODES = {move: code for code, move in enumerate(ACTIONS)}
+
+
+def _padded(size: int) -> int:
+    return (size + ALIGN - 1) // ALIGN * ALIGN
+
+
+class EpisodeRecorder:
+    """
+    Collects one episode tick by tick in packed arrays.
+
+    Grid changes are captured through env.add_listener(); belief changes
+    are found by comparing the belief map with its previous snapshot.
+    """
+
+    def __init__(self, env, beliefs=None):
+        """
+        Args:
+            env: The GridWorld being recorded
+            beliefs: Belief store to record (defaults to env.beliefs)
+        """
+        if max(env.height, env.width) > np.iinfo(np.int16).max:
+            raise ValueError("maps larger than 32767 cells per side cannot be recorded")
+        self.env = env
+        self.beliefs = beliefs if beliefs is not None else env.beliefs
+        self.grid = np.asarray(env.grid, dtype=np.uint8).copy()
+        self.start = tuple(env.start)
+        self.goal = tuple(env.goal)
+        self.last_position = tuple(env.agent_pos)
+
+        self.initial_beliefs = None
+        self._belief_snapshot = None
+        if self.beliefs is not None:
+            self._belief_snapshot = np.array(self.beliefs.probabilities(), dtype=np.float32)
+            self.initial_beliefs = self._belief_snapshot.copy()
+
+        self.positions = array('h')
+        self.actions = array('B')
+        self.cells = array('h')
+        self.cell_offsets = array('I', [0])
+        self.belief_index = array('I')
+        self.belief_value = array('f')
+        self.belief_offsets = array('I', [0])
+
+        env.add_listener(self.on_cell_changed)
+
+    @property
+    def ticks(self) -> int:
+        return len(self.actions)
+
+    def on_cell_changed(self, row: int, col: int, cell_type: int):
+        self.cells.extend((row, col, cell_type))
+
+    def record_tick(self, position: Optional[Tuple[int, int]] = None):
+        """
+        Close the current tick.
+
+        Args:
+            position: Agent position after the tick (defaults to env.agent_pos)
+        """
+        position = tuple(position if position is not None else self.env.agent_pos)
+        move = (position[0] - self.last_position[0], position[1] - self.last_position[1])
+        self.actions.append(_ACTION_CODES.get(move, JUMP))
+        self.positions.extend(position)
+        self.last_position = position
+        self.cell_offsets.append(len(self.cells) // 3)
+
+        if self.beliefs is not None:
+            current = self.beliefs.probabilities()
+            changed = np.flatnonzero(current != self._belief_snapshot)
+            if changed.size:
+                values = current.ravel()[changed].astype(np.float32)
+                self._belief_snapshot.ravel()[changed] = values
+                self.belief_index.extend(changed.astype(np.uint32).tolist())
+                self.belief_value.extend(values.tolist())
+        self.belief_offsets.append(len(self.belief_index))
+
+    def close(self):
+        """Stop listening to the environment."""
+        self.env.remove_listener(self.on_cell_changed)
+
+    def save(self, path: str):
+        """Write the episode to `path` and stop recording."""
+        self.close()
+        height, width = self.grid.shape
+        has_beliefs = self.initial_beliefs is not None
+        sections = [
+            self.grid.tobytes(),
+            self.initial_beliefs.tobytes() if has_beliefs else b'',
+            self.positions.tobytes(),
+            self.actions.tobytes(),
+            self.cell_offsets.tobytes(),
+            self.cells.tobytes(),
+            self.belief_offsets.tobytes(),
+            self.belief_index.tobytes(),
+            self.belief_value.tobytes(),
+        ]
+        header = HEADER.pack(MAGIC, 1, height, width, self.ticks,
+                             len(self.cells) // 3, len(self.belief_index),
+                             self.start[0], self.start[1], self.goal[0], self.goal[1],
+                             int(has_beliefs))
+        with open(path, 'wb') as f:
+            f.write(header)
+            for data in sections:
+                f.write(data)
+                f.write(b'\0' * (_padded(len(data)) - len(data)))
+
+
+class Recording:
+    """
+    Memory-mapped view of a recorded episode.
+
+    Attributes are read-only NumPy views into the file; nothing is loaded
+    until it is indexed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            fields = HEADER.unpack(f.read(HEADER.size))
+        magic, _, height, width, ticks, n_cells, n_beliefs, sr, sc, gr, gc, has_beliefs = fields
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an episode recording")
+        self.height, self.width, self.ticks = height, width, ticks
+        self.start, self.goal = (sr, sc), (gr, gc)
+
+        layout = [
+            ('grid', np.uint8, (height, width)),
+            ('initial_beliefs', np.float32, (height, width) if has_beliefs else (0,)),
+            ('positions', np.int16, (ticks, 2)),
+            ('actions', np.uint8, (ticks,)),
+            ('cell_offsets', np.uint32, (ticks + 1,)),
+            ('cells', np.int16, (n_cells, 3)),
+            ('belief_offsets', np.uint32, (ticks + 1,)),
+            ('belief_index', np.uint32, (n_beliefs,)),
+            ('belief_value', np.float32, (n_beliefs,)),
+        ]
+        offset = HEADER.size
+        for name, dtype, shape in layout:
+            count = int(np.prod(shape))
+            if count:
+                view = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+            else:
+                view = np.zeros(shape, dtype=dtype)
+            setattr(self, name, view)
+            offset += _padded(count * np.dtype(dtype).itemsize)
+        if not has_beliefs:
+            self.initial_beliefs = None
+
+    def cell_changes(self, tick: int) -> np.ndarray:
+        """(row, col, type) rows for the cells that changed on `tick`."""
+        return self.cells[self.cell_offsets[tick]:self.cell_offsets[tick + 1]]
+
+    def belief_delta(self, tick: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(flat indices, new probabilities) of the beliefs updated on `tick`."""
+        lo, hi = self.belief_offsets[tick], self.belief_offsets[tick + 1]
+        return self.belief_index[lo:hi], self.belief_value[lo:hi]
+
+    def grid_at(self, tick: int) -> np.ndarray:
+        """Map after `tick` (random access)."""
+        grid = np.array(self.grid)
+        changes = self.cells[:self.cell_offsets[tick + 1]]
+        if len(changes):
+            index, values = _last_writes(changes[:, 0].astype(np.intp) * self.width + changes[:, 1],
+                                         changes[:, 2])
+            grid.ravel()[index] = values
+        return grid
+
+    def beliefs_at(self, tick: int) -> Optional[np.ndarray]:
+        """Obstacle probabilities after `tick` (random access)."""
+        if self.initial_beliefs is None:
+            return None
+        beliefs = np.array(self.initial_beliefs)
+        hi = self.belief_offsets[tick + 1]
+        if hi:
+            index, values = _last_writes(self.belief_index[:hi], self.belief_value[:hi])
+            beliefs.ravel()[index] = values
+        return beliefs
+
+    def frames(self) -> Iterator["ReplayState"]:
+        """Replay every tick in order, updating one state in place."""
+        state = ReplayState(self)
+        for tick in range(self.ticks):
+            state.advance(tick)
+            yield state
+
+
+def _last_writes(index: np.ndarray, values: np.ndarray):
+    """Keep only the last value written to each index."""
+    reversed_index = np.asarray(index)[::-1]
+    unique, first = np.unique(reversed_index, return_index=True)
+    return unique, np.asarray(values)[::-1][first]
+
+
+class ReplayState:
+    """
+    Map, beliefs and agent state at one tick of a replay.
+
+    Exposes probabilities() so it can be used as env.beliefs for rendering.
+    """
+
+    def __init__(self, recording: Recording):
+        self.recording = recording
+        self.tick = -1
+        self.grid = np.array(recording.grid, dtype=int)
+        self.beliefs = (np.array(recording.initial_beliefs)
+                        if recording.initial_beliefs is not None else None)
+        self.position = recording.start
+
+    def advance(self, tick: int):
+        """Apply the changes recorded for `tick` (must be the next tick)."""
+        rec = self.recording
+        for row, col, cell_type in rec.cell_changes(tick):
+            self.grid[row, col] = cell_type
+        if self.beliefs is not None:
+            index, values = rec.belief_delta(tick)
+            self.beliefs.ravel()[index] = values
+        self.position = (int(rec.positions[tick, 0]), int(rec.positions[tick, 1]))
+        self.tick = tick
+
+    def probabilities(self) -> np.ndarray:
+        return self.beliefs
+
+
+def analyze(recording: Recording) -> Dict:
+    """
+    Summary statistics of an episode, computed from the recording alone.
+    """
+    positions = np.asarray(recording.positions)
+    actions = np.asarray(recording.actions)
+    moved = actions != 0
+    visited = np.vstack([np.array([recording.start]), positions])
+    flat = visited[:, 0].astype(np.int64) * recording.width + visited[:, 1]
+    unique_cells = np.unique(flat).size
+    reached = bool(recording.ticks) and tuple(positions[-1]) == recording.goal
+
+    stats = {
+        'ticks': recording.ticks,
+        'moves': int(moved.sum()),
+        'idle_ticks': int((~moved).sum()),
+        'unique_cells': int(unique_cells),
+        'revisits': int(moved.sum() - (unique_cells - 1)),
+        'reached_goal': reached,
+        'cell_changes': int(len(recording.cells)),
+        'belief_updates': int(len(recording.belief_index)),
+        'actions': {ACTION_NAMES[code] if code < len(ACTION_NAMES) else 'jump': int(count)
+                    for code, count in zip(*np.unique(actions, return_counts=True))},
+    }
+    if recording.initial_beliefs is not None and recording.ticks:
+        final = recording.beliefs_at(recording.ticks - 1)
+        stats['mean_belief_start'] = float(np.mean(recording.initial_beliefs))
+        stats['mean_belief_end'] = float(final.mean())
+    return stats
+
+
+def replay(recording: Recording, env=None, fps: float = 0.0) -> float:
+    """
+    Replay a recording, optionally drawing it with a GridWorld.
+
+    Args:
+        recording: The episode
+        env: GridWorld with an initialized display (None = headless)
+        fps: Frames per second when rendering (0 = as fast as possible)
+
+    Returns:
+        Ticks per second achieved
+    """
+    start = time.perf_counter()
+    if env is not None:
+        env.start, env.goal = recording.start, recording.goal
+        env.path, env.visited = [], set()
+    for state in recording.frames():
+        if env is None:
+            continue
+        if not env.handle_events():
+            break
+        env.grid = state.grid
+        env.beliefs = state if state.beliefs is not None else None
+        if state.position != env.agent_pos:
+            env.visited.add(env.agent_pos)
+            env.path.append(state.position)
+        env.agent_pos = state.position
+        env.render()
+        if fps > 0:
+            time.sleep(1.0 / fps)
+    elapsed = time.perf_counter() - start
+    return recording.ticks / elapsed if elapsed > 0 else float('inf')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and replay episode recordings")
+    parser.add_argument('command', choices=['info', 'analyze', 'play'])
+    parser.add_argument('recording', help="File written by EpisodeRecorder.save()")
+    parser.add_argument('--fps', type=float, default=10.0, help="Playback speed for 'play'")
+    args = parser.parse_args(argv)
+
+    recording = Recording(args.recording)
+    if args.command == 'info':
+        print(f"{args.recording}: {recording.width}x{recording.height} map, "
+              f"{recording.ticks} ticks, {len(recording.cells)} cell changes, "
+              f"{len(recording.belief_index)} belief updates")
+        print(f"Start: {recording.start} | Goal: {recording.goal}")
+    elif args.command == 'analyze':
+        stats = analyze(recording)
+        rate = replay(recording)
+        for key, value in stats.items():
+            print(f"{key:<18} {value}")
+        print(f"{'replay_speed':<18} {rate:,.0f} ticks/s")
+    else:
+        from environment import GridWorld
+        env = GridWorld(width=recording.width, height=recording.height)
+        env.grid = np.array(recording.grid, dtype=int)
+        env.init_display()
+        replay(recording, env, args.fps)
+        env.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Simulation Client - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+Client library for utils/sim_server.py. Keeps a local mirror of every
+session it follows by applying the streamed deltas and snapshots.
+
+    async with await SimClient.connect(unix_path="/tmp/robomind.sock") as client:
+        session = await client.start(agent="hybrid", size=20, seed=3)
+        await client.run(session.id, rate=0)
+        async for state in client.updates(session.id):
+            print(state.tick, state.pos)
+            if state.done:
+                break
+"""
+
+import asyncio
+import itertools
+import json
+from typing import Dict, Optional
+
+import numpy as np
+
+# Longest message line accepted; snapshots of big maps exceed asyncio's 64 KiB default
+LINE_LIMIT = 64 * 1024 * 1024
+
+
+class SessionState:
+    """Local mirror of a server session."""
+
+    def __init__(self, message: Dict):
+        self.id = message['session']
+        # Latest-value signal: set when the mirror changes, cleared by the
+        # reader, so a slow consumer skips to the newest state instead of
+        # queueing one entry per message
+        self.changed = asyncio.Event()
+        self.apply_snapshot(message)
+
+    def apply_snapshot(self, message: Dict):
+        self.agent = message.get('agent')
+        self.width, self.height = message['width'], message['height']
+        self.grid = (np.frombuffer(message['grid'].encode(), dtype=np.uint8) - ord('0')) \
+            .astype(np.int8).reshape(self.height, self.width)
+        self.start = tuple(message['start'])
+        self.goal = tuple(message['goal'])
+        self.beliefs = (np.array(message['beliefs'], dtype=np.float32).reshape(self.height, self.width)
+                        if 'beliefs' in message else None)
+        self._update(message)
+
+    def apply_delta(self, message: Dict):
+        for row, col, cell_type in message['cells']:
+            self.grid[row, col] = cell_type
+        if self.beliefs is not None and message.get('belief_index'):
+            self.beliefs.ravel()[message['belief_index']] = message['belief_value']
+        self._update(message)
+
+    def _update(self, message: Dict):
+        self.tick = message['tick']
+        self.pos = tuple(message['pos'])
+        self.done = message['done']
+        self.reached = message['reached']
+
+
+class SimClient:
+    """Asyncio client for the RoboMind simulation server."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.sessions: Dict[int, SessionState] = {}
+        self.snapshots = 0          # snapshots received because deltas were dropped
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._reader_task = asyncio.create_task(self._read())
+
+    @classmethod
+    async def connect(cls, unix_path: Optional[str] = None,
+                      host: str = '127.0.0.1', port: int = 8765) -> "SimClient":
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path, limit=LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        self._reader_task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    async def request(self, cmd: str, **fields) -> Dict:
+        """Send a command and wait for its reply; raises RuntimeError on errors."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message = dict(fields, cmd=cmd, id=request_id)
+        self.writer.write((json.dumps(message) + '\n').encode())
+        await self.writer.drain()
+        reply = await future
+        if reply.get('type') == 'error':
+            raise RuntimeError(reply['error'])
+        return reply
+
+    async def start(self, agent: str = 'hybrid', size: int = 10, density: float = 0.15,
+                    seed: int = 0, kb: str = 'set') -> SessionState:
+        reply = await self.request('start', agent=agent, size=size, density=density,
+                                   seed=seed, kb=kb)
+        return self.sessions[reply['session']]
+
+    async def step(self, session: int, n: int = 1) -> Dict:
+        return await self.request('step', session=session, n=n)
+
+    async def run(self, session: int, rate: float = 0.0) -> Dict:
+        return await self.request('run', session=session, rate=rate)
+
+    async def pause(self, session: int) -> Dict:
+        return await self.request('pause', session=session)
+
+    async def add_obstacle(self, session: int, row: int, col: int) -> Dict:
+        return await self.request('obstacle', session=session, row=row, col=col)
+
+    async def subscribe(self, session: int) -> SessionState:
+        await self.request('subscribe', session=session)
+        return self.sessions[session]
+
+    async def stop(self, session: int) -> Dict:
+        reply = await self.request('stop', session=session)
+        self.sessions.pop(session, None)
+        return reply
+
+    async def list_sessions(self):
+        return (await self.request('list'))['sessions']
+
+    async def updates(self, session: int):
+        """
+        Yield the session mirror whenever it changed.
+
+        Deltas and snapshots that arrive while the consumer is busy are
+        already applied to the mirror, so they are coalesced into one yield.
+        """
+        state = self.sessions[session]
+        while True:
+            await state.changed.wait()
+            state.changed.clear()
+            yield state
+
+    # ------------------------------------------------------------------
+    # Incoming messages
+    # ------------------------------------------------------------------
+
+    async def _read(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                self._handle(json.loads(line))
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("connection closed"))
+
+    def _handle(self, message: Dict):
+        kind = message.get('type')
+        session_id = message.get('session')
+        if kind in ('started', 'snapshot'):
+            state = self.sessions.get(session_id)
+            if state is None:
+                state = self.sessions[session_id] = SessionState(message)
+            else:
+                state.apply_snapshot(message)
+            if kind == 'snapshot':
+                if 'id' not in message:     # pushed, not the reply to subscribe()
+                    self.snapshots += 1
+                state.changed.set()
+        elif kind == 'tick':
+            state = self.sessions.get(session_id)
+            if state is not None:
+                state.apply_delta(message)
+                state.changed.set()
+        future = self._pending.pop(message.get('id'), None)
+        if future is not None and not future.done():
+            future.set_result(message)
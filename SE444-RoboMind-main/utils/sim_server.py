@@ -0,0 +1,410 @@
+"""
+Simulation Server - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+An asyncio server that hosts many GridWorld + agent sessions and streams
+compact state deltas to connected clients (dashboards, controllers in
+other processes). It listens on a Unix socket or on localhost TCP.
+
+Protocol: one JSON object per line in both directions.
+
+Client → server (an optional "id" is echoed in the reply):
+    {"cmd": "start", "agent": "hybrid", "size": 10, "density": 0.15, "seed": 1}
+    {"cmd": "step", "session": 1, "n": 5}       # n is capped at MAX_STEP_BATCH
+    {"cmd": "run", "session": 1, "rate": 20}      # ticks/s, 0 = as fast as possible
+    {"cmd": "pause", "session": 1}
+    {"cmd": "obstacle", "session": 1, "row": 3, "col": 4}
+    {"cmd": "subscribe", "session": 1}
+    {"cmd": "stop", "session": 1}
+    {"cmd": "list"}
+
+Server → client:
+    {"type": "started", "session": 1, "width": .., "height": .., "grid": "0010..", ...}
+    {"type": "tick", "session": 1, "tick": 7, "pos": [r, c], "cells": [[r, c, type]],
+     "belief_index": [...], "belief_value": [...], "done": false, "reached": false}
+    {"type": "snapshot", ...}   # full state, replaces deltas a slow client missed
+    {"type": "ok" | "error", "id": ..., ...}
+
+Sessions belong to the connection that started them and are stopped
+when it closes; other connections may subscribe to them meanwhile.
+
+Backpressure: every client has a bounded outbound buffer. The simulation
+never waits for a client; when a client's buffer is full its pending
+deltas for that session are dropped and replaced by a single snapshot,
+which is built from the latest state when it is actually sent.
+
+Usage:
+    python -m utils.sim_server --unix /tmp/robomind.sock
+    python -m utils.sim_server --port 8765
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+from collections import deque
+from typing import Dict, Optional, Set
+
+import numpy as np
+
+from utils.experiment_runner import build_world, logic_step, probability_step
+
+
+AGENT_TYPES = ['logic', 'probability', 'hybrid', 'search']
+
+# Outbound messages buffered per client before deltas are coalesced
+CLIENT_BUFFER = 256
+
+# Belief values are sent with this many decimals
+BELIEF_DECIMALS = 4
+
+# Largest "n" of one step request, and how many of its ticks run before
+# the event loop gets a turn (other sessions and clients keep going)
+MAX_STEP_BATCH = 100_000
+STEP_YIELD_EVERY = 32
+
+
+def _encode(message: Dict) -> bytes:
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode()
+
+
+class Session:
+    """One GridWorld with its agent, stepped on demand or free-running."""
+
+    def __init__(self, session_id: int, agent_type: str, size: int, density: float,
+                 seed: int, kb: str = 'set', owner: Optional["ClientChannel"] = None):
+        self.id = session_id
+        self.owner = owner
+        self.agent_type = agent_type
+        self.env = build_world(size, density, seed)
+        self.agent, self.step_agent = self._make_agent(agent_type, kb)
+        self.tick = 0
+        self.max_ticks = self.env.width * self.env.height * 2
+        self.done = False
+        self.subscribers: Set["ClientChannel"] = set()
+        self.runner: Optional[asyncio.Task] = None
+
+        # Delta tracking
+        self._cells = []
+        self.env.add_listener(lambda row, col, cell_type: self._cells.append([row, col, cell_type]))
+        self._beliefs = self._probabilities().copy() if self.env.beliefs is not None else None
+
+    def _make_agent(self, agent_type: str, kb: str):
+        env = self.env
+        if agent_type == 'logic':
+            from agents.logic_agent import LogicAgent
+            agent = LogicAgent(env, self._kb(kb))
+            return agent, logic_step
+        if agent_type == 'probability':
+            from agents.probabilistic_agent import ProbabilisticAgent
+            agent = ProbabilisticAgent(env)
+            return agent, probability_step
+        if agent_type == 'hybrid':
+            from agents.hybrid_agent import HybridAgent
+            agent = HybridAgent(env, self._kb(kb))
+            return agent, logic_step
+        if agent_type == 'search':
+            from agents.search_agent import SearchAgent
+            agent = SearchAgent(env)
+            agent.search('astar', start=env.agent_pos)
+            return agent, self._follow_path
+        raise ValueError(f"Unknown agent type: {agent_type}")
+
+    def _kb(self, backend: str):
+        if backend == 'grid':
+            from ai_core.grid_knowledge_base import GridKnowledgeBase
+            return GridKnowledgeBase(self.env.height, self.env.width)
+        from ai_core.knowledge_base import KnowledgeBase
+        return KnowledgeBase()
+
+    @staticmethod
+    def _follow_path(agent):
+        """Search agent: advance one cell along the planned path."""
+        path = agent.path or []
+        if agent.env.agent_pos in path:
+            index = path.index(agent.env.agent_pos)
+            if index + 1 < len(path) and agent.env.is_valid(path[index + 1]):
+                return path[index + 1]
+        agent.search('astar', start=agent.env.agent_pos)  # blocked or off the path
+        return agent.path[1] if agent.path and len(agent.path) > 1 else None
+
+    def close(self):
+        """Detach the agent from the world (the runner is cancelled by the server)."""
+        close = getattr(self.agent, 'close', None)
+        if close is not None:
+            close()
+        self.subscribers.clear()
+
+    def _probabilities(self) -> np.ndarray:
+        return np.asarray(self.env.beliefs.probabilities(), dtype=np.float32)
+
+    def step(self) -> Dict:
+        """Advance one tick and return its delta message."""
+        env = self.env
+        if not self.done:
+            next_pos = self.step_agent(self.agent)
+            if next_pos is not None and next_pos != env.agent_pos and env.is_valid(next_pos):
+                env.visited.add(env.agent_pos)
+                env.path.append(next_pos)
+                env.agent_pos = next_pos
+                env.expanded += 1
+            self.tick += 1
+            if env.is_goal(env.agent_pos) or self.tick >= self.max_ticks or next_pos is None:
+                self.done = True
+
+        message = {'type': 'tick', 'session': self.id, 'tick': self.tick,
+                   'pos': list(env.agent_pos), 'cells': self._cells,
+                   'done': self.done, 'reached': env.is_goal(env.agent_pos)}
+        self._cells = []
+        if self._beliefs is not None:
+            current = self._probabilities()
+            changed = np.flatnonzero(current != self._beliefs)
+            self._beliefs.ravel()[changed] = current.ravel()[changed]
+            message['belief_index'] = changed.tolist()
+            message['belief_value'] = np.round(current.ravel()[changed], BELIEF_DECIMALS).tolist()
+        return message
+
+    def snapshot(self, kind: str = 'snapshot') -> Dict:
+        """Full state of the session."""
+        env = self.env
+        message = {'type': kind, 'session': self.id, 'agent': self.agent_type,
+                   'tick': self.tick, 'width': env.width, 'height': env.height,
+                   'grid': ''.join(map(str, np.asarray(env.grid).ravel().tolist())),
+                   'start': list(env.start), 'goal': list(env.goal),
+                   'pos': list(env.agent_pos), 'done': self.done,
+                   'reached': env.is_goal(env.agent_pos)}
+        if self._beliefs is not None:
+            message['beliefs'] = np.round(self._beliefs.ravel(), BELIEF_DECIMALS).tolist()
+        return message
+
+    def publish(self, message: Dict):
+        for channel in list(self.subscribers):
+            channel.send_delta(self, message)
+
+
+class ClientChannel:
+    """
+    Outbound side of one client connection.
+
+    Messages wait in a bounded deque drained by a writer task. Tick deltas
+    that do not fit are not queued: the session is marked stale and one
+    snapshot is sent in their place, so a slow client skips ahead instead
+    of slowing the simulation down.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, limit: int = CLIENT_BUFFER):
+        self.writer = writer
+        self.limit = limit
+        self.queue = deque()
+        self.stale: Dict[int, Session] = {}   # sessions waiting for a snapshot
+        self.ready = asyncio.Event()
+        self.dropped = 0
+        self.closed = False
+
+    def send(self, message: Dict):
+        """Queue a reply or control message (never dropped)."""
+        self.queue.append(message)
+        self.ready.set()
+
+    def send_delta(self, session: Session, message: Dict):
+        """Queue a tick delta, coalescing into a snapshot when full."""
+        if session.id in self.stale:
+            self.dropped += 1
+            return
+        if len(self.queue) >= self.limit:
+            self.dropped += 1
+            self.stale[session.id] = session
+            # drop the older deltas of that session too; the snapshot covers them
+            kept = [m for m in self.queue
+                    if not (m.get('type') == 'tick' and m.get('session') == session.id)]
+            self.dropped += len(self.queue) - len(kept)
+            self.queue = deque(kept)
+            self.queue.append({'type': '_snapshot', 'session': session.id})
+        else:
+            self.queue.append(message)
+        self.ready.set()
+
+    async def run(self):
+        """Write queued messages until the connection closes."""
+        try:
+            while not self.closed:
+                await self.ready.wait()
+                self.ready.clear()
+                while self.queue:
+                    message = self.queue.popleft()
+                    if message.get('type') == '_snapshot':
+                        session = self.stale.pop(message['session'], None)
+                        if session is None:
+                            continue
+                        message = session.snapshot()
+                    self.writer.write(_encode(message))
+                    await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+
+class SimulationServer:
+    """Hosts sessions and serves client connections."""
+
+    def __init__(self, client_buffer: int = CLIENT_BUFFER):
+        self.sessions: Dict[int, Session] = {}
+        self.client_buffer = client_buffer
+        self._ids = itertools.count(1)
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.channels: Set[ClientChannel] = set()
+
+    async def start(self, unix_path: Optional[str] = None,
+                    host: str = '127.0.0.1', port: int = 0):
+        """Start listening; returns the asyncio server."""
+        if unix_path:
+            self.server = await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        for session in self.sessions.values():
+            if session.runner is not None:
+                session.runner.cancel()
+        for channel in list(self.channels):
+            channel.writer.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        channel = ClientChannel(writer, self.client_buffer)
+        self.channels.add(channel)
+        writer_task = asyncio.create_task(channel.run())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = {}
+                try:
+                    request = json.loads(line)
+                    reply = await self.dispatch(request, channel)
+                except Exception as e:  # report bad requests, keep serving
+                    reply = {'type': 'error', 'error': f"{type(e).__name__}: {e}"}
+                if 'id' in request:
+                    reply['id'] = request['id']
+                channel.send(reply)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            channel.closed = True
+            self.channels.discard(channel)
+            for session in list(self.sessions.values()):
+                session.subscribers.discard(channel)
+                if session.owner is channel:
+                    await self._drop_session(session)
+            channel.ready.set()
+            writer_task.cancel()
+            writer.close()
+
+    def _session(self, request: Dict) -> Session:
+        session = self.sessions.get(request.get('session'))
+        if session is None:
+            raise KeyError(f"Unknown session: {request.get('session')}")
+        return session
+
+    async def dispatch(self, request: Dict, channel: ClientChannel) -> Dict:
+        """Execute one client request and return the reply."""
+        command = request.get('cmd')
+        if command == 'start':
+            agent_type = request.get('agent', 'hybrid')
+            if agent_type not in AGENT_TYPES:
+                raise ValueError(f"Unknown agent type: {agent_type}")
+            session = Session(next(self._ids), agent_type, int(request.get('size', 10)),
+                              float(request.get('density', 0.15)), int(request.get('seed', 0)),
+                              request.get('kb', 'set'), owner=channel)
+            self.sessions[session.id] = session
+            session.subscribers.add(channel)
+            return session.snapshot('started')
+
+        if command == 'list':
+            return {'type': 'ok', 'sessions': [
+                {'session': s.id, 'agent': s.agent_type, 'tick': s.tick, 'done': s.done,
+                 'running': s.runner is not None} for s in self.sessions.values()]}
+
+        session = self._session(request)
+        if command == 'step':
+            n = min(int(request.get('n', 1)), MAX_STEP_BATCH)
+            for tick in range(1, n + 1):
+                session.publish(session.step())
+                if session.done:
+                    break
+                if tick % STEP_YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+            return {'type': 'ok', 'session': session.id, 'tick': session.tick, 'done': session.done}
+        if command == 'run':
+            if session.runner is None:
+                session.runner = asyncio.create_task(
+                    self._free_run(session, float(request.get('rate', 0))))
+            return {'type': 'ok', 'session': session.id, 'running': True}
+        if command == 'pause':
+            await self._stop_runner(session)
+            return {'type': 'ok', 'session': session.id, 'tick': session.tick}
+        if command == 'obstacle':
+            session.env.add_obstacle(int(request['row']), int(request['col']))
+            return {'type': 'ok', 'session': session.id}
+        if command == 'subscribe':
+            session.subscribers.add(channel)
+            return session.snapshot()
+        if command == 'stop':
+            await self._drop_session(session)
+            return {'type': 'ok', 'session': session.id, 'stopped': True}
+        raise ValueError(f"Unknown command: {command}")
+
+    async def _drop_session(self, session: Session):
+        await self._stop_runner(session)
+        self.sessions.pop(session.id, None)
+        session.close()
+
+    async def _stop_runner(self, session: Session):
+        if session.runner is not None:
+            session.runner.cancel()
+            try:
+                await session.runner
+            except asyncio.CancelledError:
+                pass
+            session.runner = None
+
+    async def _free_run(self, session: Session, rate: float):
+        """Step a session until it is done, yielding to other sessions every tick."""
+        delay = 1.0 / rate if rate > 0 else 0.0
+        try:
+            while not session.done:
+                session.publish(session.step())
+                await asyncio.sleep(delay)
+        finally:
+            session.runner = None
+
+
+async def serve(unix_path: Optional[str] = None, host: str = '127.0.0.1', port: int = 8765):
+    server = SimulationServer()
+    await server.start(unix_path, host, port)
+    print(f"RoboMind simulation server listening on {unix_path or f'{host}:{port}'}")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RoboMind asyncio simulation server")
+    parser.add_argument('--unix', help="Unix socket path (default: TCP)")
+    parser.add_argument('--host', default='127.0.0.1', help="TCP host (localhost only by default)")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.unix, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
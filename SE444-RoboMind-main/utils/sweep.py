@@ -0,0 +1,461 @@
+"""
+Parameter Sweep - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+Tunes agent and world parameters on headless episodes run by a pool of
+worker processes (see utils/experiment_runner.py), then prints a ranked
+results table.
+
+Sweepable parameters:
+    size, density                              - the random world
+    initial_belief, sensor_accuracy            - probability and hybrid agents
+    replan_threshold                           - hybrid agent
+
+Methods:
+    grid      every combination of the given values
+    random    --samples configurations drawn from the given values/ranges
+    halving   successive halving: evaluate all configurations on a small
+              budget, keep the best 1/eta, multiply the budget by eta, repeat
+
+Configurations are evaluated in rounds on the same seeds, so every one of
+them sees the same maps. After each round a configuration is stopped early
+when even the optimistic end of its success-rate confidence interval
+(Hoeffding bound) is below the pessimistic end of the best one.
+
+Usage:
+    python -m utils.sweep --agent hybrid --param sensor_accuracy=0.7,0.8,0.9 \\
+        --param initial_belief=0.2,0.35,0.5 --episodes 200 --workers 8
+    python -m utils.sweep --agent probability --method random --samples 30 \\
+        --param sensor_accuracy=0.6:0.99 --param density=0.1:0.25 --output sweep.csv
+    python -m utils.sweep --agent hybrid --method halving --samples 27 --eta 3 \\
+        --param replan_threshold=0.2:0.8 --param initial_belief=0.1:0.6
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.experiment_runner import AGENT_PARAMS, AGENT_TYPES, run_episode
+
+
+# World settings; every other swept name is an agent constructor parameter
+WORLD_PARAMS = {'size': 10, 'density': 0.18}
+
+# Per-agent defaults of the interactive tests in main.py
+AGENT_DENSITY = {'probability': 0.15}
+
+# Parameters whose values must lie strictly between the two bounds
+OPEN_BOUNDS = {'initial_belief': (0.0, 1.0)}
+
+SWEEP_FIELDS = ['rank', 'config', 'status', 'episodes', 'success_rate',
+                'success_low', 'success_high', 'mean_path_length',
+                'mean_expansions', 'mean_wall_time']
+
+# A value list ([0.1, 0.2]) or an inclusive (low, high) range
+Space = Dict[str, Union[List, Tuple]]
+
+
+# ============================================================================
+# Search spaces
+# ============================================================================
+
+def _number(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_param(text: str) -> Tuple[str, Union[List, Tuple]]:
+    """
+    Parse one --param option.
+
+    'name=v1,v2,v3' gives a list of values, 'name=low:high' a range.
+    """
+    name, sep, values = text.partition('=')
+    if not sep or not name or not values:
+        raise ValueError(f"expected name=v1,v2 or name=low:high, got {text!r}")
+    if ':' in values:
+        low, high = (_number(v) for v in values.split(':', 1))
+        if low > high:
+            raise ValueError(f"empty range for {name}: {values}")
+        return name, (low, high)
+    return name, [_number(v) for v in values.split(',')]
+
+
+def grid_configs(space: Space, points: int = 5) -> List[Dict]:
+    """Every combination of the values; ranges become `points` evenly spaced values."""
+    names = sorted(space)
+    axes = []
+    for name in names:
+        values = space[name]
+        if isinstance(values, tuple):
+            low, high = values
+            if isinstance(low, int) and isinstance(high, int):
+                values = sorted(set(int(round(v)) for v in np.linspace(low, high, points)))
+            else:
+                values = [round(float(v), 4) for v in np.linspace(low, high, points)]
+        axes.append(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*axes)]
+
+
+def random_configs(space: Space, n: int, seed: int = 0) -> List[Dict]:
+    """n configurations; list values are sampled uniformly, ranges uniformly within bounds."""
+    rng = np.random.default_rng(seed)
+    names = sorted(space)
+    configs = []
+    for _ in range(n):
+        config = {}
+        for name in names:
+            values = space[name]
+            if isinstance(values, list):
+                config[name] = values[int(rng.integers(len(values)))]
+            elif isinstance(values[0], int) and isinstance(values[1], int):
+                config[name] = int(rng.integers(values[0], values[1] + 1))
+            else:
+                config[name] = round(float(rng.uniform(values[0], values[1])), 4)
+        configs.append(config)
+    return configs
+
+
+def config_label(config: Dict) -> str:
+    return ' '.join(f"{name}={value}" for name, value in sorted(config.items())) or '(defaults)'
+
+
+# ============================================================================
+# Evaluation
+# ============================================================================
+
+class ConfigResult:
+    """Running totals of one configuration."""
+
+    def __init__(self, index: int, config: Dict):
+        self.index = index
+        self.config = config
+        self.status = 'running'     # running -> done | stopped | pruned
+        self.episodes = 0
+        self.successes = 0
+        self.path_length = 0
+        self.expansions = 0
+        self.wall_time = 0.0
+
+    def add(self, result: Dict):
+        self.episodes += 1
+        self.successes += int(result['success'])
+        if result['success']:
+            self.path_length += result['path_length']
+        self.expansions += result['expansions']
+        self.wall_time += result['wall_time']
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.episodes if self.episodes else 0.0
+
+    @property
+    def mean_path_length(self) -> float:
+        return self.path_length / self.successes if self.successes else 0.0
+
+    def bounds(self, delta: float) -> Tuple[float, float]:
+        """Hoeffding confidence interval of the success rate at level 1 - delta."""
+        if not self.episodes:
+            return 0.0, 1.0
+        radius = math.sqrt(math.log(2 / delta) / (2 * self.episodes))
+        rate = self.success_rate
+        return max(0.0, rate - radius), min(1.0, rate + radius)
+
+    def sort_key(self):
+        """Higher success first, then shorter paths, then faster episodes."""
+        return (-self.success_rate,
+                self.mean_path_length if self.successes else math.inf,
+                self.wall_time / self.episodes if self.episodes else math.inf)
+
+    def row(self, rank: int, delta: float) -> Dict:
+        low, high = self.bounds(delta)
+        episodes = max(self.episodes, 1)
+        return {
+            'rank': rank,
+            'config': config_label(self.config),
+            'status': self.status,
+            'episodes': self.episodes,
+            'success_rate': self.success_rate,
+            'success_low': round(low, 4),
+            'success_high': round(high, 4),
+            'mean_path_length': self.mean_path_length,
+            'mean_expansions': self.expansions / episodes,
+            'mean_wall_time': self.wall_time / episodes,
+        }
+
+
+class Sweep:
+    """
+    Evaluates configurations of one agent type on a shared worker pool.
+
+    Example:
+        >>> with Sweep('hybrid', workers=4) as sweep:
+        ...     rows = sweep.run(grid_configs({'sensor_accuracy': [0.8, 0.9]}), episodes=100)
+    """
+
+    def __init__(self, agent: str, workers: Optional[int] = None, base_seed: int = 0,
+                 batch: int = 20, delta: float = 0.05, early_stop: bool = True):
+        """
+        Args:
+            agent: One of AGENT_TYPES
+            workers: Worker processes (defaults to the CPU count)
+            base_seed: Episode i of every configuration uses seed base_seed + i
+            batch: Episodes per configuration and round
+            delta: Confidence level (1 - delta) of the early-stopping bounds
+            early_stop: Stop configurations that cannot be the best any more
+        """
+        if agent not in AGENT_TYPES:
+            raise ValueError(f"Unknown agent type: {agent}")
+        self.agent = agent
+        self.workers = workers or os.cpu_count() or 1
+        self.base_seed = base_seed
+        self.batch = batch
+        self.delta = delta
+        self.early_stop = early_stop
+        self.pool = None
+        self.episodes_run = 0
+
+    def __enter__(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc):
+        self.pool.shutdown()
+        self.pool = None
+
+    def check(self, config: Dict):
+        """Raise ValueError for names this agent type cannot take or values out of bounds."""
+        allowed = set(WORLD_PARAMS) | set(AGENT_PARAMS[self.agent])
+        unknown = sorted(set(config) - allowed)
+        if unknown:
+            raise ValueError(f"{self.agent} agent has no parameter(s) {', '.join(unknown)} "
+                             f"(sweepable: {', '.join(sorted(allowed))})")
+        for name, (low, high) in OPEN_BOUNDS.items():
+            if name in config and not low < config[name] < high:
+                raise ValueError(f"{name} must lie strictly between {low:g} and {high:g}, "
+                                 f"got {config[name]:g}")
+
+    def _spec(self, result: ConfigResult, episode: int) -> Dict:
+        config = result.config
+        params = {name: value for name, value in config.items() if name not in WORLD_PARAMS}
+        return {
+            'episode': episode,
+            'agent': self.agent,
+            'size': int(config.get('size', WORLD_PARAMS['size'])),
+            'density': float(config.get('density', AGENT_DENSITY.get(self.agent,
+                                                                     WORLD_PARAMS['density']))),
+            'seed': self.base_seed + episode + 1,
+            'params': params,
+            'config': result.index,
+        }
+
+    def evaluate(self, results: List[ConfigResult], target: int):
+        """Run every configuration in `results` up to `target` episodes."""
+        specs = [self._spec(result, episode)
+                 for result in results
+                 for episode in range(result.episodes, target)]
+        if not specs:
+            return
+        by_index = {result.index: result for result in results}
+        chunksize = max(1, len(specs) // (self.workers * 4))
+        for outcome in self.pool.map(run_episode, specs, chunksize=chunksize):
+            by_index[outcome['config']].add(outcome)
+        self.episodes_run += len(specs)
+
+    def stop_hopeless(self, results: List[ConfigResult]) -> int:
+        """Stop running configurations whose best case is worse than the leader's worst case."""
+        if not self.early_stop:
+            return 0
+        running = [result for result in results if result.status == 'running']
+        if len(running) < 2:
+            return 0
+        best_low = max(result.bounds(self.delta)[0] for result in running)
+        stopped = 0
+        for result in running:
+            if result.bounds(self.delta)[1] < best_low:
+                result.status = 'stopped'
+                stopped += 1
+        return stopped
+
+    def run(self, configs: List[Dict], episodes: int) -> List[Dict]:
+        """
+        Evaluate configurations for up to `episodes` episodes each.
+
+        Returns:
+            Ranked result rows (see SWEEP_FIELDS)
+        """
+        results = self._results(configs)
+        target = 0
+        while target < episodes:
+            running = [result for result in results if result.status == 'running']
+            if not running:
+                break
+            target = min(episodes, target + self.batch)
+            self.evaluate(running, target)
+            stopped = self.stop_hopeless(results)
+            self._progress(results, target, stopped)
+        for result in results:
+            if result.status == 'running':
+                result.status = 'done'
+        return self.rank(results)
+
+    def halving(self, configs: List[Dict], min_episodes: int, max_episodes: int,
+                eta: int = 3) -> List[Dict]:
+        """
+        Successive halving.
+
+        Every surviving configuration is evaluated on the current budget
+        (starting at min_episodes); then only the best 1/eta survive and the
+        budget grows by a factor of eta, until one configuration is left
+        or the budget reaches max_episodes.
+        """
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        results = self._results(configs)
+        budget = max(1, min_episodes)
+        while True:
+            running = [result for result in results if result.status == 'running']
+            target = 0
+            while target < budget:
+                target = min(budget, target + self.batch)
+                self.evaluate(running, target)
+                self.stop_hopeless(results)
+                running = [result for result in running if result.status == 'running']
+            running.sort(key=ConfigResult.sort_key)
+            keep = max(1, len(running) // eta)
+            for result in running[keep:]:
+                result.status = 'pruned'
+            self._progress(results, budget, len(running) - keep)
+            if keep == 1 or budget >= max_episodes:
+                break
+            budget = min(max_episodes, budget * eta)
+        for result in results:
+            if result.status == 'running':
+                result.status = 'done'
+        return self.rank(results)
+
+    def rank(self, results: List[ConfigResult]) -> List[Dict]:
+        """Rows ordered by how far each configuration got, then by its scores."""
+        order = sorted(results, key=lambda r: (-r.episodes, r.status != 'done', r.sort_key()))
+        return [result.row(rank, self.delta) for rank, result in enumerate(order, 1)]
+
+    def _results(self, configs: List[Dict]) -> List[ConfigResult]:
+        for config in configs:
+            self.check(config)
+        return [ConfigResult(index, config) for index, config in enumerate(configs)]
+
+    def _progress(self, results: List[ConfigResult], target: int, dropped: int):
+        running = sum(result.status == 'running' for result in results)
+        print(f"  {target} episodes/config: {running} running, {dropped} dropped, "
+              f"{self.episodes_run} episodes run")
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+def print_ranking(rows: List[Dict], limit: Optional[int] = None):
+    """Print the ranked results table."""
+    width = max([len(row['config']) for row in rows] + [6])
+    print(f"{'Rank':<5} {'Config':<{width}} {'Status':<8} {'Episodes':<9} {'Success':<8} "
+          f"{'Success CI':<14} {'Path':<8} {'Expanded':<10} {'Time (ms)':<10}")
+    print("-" * (80 + width))
+    for row in rows[:limit]:
+        interval = f"{row['success_low']:.2f}-{row['success_high']:.2f}"
+        print(f"{row['rank']:<5} {row['config']:<{width}} {row['status']:<8} {row['episodes']:<9} "
+              f"{row['success_rate']:<8.1%} {interval:<14} {row['mean_path_length']:<8.1f} "
+              f"{row['mean_expansions']:<10.1f} {row['mean_wall_time'] * 1000:<10.2f}")
+
+
+def save_ranking(path: str, rows: List[Dict]):
+    """Write the ranked rows to a .csv or .jsonl file."""
+    with open(path, 'w', newline='') as f:
+        if path.endswith('.jsonl') or path.endswith('.json'):
+            for row in rows:
+                f.write(json.dumps({k: row[k] for k in SWEEP_FIELDS}) + '\n')
+        else:
+            writer = csv.DictWriter(f, fieldnames=SWEEP_FIELDS)
+            writer.writeheader()
+            writer.writerows({k: row[k] for k in SWEEP_FIELDS} for row in rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="RoboMind parameter sweep")
+    parser.add_argument('--agent', choices=AGENT_TYPES, default='hybrid',
+                        help="Agent type to tune (default hybrid)")
+    parser.add_argument('--method', choices=['grid', 'random', 'halving'], default='grid',
+                        help="Search method (default grid)")
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUES',
+                        help="Swept parameter: name=v1,v2,... or name=low:high (repeatable)")
+    parser.add_argument('--episodes', type=int, default=100,
+                        help="Episodes per configuration (maximum budget for halving)")
+    parser.add_argument('--min-episodes', type=int, default=10,
+                        help="First-round budget of successive halving (default 10)")
+    parser.add_argument('--samples', type=int, default=20,
+                        help="Configurations drawn by random/halving (default 20)")
+    parser.add_argument('--points', type=int, default=5,
+                        help="Values per range in a grid sweep (default 5)")
+    parser.add_argument('--eta', type=int, default=3, help="Halving rate (default 3)")
+    parser.add_argument('--batch', type=int, default=20,
+                        help="Episodes per configuration between early-stopping checks")
+    parser.add_argument('--delta', type=float, default=0.05,
+                        help="Early stopping confidence is 1 - delta (default 0.05)")
+    parser.add_argument('--no-early-stop', action='store_true', help="Evaluate every configuration fully")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=0, help="Base seed of maps and sampling")
+    parser.add_argument('--top', type=int, help="Print only the best N rows")
+    parser.add_argument('--output', help="Write the ranking to this .csv or .jsonl file")
+    args = parser.parse_args(argv)
+
+    try:
+        space = dict(parse_param(text) for text in args.param)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.method == 'grid':
+        configs = grid_configs(space, args.points)
+    else:
+        configs = random_configs(space, args.samples, args.seed) if space else [{}]
+
+    print("=" * 80)
+    print(f"  Parameter Sweep: {args.agent} agent, {args.method}, {len(configs)} configurations")
+    print("=" * 80)
+    sweep = Sweep(args.agent, args.workers, args.seed, args.batch, args.delta,
+                  early_stop=not args.no_early_stop)
+    try:
+        for config in configs:
+            sweep.check(config)
+    except ValueError as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    with sweep:
+        if args.method == 'halving':
+            rows = sweep.halving(configs, args.min_episodes, args.episodes, args.eta)
+        else:
+            rows = sweep.run(configs, args.episodes)
+    episodes_run = sweep.episodes_run
+    elapsed = time.perf_counter() - start
+    full_budget = len(configs) * args.episodes
+    print(f"\nRan {episodes_run} episodes in {elapsed:.1f}s "
+          f"({episodes_run / max(full_budget, 1):.0%} of the {full_budget} a full evaluation needs)\n")
+
+    print_ranking(rows, args.top)
+    if args.output:
+        save_ranking(args.output, rows)
+        print(f"\nRanking saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
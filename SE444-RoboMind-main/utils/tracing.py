@@ -0,0 +1,224 @@
+"""
+Event Tracing - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+A leveled, structured event sink used instead of print() on hot paths
+(knowledge base updates, search results, agent decisions).
+
+Call sites guard every event with a single integer comparison, so a
+disabled tracer costs nothing beyond that check and no arguments are
+formatted:
+
+    from utils.tracing import tracer, DEBUG, INFO
+
+    if tracer.level <= DEBUG:
+        tracer.event(DEBUG, 'kb.tell', fact=fact)
+
+Sinks:
+    ConsoleSink - human-readable lines on stdout (interactive runs)
+    JsonlSink   - one JSON object per line, written through a large buffer
+    BinarySink  - length-prefixed records with interned event names,
+                  read back with read_trace()
+
+    tracing.enable('run.jsonl', DEBUG)   # or 'run.trace' / None for console
+    ...
+    tracing.disable()                    # flushes and closes the file
+"""
+
+import atexit
+import io
+import json
+import marshal
+import struct
+import sys
+import time
+from typing import Dict, Iterator, Optional
+
+
+# Levels (same numbering as the logging module)
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING'}
+LEVELS = {name.lower(): level for level, name in LEVEL_NAMES.items()}
+
+BUFFER_SIZE = 1 << 20
+
+# Binary format: magic, then records of
+#   kind (B), level (B), event id (H), timestamp ns (q), payload length (I), payload
+# kind 0 defines an event name (payload = utf-8 name), kind 1 is an event
+# whose payload is the marshal-encoded field dict.
+BINARY_MAGIC = b'RMTRACE1'
+RECORD = struct.Struct('<BBHqI')
+NAME_RECORD = 0
+EVENT_RECORD = 1
+
+
+class ConsoleSink:
+    """Prints events as `[event] key=value ...`."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write(self, t_ns: int, level: int, name: str, fields: Dict):
+        details = ' '.join(f"{key}={value}" for key, value in fields.items())
+        print(f"[{name}] {details}", file=self.stream or sys.stdout)
+
+    def close(self):
+        pass
+
+
+class JsonlSink:
+    """Writes one JSON object per event through a buffered text file."""
+
+    def __init__(self, path: str, buffer_size: int = BUFFER_SIZE):
+        self.file = open(path, 'w', buffering=buffer_size)
+
+    def write(self, t_ns: int, level: int, name: str, fields: Dict):
+        record = {'t_ns': t_ns, 'level': LEVEL_NAMES.get(level, level), 'event': name}
+        record.update(fields)
+        self.file.write(json.dumps(record, default=str))
+        self.file.write('\n')
+
+    def close(self):
+        self.file.close()
+
+
+class BinarySink:
+    """
+    Compact binary trace: a fixed 16-byte header per record, event names
+    written once and referenced by id, fields encoded with marshal.
+    """
+
+    def __init__(self, path: str, buffer_size: int = BUFFER_SIZE):
+        self.file = open(path, 'wb', buffering=buffer_size)
+        self.file.write(BINARY_MAGIC)
+        self.names = {}
+
+    def write(self, t_ns: int, level: int, name: str, fields: Dict):
+        event_id = self.names.get(name)
+        if event_id is None:
+            event_id = len(self.names)
+            self.names[name] = event_id
+            encoded = name.encode('utf-8')
+            self.file.write(RECORD.pack(NAME_RECORD, 0, event_id, 0, len(encoded)))
+            self.file.write(encoded)
+        try:
+            payload = marshal.dumps(fields)
+        except ValueError:
+            # objects marshal cannot encode (e.g. numpy scalars)
+            payload = marshal.dumps({key: _plain(value) for key, value in fields.items()})
+        self.file.write(RECORD.pack(EVENT_RECORD, level, event_id, t_ns, len(payload)))
+        self.file.write(payload)
+
+    def close(self):
+        self.file.close()
+
+
+def _plain(value):
+    """Convert a value to something marshal can encode."""
+    if isinstance(value, (list, tuple)):
+        return type(value)(_plain(v) for v in value)
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    return str(value)
+
+
+class Tracer:
+    """
+    Process-wide event dispatcher.
+
+    Attributes:
+        level: Minimum level that is recorded (OFF when disabled)
+        sink: Where events go (None when disabled)
+    """
+
+    def __init__(self):
+        self.level = OFF
+        self.sink = None
+        self._origin = time.perf_counter_ns()
+
+    def enabled(self, level: int) -> bool:
+        return self.level <= level
+
+    def event(self, level: int, name: str, **fields):
+        """Record an event; callers check `tracer.level <= level` first."""
+        if self.sink is not None and self.level <= level:
+            self.sink.write(time.perf_counter_ns() - self._origin, level, name, fields)
+
+    def configure(self, sink, level: int = INFO):
+        """Replace the sink (closing the previous one) and set the level."""
+        self.close()
+        self.sink = sink
+        self.level = level if sink is not None else OFF
+        self._origin = time.perf_counter_ns()
+
+    def close(self):
+        """Flush and close the current sink and disable tracing."""
+        if self.sink is not None:
+            self.sink.close()
+        self.sink = None
+        self.level = OFF
+
+
+tracer = Tracer()
+atexit.register(tracer.close)
+
+
+def enable(path: Optional[str] = None, level: int = INFO):
+    """
+    Start tracing.
+
+    Args:
+        path: Trace file; '.jsonl'/'.json' gives JSON lines, anything else
+              the binary format. None prints events to the console.
+        level: DEBUG, INFO or WARNING (or their lowercase names)
+    """
+    if isinstance(level, str):
+        level = LEVELS[level.lower()]
+    if path is None:
+        sink = ConsoleSink()
+    elif path.endswith('.jsonl') or path.endswith('.json'):
+        sink = JsonlSink(path)
+    else:
+        sink = BinarySink(path)
+    tracer.configure(sink, level)
+
+
+def disable():
+    """Stop tracing and close the trace file."""
+    tracer.close()
+
+
+def read_trace(path: str) -> Iterator[Dict]:
+    """
+    Iterate over the events of a JSONL or binary trace file.
+
+    Yields:
+        Dicts with t_ns, level, event and the event's fields
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            f.seek(0)
+            for line in io.TextIOWrapper(f, encoding='utf-8'):
+                if line.strip():
+                    yield json.loads(line)
+            return
+        names = {}
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return
+            kind, level, event_id, t_ns, length = RECORD.unpack(header)
+            payload = f.read(length)
+            if kind == NAME_RECORD:
+                names[event_id] = payload.decode('utf-8')
+                continue
+            record = {'t_ns': t_ns, 'level': LEVEL_NAMES.get(level, level),
+                      'event': names[event_id]}
+            record.update(marshal.loads(payload))
+            yield record
@@ -0,0 +1,464 @@
+"""
+Out-of-Process Viewer - RoboMind Project
+SE444 - Artificial Intelligence Course Project
+
+Moves rendering out of the simulation loop. The simulation publishes one
+compact delta frame per tick (changed cells, agent position, belief
+changes) into a ring buffer in shared memory; a separate viewer process
+reads the frames and draws at its own frame rate.
+
+Shared memory layout (all sections 8-byte aligned):
+
+    header      sizes, start/goal, head (sequence number of the newest
+                frame), keyframe counters and status flags
+    keyframe    full grid, visited/path marks and beliefs, refreshed every
+                few ticks under a sequence lock
+    ring        `capacity` fixed-size slots; frame n lives in slot
+                n % capacity
+
+The simulation never waits: it overwrites slots whether or not they were
+read. A slot is bracketed by two copies of its sequence number (written
+before and after the payload), so the viewer can tell a frame that was
+overwritten while it copied it. A viewer that fell more than `capacity`
+frames behind, or sees a frame whose changes did not fit in a slot,
+reloads the keyframe and continues from there. When several frames are
+waiting, all of them are applied and only the last one is drawn.
+
+Usage:
+    python main.py --test-hybrid --viewer
+
+    publisher = attach_viewer(env)   # env.render() now publishes a frame
+    ...
+    env.close()                      # marks the stream finished
+"""
+
+import argparse
+import sys
+import time
+from multiprocessing import get_context, shared_memory
+from typing import Optional
+
+import numpy as np
+
+from utils.frames import VISITED, PATH
+
+
+MAGIC = b'RMVIEW01'
+ALIGN = 8
+
+DEFAULT_CAPACITY = 256
+DEFAULT_MAX_CELLS = 64       # cell changes per frame
+DEFAULT_MAX_BELIEFS = 512    # belief changes per frame
+
+# Slot flags
+RESYNC = 1      # changes did not fit in the slot (or a belief map appeared): reload the keyframe
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('head', '<u8'),            # newest published frame (0 = none yet)
+    ('key_seq', '<u8'),         # keyframe sequence lock (odd while being written)
+    ('key_frame', '<u8'),       # frame the keyframe reflects
+    ('height', '<u2'), ('width', '<u2'),
+    ('capacity', '<u4'), ('max_cells', '<u4'), ('max_beliefs', '<u4'),
+    ('start', '<i2', (2,)), ('goal', '<i2', (2,)),
+    ('has_beliefs', 'u1'),
+    ('finished', 'u1'),         # set by the simulation when the episode ended
+    ('viewer_closed', 'u1'),    # set by the viewer when its window was closed
+], align=True)
+
+
+def _padded(size: int) -> int:
+    return (size + ALIGN - 1) // ALIGN * ALIGN
+
+
+def keyframe_dtype(height: int, width: int) -> np.dtype:
+    return np.dtype([
+        ('pos', '<i2', (2,)), ('tick', '<u4'), ('path_len', '<u4'), ('expanded', '<u4'),
+        ('beliefs', '<f4', (height, width)),
+        ('grid', 'u1', (height, width)),
+        ('marks', 'u1', (height, width)),
+    ], align=True)
+
+
+def slot_dtype(max_cells: int, max_beliefs: int) -> np.dtype:
+    return np.dtype([
+        ('seq', '<u8'),             # written before the payload
+        ('tick', '<u4'), ('path_len', '<u4'), ('expanded', '<u4'), ('n_beliefs', '<u4'),
+        ('pos', '<i2', (2,)), ('n_cells', '<u2'), ('flags', '<u2'),
+        ('cells', '<i2', (max_cells, 3)),
+        ('belief_index', '<u4', (max_beliefs,)),
+        ('belief_value', '<f4', (max_beliefs,)),
+        ('commit', '<u8'),          # written after the payload
+    ], align=True)
+
+
+class FrameBuffer:
+    """Typed views of the header, keyframe and ring in one shared memory block."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((), HEADER_DTYPE, buffer=shm.buf)
+        if bytes(self.header['magic']) != MAGIC:
+            raise ValueError(f"shared memory {shm.name} is not a RoboMind frame stream")
+        height, width = int(self.header['height']), int(self.header['width'])
+        self.capacity = int(self.header['capacity'])
+        self.max_cells = int(self.header['max_cells'])
+        self.max_beliefs = int(self.header['max_beliefs'])
+        key_offset = _padded(HEADER_DTYPE.itemsize)
+        key = keyframe_dtype(height, width)
+        self.keyframe = np.ndarray((), key, buffer=shm.buf, offset=key_offset)
+        self.ring = np.ndarray((self.capacity,), slot_dtype(self.max_cells, self.max_beliefs),
+                               buffer=shm.buf, offset=key_offset + _padded(key.itemsize))
+
+    @staticmethod
+    def size(height: int, width: int, capacity: int, max_cells: int, max_beliefs: int) -> int:
+        return (_padded(HEADER_DTYPE.itemsize) + _padded(keyframe_dtype(height, width).itemsize)
+                + capacity * slot_dtype(max_cells, max_beliefs).itemsize)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        # drop the views first, SharedMemory refuses to close while they exist
+        self.header = self.keyframe = self.ring = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class FramePublisher:
+    """
+    Simulation side: turns each tick into a delta frame in shared memory.
+
+    Grid changes are captured through env.add_listener(); belief changes
+    are found by comparing the belief map with its previous snapshot (as
+    EpisodeRecorder does). publish() only copies into shared memory and
+    never waits for the viewer.
+    """
+
+    def __init__(self, env, capacity: int = DEFAULT_CAPACITY, max_cells: int = DEFAULT_MAX_CELLS,
+                 max_beliefs: int = DEFAULT_MAX_BELIEFS, keyframe_every: Optional[int] = None):
+        """
+        Args:
+            env: The GridWorld being shown
+            capacity: Frames kept in the ring
+            max_cells: Cell changes that fit in one frame
+            max_beliefs: Belief changes that fit in one frame
+            keyframe_every: Ticks between keyframe refreshes (default capacity / 4)
+        """
+        if max(env.height, env.width) > np.iinfo(np.int16).max:
+            raise ValueError("maps larger than 32767 cells per side cannot be streamed")
+        self.env = env
+        self.keyframe_every = keyframe_every or max(1, capacity // 4)
+        size = FrameBuffer.size(env.height, env.width, capacity, max_cells, max_beliefs)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        header = np.ndarray((), HEADER_DTYPE, buffer=shm.buf)
+        header['magic'] = MAGIC
+        header['height'], header['width'] = env.height, env.width
+        header['capacity'], header['max_cells'], header['max_beliefs'] = capacity, max_cells, max_beliefs
+        header['start'], header['goal'] = env.start, env.goal
+        del header
+        self.buffer = FrameBuffer(shm, owner=True)
+
+        self.grid = np.asarray(env.grid, dtype=np.uint8).copy()
+        self.marks = np.zeros((env.height, env.width), dtype=np.uint8)
+        self.position = tuple(env.agent_pos)
+        self.beliefs = None
+        self._belief_snapshot = None
+        self._cells = []
+        self.tick = 0
+        self.process = None
+        env.add_listener(self.on_cell_changed)
+        self._write_keyframe()
+
+    @property
+    def name(self) -> str:
+        return self.buffer.name
+
+    @property
+    def viewer_closed(self) -> bool:
+        return bool(self.buffer.header['viewer_closed'])
+
+    def on_cell_changed(self, row: int, col: int, cell_type: int):
+        self._cells.append((row, col, cell_type))
+
+    def publish(self):
+        """Close the current tick and publish its delta frame."""
+        env = self.env
+        self.tick += 1
+        seq = self.tick
+        flags = 0
+
+        cells = self._cells
+        self._cells = []
+        for row, col, cell_type in cells:
+            self.grid[row, col] = cell_type
+
+        position = tuple(env.agent_pos)
+        if position != self.position:
+            self.marks[self.position] |= VISITED
+            self.marks[position] |= PATH
+            self.position = position
+
+        changed = values = ()
+        if env.beliefs is not None and env.beliefs is not self.beliefs:
+            # the agent created its belief store after the viewer started
+            self.beliefs = env.beliefs
+            self._belief_snapshot = np.array(self.beliefs.probabilities(), dtype=np.float32)
+            self.buffer.header['has_beliefs'] = 1
+            flags |= RESYNC
+        elif self.beliefs is not None:
+            current = self.beliefs.probabilities()
+            changed = np.flatnonzero(current != self._belief_snapshot)
+            if changed.size:
+                values = current.ravel()[changed].astype(np.float32)
+                self._belief_snapshot.ravel()[changed] = values
+
+        buffer = self.buffer
+        if len(cells) > buffer.max_cells or len(changed) > buffer.max_beliefs:
+            flags |= RESYNC
+
+        ring = buffer.ring
+        index = seq % buffer.capacity
+        ring['seq'][index] = seq
+        slot = ring[index]
+        slot['tick'] = seq
+        slot['pos'] = position
+        slot['path_len'] = len(env.path)
+        slot['expanded'] = env.expanded
+        slot['flags'] = flags
+        if flags & RESYNC:
+            slot['n_cells'] = slot['n_beliefs'] = 0
+        else:
+            slot['n_cells'] = len(cells)
+            if cells:
+                slot['cells'][:len(cells)] = cells
+            slot['n_beliefs'] = len(changed)
+            if len(changed):
+                slot['belief_index'][:len(changed)] = changed
+                slot['belief_value'][:len(changed)] = values
+        ring['commit'][index] = seq
+
+        if flags & RESYNC or seq - int(buffer.header['key_frame']) >= self.keyframe_every:
+            self._write_keyframe()
+        buffer.header['head'] = seq
+
+    def _write_keyframe(self):
+        header, key = self.buffer.header, self.buffer.keyframe
+        header['key_seq'] += 1                      # odd: being written
+        key['pos'] = self.position
+        key['tick'] = self.tick
+        key['path_len'] = len(self.env.path)
+        key['expanded'] = self.env.expanded
+        key['grid'] = self.grid
+        key['marks'] = self.marks
+        if self._belief_snapshot is not None:
+            key['beliefs'] = self._belief_snapshot
+        header['key_frame'] = self.tick
+        header['key_seq'] += 1                      # even: consistent
+
+    def start_viewer(self, fps: float = 30.0, cell_size: int = 50):
+        """Launch the viewer in a separate process."""
+        self.process = get_context('spawn').Process(
+            target=run_viewer, args=(self.name, fps, cell_size), name='robomind-viewer')
+        self.process.start()
+
+    def close(self, wait: bool = True):
+        """
+        Mark the episode finished and release the shared memory.
+
+        Args:
+            wait: Wait for the viewer window to be closed first (it keeps
+                  showing the final frame until then)
+        """
+        if self.buffer is None:
+            return
+        self.env.remove_listener(self.on_cell_changed)
+        self.publish()
+        self.buffer.header['finished'] = 1
+        if self.process is not None and wait:
+            self.process.join()
+        self.buffer.close()
+        self.buffer = None
+
+
+class FrameReader:
+    """
+    Viewer side: a mirror of the simulation rebuilt from the delta frames.
+
+    Exposes probabilities() so it can be used as env.beliefs for rendering.
+    """
+
+    def __init__(self, name: str):
+        self.buffer = FrameBuffer(shared_memory.SharedMemory(name=name), owner=False)
+        header = self.buffer.header
+        self.height, self.width = int(header['height']), int(header['width'])
+        self.start = tuple(int(v) for v in header['start'])
+        self.goal = tuple(int(v) for v in header['goal'])
+        self.frame = 0
+        self.frames_applied = 0
+        self.resyncs = 0
+        self.resync()
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.buffer.header['finished'])
+
+    @property
+    def has_beliefs(self) -> bool:
+        return bool(self.buffer.header['has_beliefs'])
+
+    def probabilities(self) -> np.ndarray:
+        return self.beliefs
+
+    def resync(self):
+        """Load the keyframe (retrying while the simulation rewrites it)."""
+        header = self.buffer.header
+        while True:
+            before = int(header['key_seq'])
+            if before % 2 == 0:
+                key = self.buffer.keyframe.copy()
+                frame = int(header['key_frame'])
+                if int(header['key_seq']) == before:
+                    break
+            time.sleep(0)
+        self.grid = key['grid'].astype(int)
+        self.marks = key['marks'].copy()
+        self.beliefs = key['beliefs'].copy()
+        self.position = (int(key['pos'][0]), int(key['pos'][1]))
+        self.path_len, self.expanded = int(key['path_len']), int(key['expanded'])
+        self.frame = frame
+        self.resyncs += 1
+
+    def poll(self) -> int:
+        """
+        Apply every frame published since the last call.
+
+        Returns:
+            Number of frames applied (0 = nothing new)
+        """
+        buffer = self.buffer
+        ring, capacity = buffer.ring, buffer.capacity
+        head = int(buffer.header['head'])
+        applied = 0
+        if head - self.frame > capacity:
+            self.resync()
+        while self.frame < head:
+            seq = self.frame + 1
+            index = seq % capacity
+            committed = int(ring['commit'][index])
+            slot = ring[index].copy()
+            if committed != seq or int(ring['seq'][index]) != seq or slot['flags'] & RESYNC:
+                # overwritten while we read it, or too big for a slot
+                self.resync()
+                applied += 1
+                continue
+            self._apply(slot)
+            self.frame = seq
+            applied += 1
+        self.frames_applied += applied
+        return applied
+
+    def _apply(self, slot):
+        n_cells, n_beliefs = int(slot['n_cells']), int(slot['n_beliefs'])
+        for row, col, cell_type in slot['cells'][:n_cells]:
+            self.grid[row, col] = cell_type
+        if n_beliefs:
+            self.beliefs.ravel()[slot['belief_index'][:n_beliefs]] = slot['belief_value'][:n_beliefs]
+        position = (int(slot['pos'][0]), int(slot['pos'][1]))
+        if position != self.position:
+            self.marks[self.position] |= VISITED
+            self.marks[position] |= PATH
+            self.position = position
+        self.path_len, self.expanded = int(slot['path_len']), int(slot['expanded'])
+
+    def close_window(self):
+        """Tell the simulation the window was closed."""
+        if self.buffer is not None:
+            self.buffer.header['viewer_closed'] = 1
+
+    def close(self):
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+
+
+def attach_viewer(env, fps: float = 30.0, **options) -> FramePublisher:
+    """
+    Stream env to a viewer process instead of drawing it in this one.
+
+    env.render() publishes a frame, env.handle_events() reports whether the
+    viewer window is still open and env.close() ends the stream, so the
+    simulation loops run unchanged.
+
+    Args:
+        env: GridWorld to show (instead of env.init_display())
+        fps: Viewer frame rate
+        options: FramePublisher options (capacity, max_cells, ...)
+    """
+    publisher = FramePublisher(env, **options)
+    publisher.start_viewer(fps, env.cell_size)
+    env.running = True
+    env.render = publisher.publish
+    env.handle_events = lambda: not publisher.viewer_closed
+
+    def close():
+        env.running = False
+        publisher.close()
+    env.close = close
+    return publisher
+
+
+def run_viewer(name: str, fps: float = 30.0, cell_size: int = 50):
+    """Viewer process: draw the stream at `fps` until the window is closed."""
+    from environment import GridWorld
+
+    reader = FrameReader(name)
+    env = GridWorld(width=reader.width, height=reader.height, cell_size=cell_size)
+    env.start, env.goal = reader.start, reader.goal
+    env.init_display()
+    pygame = sys.modules['pygame']
+    pygame.display.set_caption("RoboMind - Viewer")
+    clock = pygame.time.Clock()
+    rendered = dirty = 0
+    try:
+        while env.handle_events():
+            if reader.buffer is not None:
+                dirty += reader.poll()
+                finished = reader.finished
+            if dirty:
+                env.grid = reader.grid
+                env.beliefs = reader if reader.has_beliefs else None
+                env.visited = set(map(tuple, np.argwhere(reader.marks & VISITED).tolist()))
+                env.path = [tuple(cell) for cell in np.argwhere(reader.marks & PATH).tolist()]
+                env.agent_pos = reader.position
+                env.expanded = reader.expanded
+                env.render()
+                rendered += 1
+                dirty = 0
+            if reader.buffer is not None and finished:
+                # keep the final frame on screen, the simulation is gone
+                print(f"Viewer: {reader.frames_applied} frames received, {rendered} drawn, "
+                      f"{reader.resyncs} keyframe reloads")
+                reader.close()
+            clock.tick(fps)
+    finally:
+        reader.close_window()
+        reader.close()
+        env.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Show a RoboMind frame stream")
+    parser.add_argument('name', help="Shared memory name of the stream (FramePublisher.name)")
+    parser.add_argument('--fps', type=float, default=30.0, help="Viewer frame rate")
+    parser.add_argument('--cell-size', type=int, default=50, help="Cell size in pixels")
+    args = parser.parse_args(argv)
+    run_viewer(args.name, args.fps, args.cell_size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())